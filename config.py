@@ -10,6 +10,64 @@ load_dotenv()
 CREDENTIAL_SECRET_KEY = os.getenv("CREDENTIAL_SECRET_KEY", "")
 CREDENTIAL_ALGORITHM = os.getenv("CREDENTIAL_ALGORITHM", "")
 
+# 검증이 끝난 토큰과 그 토큰의 유저 정보를 캐시합니다. 항목은 토큰 만료 시각을 넘겨 유지되지 않습니다.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+# bcrypt 해싱을 수행할 작업 풀 설정입니다. (executor: "thread" 또는 "process")
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))
+)
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "64"))
+
+# 장작 트리 응답에서 장작 수가 이 값을 넘으면 응답을 나누어 스트리밍합니다.
+ARTICLE_TREE_STREAM_THRESHOLD = int(os.getenv("ARTICLE_TREE_STREAM_THRESHOLD", "1000"))
+# 최근 조회된 불판의 장작들을 메모리에 보관합니다. 보관하는 장작 수의 합이 이 값을 넘으면 오래된 불판부터 버립니다.
+ARTICLE_TREE_CACHE_MAX_ARTICLES = int(
+    os.getenv("ARTICLE_TREE_CACHE_MAX_ARTICLES", "100000")
+)
+# 설정하면 불판의 장작들을 이 디렉터리(예: /dev/shm/glosseum)의 공유 메모리 세그먼트에 두고, 같은 호스트의 워커들이 함께 사용합니다.
+ARTICLE_SHARED_CACHE_DIR = os.getenv("ARTICLE_SHARED_CACHE_DIR", "")
+# 워커마다 mmap으로 열어 두는 세그먼트의 최대 개수입니다.
+ARTICLE_SHARED_CACHE_MAX_BOARDS = int(
+    os.getenv("ARTICLE_SHARED_CACHE_MAX_BOARDS", "1024")
+)
+# 디렉터리에 두는 세그먼트 파일의 최대 개수와 크기의 합(byte)입니다. 넘으면 가장 오래 쓰이지 않은 세그먼트부터 지웁니다.
+ARTICLE_SHARED_CACHE_MAX_FILES = int(
+    os.getenv("ARTICLE_SHARED_CACHE_MAX_FILES", "4096")
+)
+ARTICLE_SHARED_CACHE_MAX_BYTES = int(
+    os.getenv("ARTICLE_SHARED_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+# PostgreSQL에서 장작의 하위 트리를 ltree 연산자와 GiST 인덱스로 조회합니다. (ltree 확장 필요)
+ARTICLE_PATH_LTREE = os.getenv("ARTICLE_PATH_LTREE", "false").lower() == "true"
+
+# 기본 키로 조회한 엔티티를 캐시합니다. 엔티티마다 유지 시간(초)을 따로 둡니다.
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+ENTITY_CACHE_TTL_SECONDS = {
+    "user": float(os.getenv("ENTITY_CACHE_USER_TTL_SECONDS", "60")),
+    "board": float(os.getenv("ENTITY_CACHE_BOARD_TTL_SECONDS", "60")),
+    "article": float(os.getenv("ENTITY_CACHE_ARTICLE_TTL_SECONDS", "30")),
+    "comment": float(os.getenv("ENTITY_CACHE_COMMENT_TTL_SECONDS", "30")),
+}
+
+# 공개된 조회 경로의 응답을 캐시합니다. 본문이 RESPONSE_CACHE_MAX_BODY_BYTES보다 큰 응답은 캐시하지 않습니다.
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_MAX_BODY_BYTES = int(
+    os.getenv("RESPONSE_CACHE_MAX_BODY_BYTES", str(1024 * 1024))
+)
+
+# 캐시 무효화 이벤트를 다른 워커나 서버에 전달하는 방식입니다. ("local", "unix", "postgres")
+INVALIDATION_TRANSPORT = os.getenv("INVALIDATION_TRANSPORT", "local")
+INVALIDATION_SOCKET_DIR = os.getenv("INVALIDATION_SOCKET_DIR", "/tmp/glosseum-bus")
+INVALIDATION_CHANNEL = os.getenv("INVALIDATION_CHANNEL", "glosseum_invalidation")
+INVALIDATION_QUEUE_SIZE = int(os.getenv("INVALIDATION_QUEUE_SIZE", "10000"))
+INVALIDATION_SEND_TIMEOUT_SECONDS = float(
+    os.getenv("INVALIDATION_SEND_TIMEOUT_SECONDS", "1")
+)
+
 DB_CONFIG = {
     "rdb": os.getenv("RDB", "postgresql+asyncpg"),
     "db_user": os.getenv("DB_USER", ""),
@@ -19,6 +77,28 @@ DB_CONFIG = {
     "db": os.getenv("DB", ""),
 }
 
+# 조회 전용 트랜잭션을 보낼 읽기 복제본(replica)입니다. 설정하지 않으면 기본 데이터베이스를 사용합니다.
+DB_REPLICA_CONFIG = {
+    **DB_CONFIG,
+    "host": os.getenv("DB_REPLICA_HOST", DB_CONFIG["host"]),
+    "port": os.getenv("DB_REPLICA_PORT", DB_CONFIG["port"]),
+}
+# 유저가 쓰기를 한 뒤 이 시간(초) 동안은 복제 지연을 피하기 위해 조회도 기본 데이터베이스에서 수행합니다.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
 UNIVCERT_API_KEY = os.getenv("UNIVCERT_API_KEY", "")
+UNIVCERT_URL = os.getenv("UNIVCERT_URL", "https://univcert.com/api/v1/")
+UNIVCERT_TIMEOUT_SECONDS = float(os.getenv("UNIVCERT_TIMEOUT_SECONDS", "5"))
+UNIVCERT_MAX_CONNECTIONS = int(os.getenv("UNIVCERT_MAX_CONNECTIONS", "20"))
+UNIVCERT_MAX_CONCURRENCY = int(os.getenv("UNIVCERT_MAX_CONCURRENCY", "20"))
+# 연속으로 UNIVCERT_FAILURE_THRESHOLD번 실패하면 UNIVCERT_RESET_SECONDS초 동안 호출을 차단합니다.
+UNIVCERT_FAILURE_THRESHOLD = int(os.getenv("UNIVCERT_FAILURE_THRESHOLD", "5"))
+UNIVCERT_RESET_SECONDS = float(os.getenv("UNIVCERT_RESET_SECONDS", "30"))
 
 SITE_ENV = os.getenv("SITE_ENV", "test")
+
+# 목록 조회 시 한 번에 반환하는 항목 수의 기본값과 최댓값입니다.
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "200"))
+# 목록을 NDJSON으로 스트리밍할 때 데이터베이스에서 한 번에 가져와 내보내는 행 수입니다.
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
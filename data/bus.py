@@ -0,0 +1,544 @@
+"""
+캐시 무효화 이벤트를 다른 워커와 다른 서버에 전달하는 무효화 버스를 정의합니다.
+쓰기가 커밋되면 무효화 이벤트를 발행하며, 이 프로세스의 구독자에게는 바로 전달하고 다른 프로세스에는 전송 방식(transport)으로 보냅니다.
+
+전송 방식은 다음 중 하나를 사용합니다.
+    local     이 프로세스 안에서만 전달합니다.
+    unix      같은 호스트의 워커들에게 UNIX 도메인 데이터그램 소켓으로 전달합니다.
+    postgres  PostgreSQL LISTEN/NOTIFY로 여러 서버에 전달합니다.
+
+전송 대기열은 크기가 정해져 있고 전송마다 제한 시간이 있어, 이벤트는 제한 시간 안에 전달되거나 버려집니다.
+이벤트에는 발행한 프로세스별 일련번호가 붙어 있어, 받는 쪽은 번호가 건너뛰면 이벤트를 잃어버린 것으로 보고 캐시를 모두 비웁니다.
+키가 많아 전송 방식이 한 번에 보낼 수 있는 크기를 넘는 이벤트는 여러 이벤트로 나누어 보냅니다.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from typing import Callable, Iterable
+
+from config import (
+    DB_CONFIG,
+    INVALIDATION_TRANSPORT,
+    INVALIDATION_SOCKET_DIR,
+    INVALIDATION_CHANNEL,
+    INVALIDATION_QUEUE_SIZE,
+    INVALIDATION_SEND_TIMEOUT_SECONDS,
+)
+from data import metrics
+from data.db.database import on_commit
+
+# 모든 구독자에게 캐시를 비우도록 알리는 주제입니다.
+RESET = "*"
+
+
+class Transport:
+    """
+    이 프로세스 안에서만 이벤트를 전달하는 전송 방식입니다. 다른 전송 방식의 기반 클래스이기도 합니다.
+    """
+
+    name = "local"
+    # 한 번에 보낼 수 있는 페이로드의 최대 크기입니다. None이면 제한이 없습니다.
+    max_payload_bytes: int | None = None
+
+    def __init__(self):
+        self.receive: Callable[[bytes], None] | None = None
+
+    async def start(self, receive: Callable[[bytes], None]) -> None:
+        self.receive = receive
+
+    def send(self, payload: bytes) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.receive = None
+
+    def stats(self) -> dict:
+        return {"transport": self.name}
+
+
+class QueuedTransport(Transport):
+    """
+    이벤트를 크기가 정해진 대기열에 넣고, 백그라운드 작업에서 하나씩 보내는 전송 방식입니다.
+    대기열이 가득 차면 가장 오래된 이벤트를 버리고, 제한 시간 안에 보내지 못한 이벤트도 버립니다.
+    """
+
+    def __init__(self, queue_size: int, send_timeout: float):
+        super().__init__()
+        self.send_timeout = send_timeout
+        self._queue: deque[tuple[float, bytes]] = deque(maxlen=queue_size)
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+        self.sent = 0
+        self.dropped = 0
+        self.failures = 0
+
+    async def start(self, receive: Callable[[bytes], None]) -> None:
+        await super().start(receive)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, payload: bytes) -> None:
+        if self._task is None:
+            self.dropped += 1
+            return
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append((time.monotonic(), payload))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue:
+                _, payload = self._queue.popleft()
+                try:
+                    await asyncio.wait_for(self._deliver(payload), self.send_timeout)
+                    self.sent += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    self.failures += 1
+                    self.dropped += 1
+
+    async def _deliver(self, payload: bytes) -> None:
+        raise NotImplementedError
+
+    def _fit(self, payload: bytes) -> bytes:
+        """
+        max_payload_bytes를 넘는 페이로드는 보낼 수 없으므로, 받는 쪽이 캐시를 모두 비우도록 RESET 이벤트로 바꿉니다.
+        """
+        if self.max_payload_bytes is None or len(payload) <= self.max_payload_bytes:
+            return payload
+        event = json.loads(payload)
+        event.update(topic=RESET, keys=[])
+        return json.dumps(event).encode()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await super().close()
+
+    def stats(self) -> dict:
+        oldest = self._queue[0][0] if self._queue else None
+        return {
+            **super().stats(),
+            "pending": len(self._queue),
+            "oldest_pending_seconds": time.monotonic() - oldest if oldest else 0.0,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failures": self.failures,
+        }
+
+
+class UnixSocketTransport(QueuedTransport):
+    """
+    directory 안에 워커마다 데이터그램 소켓을 하나씩 만들고, 다른 모든 워커의 소켓으로 이벤트를 보냅니다.
+    응답하지 않는 워커의 소켓 파일은 지웁니다.
+    """
+
+    name = "unix"
+    # 데이터그램 하나의 최대 크기입니다. 받는 쪽은 _RECV_BYTES만큼 읽으므로 그보다 작아야 합니다.
+    max_payload_bytes = 60000
+    _RECV_BYTES = 65536
+
+    def __init__(
+        self,
+        directory: str,
+        queue_size: int,
+        send_timeout: float,
+        peer_refresh_seconds: float = 1.0,
+    ):
+        super().__init__(queue_size, send_timeout)
+        self.directory = directory
+        self.peer_refresh_seconds = peer_refresh_seconds
+        self.path: str | None = None
+        self._sock: socket.socket | None = None
+        self._peers: list[str] = []
+        self._peers_at = 0.0
+
+    async def start(self, receive: Callable[[bytes], None]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(
+            self.directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock"
+        )
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.setblocking(False)
+        asyncio.get_running_loop().add_reader(self._sock.fileno(), self._on_readable)
+        await super().start(receive)
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                payload = self._sock.recv(self._RECV_BYTES)
+            except (BlockingIOError, InterruptedError):
+                return
+            if self.receive is not None:
+                self.receive(payload)
+
+    def _list_peers(self) -> list[str]:
+        now = time.monotonic()
+        if now - self._peers_at >= self.peer_refresh_seconds:
+            self._peers = [
+                os.path.join(self.directory, name)
+                for name in os.listdir(self.directory)
+                if name.endswith(".sock")
+                and os.path.join(self.directory, name) != self.path
+            ]
+            self._peers_at = now
+        return self._peers
+
+    async def _deliver(self, payload: bytes) -> None:
+        payload = self._fit(payload)
+        for peer in self._list_peers():
+            try:
+                self._sock.sendto(payload, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    os.unlink(peer)
+                except FileNotFoundError:
+                    pass
+                self._peers_at = 0.0
+            except BlockingIOError:
+                # 받는 워커의 수신 버퍼가 가득 찬 경우입니다. 받는 쪽은 일련번호가 건너뛴 것을 보고 캐시를 비웁니다.
+                self.dropped += 1
+            except OSError:
+                # 한 워커에 보내지 못해도 나머지 워커에는 보냅니다. 받지 못한 워커는 일련번호가 건너뛴 것을 보고 캐시를 비웁니다.
+                self.failures += 1
+
+    async def close(self) -> None:
+        await super().close()
+        if self._sock is not None:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class PostgresNotifyTransport(QueuedTransport):
+    """
+    PostgreSQL의 LISTEN/NOTIFY로 이벤트를 주고받습니다. 같은 데이터베이스를 사용하는 모든 서버에 전달됩니다.
+    수신용 연결이 끊어지면 백그라운드에서 다시 연결하며, 그동안의 이벤트를 잃어버렸을 수 있으므로
+    다시 LISTEN한 뒤 캐시를 모두 비우도록 알립니다. 송신용 연결이 끊어지면 다음 전송 때 다시 연결합니다.
+    다시 연결할 때는 실패할 때마다 대기 시간을 두 배로 늘립니다.
+    """
+
+    name = "postgres"
+    # NOTIFY 페이로드의 최대 크기(8000 바이트)보다 조금 작게 잡습니다.
+    max_payload_bytes = 7900
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        queue_size: int,
+        send_timeout: float,
+        reconnect_min_seconds: float = 0.5,
+        reconnect_max_seconds: float = 30.0,
+    ):
+        super().__init__(queue_size, send_timeout)
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_min_seconds = reconnect_min_seconds
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self._listen = None
+        self._notify = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._notify_backoff = 0.0
+        self._notify_retry_at = 0.0
+
+        self.reconnects = 0
+
+    async def _connect(self):
+        import asyncpg
+
+        return await asyncpg.connect(self.dsn)
+
+    async def _open_listen(self) -> None:
+        connection = await self._connect()
+        try:
+            await connection.add_listener(self.channel, self._on_notify)
+        except BaseException:
+            await connection.close()
+            raise
+        connection.add_termination_listener(self._on_terminated)
+        self._listen = connection
+
+    async def start(self, receive: Callable[[bytes], None]) -> None:
+        await self._open_listen()
+        self._notify = await self._connect()
+        await super().start(receive)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        if self.receive is not None:
+            self.receive(payload.encode())
+
+    def _reset_receivers(self) -> None:
+        if self.receive is not None:
+            self.receive(json.dumps({"topic": RESET, "keys": []}).encode())
+
+    def _on_terminated(self, connection) -> None:
+        if connection is not self._listen:
+            return
+        self._listen = None
+        self._reset_receivers()
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.get_running_loop().create_task(
+                self._reconnect_listen()
+            )
+
+    async def _reconnect_listen(self) -> None:
+        delay = self.reconnect_min_seconds
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._open_listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failures += 1
+                delay = min(delay * 2, self.reconnect_max_seconds)
+                continue
+            self.reconnects += 1
+            # 연결이 끊어져 있던 동안의 이벤트는 받지 못했으므로, 다시 LISTEN한 뒤 캐시를 비웁니다.
+            self._reset_receivers()
+            return
+
+    async def _notify_connection(self):
+        """
+        송신용 연결을 반환합니다. 연결이 끊어졌으면 다시 연결하되, 직전에 실패했으면 대기 시간이 지날 때까지 시도하지 않습니다.
+        """
+        if self._notify is not None and not self._notify.is_closed():
+            return self._notify
+
+        self._notify = None
+        if time.monotonic() < self._notify_retry_at:
+            raise ConnectionError("Waiting to reconnect")
+        try:
+            self._notify = await self._connect()
+        except Exception:
+            self._notify_backoff = min(
+                max(self._notify_backoff * 2, self.reconnect_min_seconds),
+                self.reconnect_max_seconds,
+            )
+            self._notify_retry_at = time.monotonic() + self._notify_backoff
+            raise
+        self._notify_backoff = 0.0
+        self.reconnects += 1
+        return self._notify
+
+    async def _deliver(self, payload: bytes) -> None:
+        connection = await self._notify_connection()
+        try:
+            await connection.execute(
+                "SELECT pg_notify($1, $2)", self.channel, self._fit(payload).decode()
+            )
+        except Exception:
+            # 연결에 문제가 있을 수 있으므로 닫고, 다음 전송 때 다시 연결합니다.
+            self._notify = None
+            connection.terminate()
+            raise
+
+    async def close(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+        await super().close()
+        listen, self._listen = self._listen, None
+        for connection in (listen, self._notify):
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        self._notify = None
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "connected": self._listen is not None,
+            "reconnects": self.reconnects,
+        }
+
+
+class InvalidationBus:
+    """
+    주제(topic)별 구독자에게 무효화할 키들을 전달합니다.
+    구독자는 키 목록을 받는 handler와, 이벤트를 잃어버렸을 때 호출할 reset을 등록합니다.
+    """
+
+    def __init__(self, transport: Transport):
+        self.transport = transport
+        self.origin = uuid.uuid4().hex
+        self._seq = 0
+        self._last_seq: dict[str, int] = {}
+        self._handlers: dict[str, list[Callable[[list], None]]] = {}
+        self._resets: list[Callable[[], None]] = []
+
+        self.published = 0
+        self.received = 0
+        self.gaps = 0
+        self.invalid = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def subscribe(
+        self,
+        topic: str,
+        handler: Callable[[list], None],
+        reset: Callable[[], None] | None = None,
+    ) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+        if reset is not None:
+            self._resets.append(reset)
+
+    def publish(self, topic: str, keys: Iterable) -> None:
+        """
+        이 프로세스의 구독자에게 바로 전달하고, 다른 프로세스에도 보냅니다.
+        """
+        keys = list(keys)
+        self._dispatch(topic, keys)
+
+        sent_at = time.time()
+        for chunk in self._chunks(topic, keys, sent_at):
+            self._seq += 1
+            self.published += 1
+            self.transport.send(self._encode(topic, chunk, sent_at))
+
+    def _encode(self, topic: str, keys: list, sent_at: float) -> bytes:
+        return json.dumps(
+            {
+                "origin": self.origin,
+                "seq": self._seq,
+                "sent_at": sent_at,
+                "topic": topic,
+                "keys": keys,
+            },
+            separators=(",", ":"),
+        ).encode()
+
+    def _chunks(self, topic: str, keys: list, sent_at: float) -> Iterable[list]:
+        """
+        전송 방식이 한 번에 보낼 수 있는 크기를 넘지 않도록 키 목록을 나눕니다.
+        키 하나만으로도 크기를 넘으면 그대로 보내며, 이 경우 전송 방식이 RESET으로 바꾸어 보냅니다.
+        """
+        limit = self.transport.max_payload_bytes
+        if limit is None:
+            yield keys
+            return
+
+        # seq가 커져도 넘치지 않도록 여유를 둡니다.
+        budget = limit - len(self._encode(topic, [], sent_at)) - 20
+        chunk, size = [], 0
+        for key in keys:
+            key_size = len(json.dumps(key, separators=(",", ":")).encode()) + 1
+            if chunk and size + key_size > budget:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(key)
+            size += key_size
+        if chunk or not keys:
+            yield chunk
+
+    def publish_on_commit(self, topic: str, keys: Iterable) -> None:
+        """
+        진행 중인 트랜잭션이 커밋된 직후에 이벤트를 발행합니다.
+        """
+        keys = list(keys)
+        on_commit(lambda: self.publish(topic, keys))
+
+    def _dispatch(self, topic: str, keys: list) -> None:
+        if topic == RESET:
+            self.reset()
+            return
+        for handler in self._handlers.get(topic, ()):
+            handler(keys)
+
+    def reset(self) -> None:
+        for reset in self._resets:
+            reset()
+
+    def _receive(self, payload: bytes) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            # 어떤 이벤트였는지 알 수 없으므로 캐시를 모두 비웁니다.
+            self.invalid += 1
+            self.reset()
+            return
+        origin = event.get("origin")
+        if origin == self.origin:
+            return
+
+        self.received += 1
+        if "sent_at" in event:
+            self.last_lag = max(0.0, time.time() - event["sent_at"])
+            self.max_lag = max(self.max_lag, self.last_lag)
+
+        seq = event.get("seq")
+        if origin is not None and seq is not None:
+            last = self._last_seq.get(origin)
+            self._last_seq[origin] = seq
+            if last is not None and seq != last + 1:
+                self.gaps += 1
+                self.reset()
+
+        self._dispatch(event.get("topic"), event.get("keys", []))
+
+    async def start(self) -> None:
+        await self.transport.start(self._receive)
+
+    async def close(self) -> None:
+        await self.transport.close()
+
+    def stats(self) -> dict:
+        return {
+            **self.transport.stats(),
+            "published": self.published,
+            "received": self.received,
+            "gaps": self.gaps,
+            "invalid": self.invalid,
+            "last_lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag,
+        }
+
+
+def _create_transport(name: str) -> Transport:
+    if name == "unix":
+        return UnixSocketTransport(
+            INVALIDATION_SOCKET_DIR,
+            queue_size=INVALIDATION_QUEUE_SIZE,
+            send_timeout=INVALIDATION_SEND_TIMEOUT_SECONDS,
+        )
+    if name == "postgres":
+        dsn = f"postgresql://{DB_CONFIG['db_user']}:{DB_CONFIG['db_password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['db']}"
+        return PostgresNotifyTransport(
+            dsn,
+            INVALIDATION_CHANNEL,
+            queue_size=INVALIDATION_QUEUE_SIZE,
+            send_timeout=INVALIDATION_SEND_TIMEOUT_SECONDS,
+        )
+    return Transport()
+
+
+invalidation_bus = InvalidationBus(_create_transport(INVALIDATION_TRANSPORT))
+metrics.register("invalidation_bus", invalidation_bus.stats)
@@ -0,0 +1,125 @@
+"""
+기본 키(또는 고유 키)로 조회한 엔티티를 캐시합니다.
+ORM 객체 대신 컬럼 값만 저장하고, 꺼낼 때마다 세션에 묶이지 않은(detached) 새 객체를 만들어 반환하므로 요청 간에 객체를 공유하지 않습니다.
+"""
+
+from typing import Any, Hashable, Iterable, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from config import ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL_SECONDS, READ_YOUR_WRITES_SECONDS
+from data import metrics
+from data.bus import invalidation_bus
+from data.cache.lru import LRUCache
+from data.db.database import current_unit_of_work
+
+T = TypeVar("T")
+
+# 무효화된 항목 자리에 잠시 남겨두어, 복제 지연으로 아직 바뀌지 않은 값을 다시 캐시하지 않도록 합니다.
+_TOMBSTONE = object()
+
+
+class EntityCache:
+    """
+    (테이블 이름, 키)로 엔티티의 컬럼 값을 저장하는 LRU 캐시입니다.
+    ttls에 테이블 이름별 유지 시간(초)을 지정합니다.
+    키는 다른 프로세스에 무효화 이벤트로 보낼 수 있도록 문자열로 바꾸어 사용합니다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttls: dict[str, float],
+        tombstone_seconds: float = READ_YOUR_WRITES_SECONDS,
+    ):
+        self.ttls = ttls
+        self.tombstone_seconds = tombstone_seconds
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def get(self, model: type[T], key: Hashable) -> T | None:
+        """
+        캐시된 엔티티를 detached 상태의 새 객체로 반환합니다. 없으면 None을 반환합니다.
+        """
+        snapshot = self._cache.get((model.__tablename__, str(key)))
+        if snapshot is None or snapshot is _TOMBSTONE:
+            return None
+
+        obj = model(**snapshot)
+        make_transient_to_detached(obj)
+        return obj
+
+    def set(
+        self, model: type[T], key: Hashable, obj: T | None, tags: Iterable[str] = ()
+    ) -> None:
+        """
+        엔티티의 컬럼 값을 저장합니다.
+        쓰기를 한 작업 단위 안에서 조회한 값은 아직 커밋되지 않았을 수 있으므로 저장하지 않습니다.
+        """
+        if obj is None:
+            return
+        uow = current_unit_of_work()
+        if uow is not None and uow.dirty:
+            return
+
+        name = model.__tablename__
+        if self._cache.get((name, str(key)), count=False) is _TOMBSTONE:
+            return
+
+        snapshot: dict[str, Any] = {
+            attr.key: getattr(obj, attr.key) for attr in inspect(model).column_attrs
+        }
+        self._cache.set((name, str(key)), snapshot, ttl=self.ttls.get(name), tags=tags)
+
+    def invalidate(self, model: type, key: Hashable) -> None:
+        """
+        엔티티를 캐시에서 제거합니다.
+        진행 중인 트랜잭션이 커밋된 직후에는 무효화 버스로 이 프로세스와 다른 프로세스의 캐시에서도 제거합니다.
+        """
+        self.invalidate_many(model, [key])
+
+    def invalidate_many(self, model: type, keys: Iterable[Hashable]) -> None:
+        """
+        여러 엔티티를 한 번에 캐시에서 제거합니다. 무효화 이벤트도 한 번만 보냅니다.
+        """
+        keys = [[model.__tablename__, str(key)] for key in keys]
+        if not keys:
+            return
+        self.remove(keys)
+        invalidation_bus.publish_on_commit("entity", keys)
+
+    def invalidate_tag(self, tag: str) -> None:
+        """
+        tag가 붙은 엔티티를 모두 캐시에서 제거합니다.
+        """
+        self.invalidate_tags([tag])
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """
+        tags 중 하나라도 붙은 엔티티를 모두 캐시에서 제거합니다.
+        """
+        tags = list(tags)
+        if not tags:
+            return
+        self.purge_tags(tags)
+        invalidation_bus.publish_on_commit("entity-tag", tags)
+
+    def remove(self, keys: list) -> None:
+        for name, key in keys:
+            self._cache.set((name, key), _TOMBSTONE, ttl=self.tombstone_seconds)
+
+    def purge_tags(self, tags: list) -> None:
+        for tag in tags:
+            self._cache.purge_tag(tag)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+entity_cache = EntityCache(maxsize=ENTITY_CACHE_SIZE, ttls=ENTITY_CACHE_TTL_SECONDS)
+metrics.register("entity_cache", entity_cache.stats)
+invalidation_bus.subscribe("entity", entity_cache.remove, reset=entity_cache.clear)
+invalidation_bus.subscribe("entity-tag", entity_cache.purge_tags)
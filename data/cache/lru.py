@@ -0,0 +1,136 @@
+"""
+프로세스 메모리 안에서 사용하는 LRU 캐시를 정의합니다.
+각 항목은 만료 시간과 태그를 가질 수 있으며, 태그 단위로 한꺼번에 무효화할 수 있습니다.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable
+
+
+class LRUCache:
+    """
+    최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거하는 캐시입니다.
+    ttl(초)이 지난 항목은 조회 시점에 만료됩니다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[
+            Hashable, tuple[Any, float | None, tuple]
+        ] = OrderedDict()
+        self._tags: dict[Hashable, set[Hashable]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        """
+        key에 해당하는 값을 반환합니다. 없거나 만료된 경우 default를 반환합니다.
+        """
+        item = self._data.get(key)
+        if item is None:
+            if count:
+                self.misses += 1
+            return default
+
+        value, expires_at, _ = item
+        if expires_at is not None and expires_at <= time.time():
+            self._remove(key)
+            self.expirations += 1
+            if count:
+                self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        if count:
+            self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float | None = None,
+        tags: Iterable[Hashable] = (),
+    ) -> None:
+        """
+        값을 저장합니다. ttl을 생략하면 캐시의 기본 ttl을 사용합니다.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is not None and ttl <= 0:
+            self.pop(key)
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        tags = tuple(tags)
+        expires_at = time.time() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._data) > self.maxsize:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        key에 해당하는 항목을 제거하고 그 값을 반환합니다.
+        """
+        if key not in self._data:
+            return default
+        return self._remove(key)
+
+    def purge_tag(self, tag: Hashable) -> int:
+        """
+        tag가 붙은 모든 항목을 제거하고, 제거한 항목의 수를 반환합니다.
+        """
+        keys = self._tags.pop(tag, set())
+        for key in keys:
+            if key in self._data:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._tags.clear()
+
+    def stats(self) -> dict:
+        """
+        캐시의 크기와 적중률 등의 통계를 반환합니다.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: Hashable) -> Any:
+        value, _, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return value
+
+
+_MISSING = object()
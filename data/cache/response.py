@@ -0,0 +1,238 @@
+"""
+공개된 조회 경로의 응답을 직렬화된 바이트 그대로 캐시하는 ASGI 미들웨어를 정의합니다.
+캐시 항목은 경로와 쿼리 문자열로 구분하며, 경로에서 뽑은 태그(불판 id, 장작 id 등)를 붙여 쓰기가 커밋될 때 태그 단위로 지웁니다.
+"""
+
+import re
+import time
+from typing import Any, Hashable, Iterable, Protocol
+
+from starlette.requests import Request
+
+from config import (
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_BODY_BYTES,
+    READ_YOUR_WRITES_SECONDS,
+)
+from data import metrics
+from data.bus import invalidation_bus
+from data.cache.lru import LRUCache
+from data.etag import etag_matches
+
+
+class ResponseCacheBackend(Protocol):
+    """
+    응답 캐시의 저장소가 갖추어야 할 동작입니다. LRUCache가 이 동작을 모두 갖추고 있습니다.
+    """
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        ...
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float | None = None,
+        tags: Iterable[Hashable] = (),
+    ) -> None:
+        ...
+
+    def purge_tag(self, tag: Hashable) -> int:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class ResponseCache:
+    """
+    저장소(backend)에 응답을 저장하고, 태그 단위 무효화와 적중률 통계를 담당합니다.
+    태그가 무효화된 직후 quiet_seconds 동안은, 복제 지연으로 아직 바뀌지 않은 응답을 다시 저장하지 않도록 그 태그의 응답을 저장하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        backend: ResponseCacheBackend,
+        ttl: float | None = None,
+        max_body_bytes: int = RESPONSE_CACHE_MAX_BODY_BYTES,
+        quiet_seconds: float = READ_YOUR_WRITES_SECONDS,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_body_bytes = max_body_bytes
+        self.quiet_seconds = quiet_seconds
+        self._purged_at: dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.purges = 0
+
+    def get(self, key: str) -> tuple[int, list, bytes] | None:
+        entry = self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(
+        self,
+        key: str,
+        entry: tuple[int, list, bytes],
+        tags: tuple[str, ...],
+        started_at: float,
+    ) -> None:
+        """
+        응답을 저장합니다. started_at은 응답을 만들기 시작한 시각이며,
+        그 뒤(또는 직전 quiet_seconds 이내)에 무효화된 태그가 있으면 오래된 응답일 수 있으므로 저장하지 않습니다.
+        """
+        for tag in tags:
+            purged_at = self._purged_at.get(tag)
+            if purged_at is not None and purged_at > started_at - self.quiet_seconds:
+                return
+        self.backend.set(key, entry, ttl=self.ttl, tags=tags)
+        self.stores += 1
+
+    def purge(self, *tags: str) -> None:
+        """
+        이 프로세스에서 태그가 붙은 응답들을 바로 지웁니다.
+        """
+        now = time.monotonic()
+        for tag in tags:
+            self._purged_at[tag] = now
+            self.backend.purge_tag(tag)
+        self.purges += 1
+
+        if len(self._purged_at) > 10000:
+            self._purged_at = {
+                tag: at
+                for tag, at in self._purged_at.items()
+                if now - at < self.quiet_seconds
+            }
+
+    def invalidate(self, *tags: str) -> None:
+        """
+        태그가 붙은 응답들을 지웁니다.
+        진행 중인 트랜잭션이 커밋된 직후에는 무효화 버스로 이 프로세스와 다른 프로세스의 응답들도 지웁니다.
+        """
+        self.purge(*tags)
+        invalidation_bus.publish_on_commit("response", tags)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "purges": self.purges,
+        }
+
+
+def _compile_rule(template: str, tags: tuple[str, ...]):
+    """
+    "/board/{board_id}"와 같은 경로 템플릿을 정규식으로 바꿉니다. 경로 변수는 숫자만 허용합니다.
+    """
+    pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>\\d+)", template)
+    return re.compile(f"^{pattern}$"), tags
+
+
+class ResponseCacheMiddleware:
+    """
+    rules에 해당하는 GET 요청의 성공 응답을 캐시에 저장하고, 같은 요청에는 저장된 응답을 그대로 보냅니다.
+    rules는 경로 템플릿과, 그 경로의 응답에 붙일 태그 템플릿들의 목록입니다.
+    저장된 응답의 ETag가 If-None-Match와 같으면 304로 응답합니다.
+    """
+
+    def __init__(
+        self,
+        app,
+        cache: ResponseCache,
+        rules: Iterable[tuple[str, tuple[str, ...]]],
+    ):
+        self.app = app
+        self.cache = cache
+        self.rules = [_compile_rule(template, tags) for template, tags in rules]
+
+    def _match(self, path: str) -> tuple[str, ...] | None:
+        for pattern, tags in self.rules:
+            match = pattern.match(path)
+            if match:
+                return tuple(tag.format(**match.groupdict()) for tag in tags)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        tags = self._match(scope["path"])
+        if tags is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = scope["path"] + "?" + scope["query_string"].decode("latin-1")
+        entry = self.cache.get(key)
+        if entry is not None:
+            await self._send_cached(scope, send, entry)
+            return
+
+        started_at = time.monotonic()
+        response: dict = {"status": None, "headers": [], "body": [], "size": 0}
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = list(message.get("headers", []))
+                if any(name == b"set-cookie" for name, _ in response["headers"]):
+                    response["status"] = None
+            elif message["type"] == "http.response.body" and response["status"] == 200:
+                body = message.get("body", b"")
+                response["size"] += len(body)
+                if response["size"] <= self.cache.max_body_bytes:
+                    response["body"].append(body)
+                else:
+                    response["status"] = None
+                if not message.get("more_body", False) and response["status"] == 200:
+                    self.cache.set(
+                        key,
+                        (200, response["headers"], b"".join(response["body"])),
+                        tags,
+                        started_at,
+                    )
+            await send(message)
+
+        await self.app(scope, receive, _send)
+
+    @staticmethod
+    async def _send_cached(scope, send, entry: tuple[int, list, bytes]):
+        status, headers, body = entry
+        for name, value in headers:
+            if name == b"etag" and etag_matches(
+                Request(scope), value.decode("latin-1")
+            ):
+                headers = [(n, v) for n, v in headers if n != b"content-length"]
+                await send(
+                    {"type": "http.response.start", "status": 304, "headers": headers}
+                )
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+response_cache = ResponseCache(
+    LRUCache(maxsize=RESPONSE_CACHE_SIZE), ttl=RESPONSE_CACHE_TTL_SECONDS
+)
+metrics.register("response_cache", response_cache.stats)
+invalidation_bus.subscribe(
+    "response", lambda tags: response_cache.purge(*tags), reset=response_cache.clear
+)
@@ -1,41 +1,349 @@
+import math
+import time
+from http.cookies import SimpleCookie
+from typing import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import Enum
 from functools import wraps
 from sqlalchemy import create_engine, MetaData, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from config import DB_CONFIG, SITE_ENV
+from config import DB_CONFIG, DB_REPLICA_CONFIG, SITE_ENV, READ_YOUR_WRITES_SECONDS
 
 
 SQLALCHEMY_DATABASE_URL = f"{DB_CONFIG['rdb']}://{DB_CONFIG['db_user']}:{DB_CONFIG['db_password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['db']}"
+SQLALCHEMY_READ_DATABASE_URL = f"{DB_REPLICA_CONFIG['rdb']}://{DB_REPLICA_CONFIG['db_user']}:{DB_REPLICA_CONFIG['db_password']}@{DB_REPLICA_CONFIG['host']}:{DB_REPLICA_CONFIG['port']}/{DB_REPLICA_CONFIG['db']}"
 if SITE_ENV == "test":
     SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///test.db"
+    SQLALCHEMY_READ_DATABASE_URL = "sqlite+aiosqlite:///test.db"
     # TODO: local postgresql db를 사용하는 편이 나을 것 같다
 
 
 metadata = MetaData()
 engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = create_async_engine(SQLALCHEMY_READ_DATABASE_URL)
+
+
+@event.listens_for(read_engine.sync_engine, "connect")
+def _set_read_only(dbapi_connection, connection_record):
+    """
+    조회 전용 엔진의 커넥션은 쓰기를 할 수 없도록 설정합니다.
+    """
+    if read_engine.dialect.name == "postgresql":
+        read_engine.dialect.set_readonly(dbapi_connection, True)
+    elif read_engine.dialect.name == "sqlite":
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
 
 Base = declarative_base()
 
 async_session = async_sessionmaker(bind=engine, expire_on_commit=False)
+async_read_session = async_sessionmaker(bind=read_engine, expire_on_commit=False)
+
+
+class ReadYourWritesWindow:
+    """
+    최근에 쓰기를 한 요청자를 기억하여, 일정 시간 동안은 그 요청자의 조회를 기본 데이터베이스로 보냅니다.
+    복제 지연 때문에 자신이 방금 쓴 내용이 보이지 않는 문제를 막습니다.
+    이 프로세스의 기억은 인증된 요청자만 구분하며, 다른 워커나 토큰 없이 보낸 조회를 위해
+    마지막으로 쓴 시각을 쿠키(cookie_name)로도 클라이언트에 보냅니다.
+    """
+
+    cookie_name = "last_write_at"
+
+    def __init__(self, seconds: float, max_size: int = 10000):
+        self.seconds = seconds
+        self.max_size = max_size
+        self._written_at: dict[str, float] = {}
+
+    def mark(self, keys: tuple[str, ...]) -> None:
+        if self.seconds <= 0:
+            return
+        now = time.monotonic()
+        if len(self._written_at) >= self.max_size:
+            self._written_at = {
+                k: t for k, t in self._written_at.items() if now - t < self.seconds
+            }
+        for key in keys:
+            self._written_at[key] = now
+
+    def cookie(self) -> bytes:
+        """
+        지금 쓰기를 했다고 알리는 Set-Cookie 헤더 값을 반환합니다. 시간 창이 지나면 브라우저가 버립니다.
+        """
+        return (
+            f"{self.cookie_name}={time.time():.3f}; Max-Age={math.ceil(self.seconds)}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        ).encode("latin-1")
+
+    def active(self, keys: tuple[str, ...], last_write_at: float | None = None) -> bool:
+        """
+        keys 중 하나가 최근에 쓰기를 했거나, 요청이 가져온 마지막 쓰기 시각(last_write_at)이 시간 창 안이면 참입니다.
+        last_write_at은 다른 워커가 기록했을 수 있으므로 단조 시계 대신 벽시계와 비교합니다.
+        """
+        if (
+            last_write_at is not None
+            and 0 <= time.time() - last_write_at < self.seconds
+        ):
+            return True
+        now = time.monotonic()
+        for key in keys:
+            written_at = self._written_at.get(key)
+            if written_at is not None and now - written_at < self.seconds:
+                return True
+        return False
+
+
+read_your_writes = ReadYourWritesWindow(READ_YOUR_WRITES_SECONDS)
+
+
+class Propagation(str, Enum):
+    """
+    Transactional로 감싼 함수가 진행 중인 트랜잭션에 참여하는 방식을 정의합니다.
+    """
+
+    JOIN = "JOIN"  # 진행 중인 트랜잭션이 있으면 참여하고, 없으면 새로 시작합니다.
+    REQUIRES_NEW = "REQUIRES_NEW"  # 항상 새로운 세션과 트랜잭션에서 실행합니다.
+    READ_ONLY = "READ_ONLY"  # 진행 중인 트랜잭션에 참여하되, 직접 시작한 경우 커밋하지 않습니다.
+
+    def __str__(self):
+        return str(self.value)
+
+
+class UnitOfWork:
+    """
+    하나의 요청(작업 단위) 동안 공유되는 세션과 트랜잭션 상태를 관리합니다.
+    세션은 실제로 데이터베이스를 사용할 때 처음 생성되며, 쓰기가 있었던 경우에만 커밋합니다.
+    조회 전용 작업 단위의 조회는 읽기 복제본 세션에서 수행합니다.
+    """
+
+    def __init__(
+        self,
+        read_only: bool = False,
+        principal: tuple[str, ...] = (),
+        last_write_at: float | None = None,
+    ):
+        self.read_only = read_only
+        self.principal = principal
+        self.session: AsyncSession | None = None
+        self.read_session: AsyncSession | None = None
+        self.dirty = False
+        self.wrote = False
+        self.use_replica = read_only and not read_your_writes.active(
+            principal, last_write_at
+        )
+        self._after_commit: list[Callable[[], None]] = []
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        쓰기가 커밋된 직후에 호출할 함수를 등록합니다. 롤백되면 호출하지 않습니다.
+        """
+        self._after_commit.append(callback)
+
+    def get_session(self, read_only: bool = False) -> AsyncSession:
+        if read_only and self.use_replica and not self.dirty:
+            if self.read_session is None:
+                self.read_session = async_read_session()
+            return self.read_session
+
+        if not read_only:
+            self.dirty = True
+        if self.session is None:
+            self.session = async_session()
+        return self.session
+
+    async def commit(self) -> None:
+        if self.read_session is not None:
+            await self.read_session.rollback()
+        if self.session is None:
+            return
+        if self.dirty:
+            await self.session.commit()
+            self.dirty = False
+            self.wrote = True
+            read_your_writes.mark(self.principal)
+            callbacks, self._after_commit = self._after_commit, []
+            for callback in callbacks:
+                callback()
+        else:
+            await self.session.rollback()
+
+    async def rollback(self) -> None:
+        self.dirty = False
+        self._after_commit.clear()
+        if self.read_session is not None:
+            await self.read_session.rollback()
+        if self.session is not None:
+            await self.session.rollback()
+
+    async def close(self) -> None:
+        if self.read_session is not None:
+            await self.read_session.close()
+            self.read_session = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+_current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    """
+    현재 컨텍스트에서 진행 중인 작업 단위를 반환합니다.
+    """
+    return _current_unit_of_work.get()
+
+
+def on_commit(callback: Callable[[], None]) -> None:
+    """
+    진행 중인 작업 단위가 커밋된 직후에 callback을 호출합니다.
+    진행 중인 작업 단위가 없으면 바로 호출합니다.
+    """
+    uow = _current_unit_of_work.get()
+    if uow is None:
+        callback()
+    else:
+        uow.after_commit(callback)
+
+
+@asynccontextmanager
+async def unit_of_work(
+    read_only: bool = False,
+    principal: tuple[str, ...] = (),
+    last_write_at: float | None = None,
+):
+    """
+    블록 안의 모든 repository 호출이 하나의 세션과 트랜잭션을 공유하도록 합니다.
+    블록이 정상 종료되면 커밋하고, 예외가 발생하면 롤백합니다.
+    """
+    uow = UnitOfWork(
+        read_only=read_only, principal=principal, last_write_at=last_write_at
+    )
+    token = _current_unit_of_work.set(uow)
+    try:
+        yield uow
+        await uow.commit()
+    except BaseException:
+        await uow.rollback()
+        raise
+    finally:
+        _current_unit_of_work.reset(token)
+        await uow.close()
+
+
+@asynccontextmanager
+async def streaming_session() -> AsyncIterator[AsyncSession]:
+    """
+    응답을 보내는 동안 결과를 나누어 읽는(서버 측 커서) 조회에 사용할 세션을 엽니다.
+    요청의 작업 단위는 응답을 보내기 시작할 때 끝나므로, 작업 단위와 별도의 세션을 사용합니다.
+    진행 중인 작업 단위가 읽기 복제본을 사용하지 않으면(최근에 쓰기를 한 요청자 등) 기본 데이터베이스를 사용합니다.
+    """
+    uow = _current_unit_of_work.get()
+    if uow is None or uow.use_replica:
+        session_factory = async_read_session
+    else:
+        session_factory = async_session
+    async with session_factory() as session:
+        yield session
 
 
 class Transactional:
+    def __init__(self, propagation: Propagation = Propagation.JOIN):
+        self.propagation = propagation
+
     def __call__(self, func):
+        read_only = self.propagation == Propagation.READ_ONLY
+
         @wraps(func)
         async def _transactional(*args, **kwargs):
-            async with async_session() as session:
-                if kwargs.get("session"):
-                    result = await func(*args, **kwargs)
-                    await session.commit()
-                    return result
-                try:
-                    kwargs["session"] = session
-                    result = await func(*args, **kwargs)
-                    await session.commit()
-                except Exception as e:
-                    # logger.exception(f"{type(e).__name__} : {str(e)}")
-                    await session.rollback()
-                    raise e
-                return result
+            if kwargs.get("session") is not None:
+                # 호출한 쪽에서 세션을 넘긴 경우, 트랜잭션 관리도 호출한 쪽에서 담당합니다.
+                return await func(*args, **kwargs)
+
+            uow = _current_unit_of_work.get()
+            if uow is not None and self.propagation != Propagation.REQUIRES_NEW:
+                kwargs["session"] = uow.get_session(read_only)
+                return await func(*args, **kwargs)
+
+            async with unit_of_work(read_only=read_only) as uow:
+                kwargs["session"] = uow.get_session(read_only)
+                return await func(*args, **kwargs)
 
         return _transactional
+
+
+def _request_principal(scope) -> tuple[str, ...]:
+    """
+    read-your-writes 판단에 사용할 요청자 식별값들을 반환합니다.
+    인증 토큰만 사용합니다. 클라이언트 주소는 NAT나 프록시 뒤의 여러 사용자가 함께 쓸 수 있기 때문입니다.
+    """
+    return tuple(
+        value.decode("latin-1")
+        for name, value in scope.get("headers", [])
+        if name == b"authorization"
+    )
+
+
+def _request_last_write_at(scope) -> float | None:
+    """
+    요청의 쿠키에 담긴 마지막 쓰기 시각을 반환합니다. 없거나 읽을 수 없으면 None을 반환합니다.
+    """
+    for name, value in scope.get("headers", []):
+        if name != b"cookie":
+            continue
+        morsel = SimpleCookie(value.decode("latin-1")).get(read_your_writes.cookie_name)
+        if morsel is None:
+            continue
+        try:
+            return float(morsel.value)
+        except ValueError:
+            return None
+    return None
+
+
+class UnitOfWorkMiddleware:
+    """
+    HTTP 요청마다 하나의 작업 단위를 열어, 요청 안의 모든 repository 호출이 같은 세션을 사용하도록 합니다.
+    응답을 보내기 직전에 상태 코드가 성공이면 커밋하고, 실패면 롤백합니다.
+    GET 요청의 조회는 읽기 복제본으로 보내되, 최근에 쓰기를 한 요청자의 조회는 기본 데이터베이스로 보냅니다.
+    쓰기를 커밋한 응답에는 마지막 쓰기 시각을 쿠키로 붙여, 다른 워커가 받은 조회도 기본 데이터베이스로 보내도록 합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        read_only = scope["method"] in ("GET", "HEAD")
+        async with unit_of_work(
+            read_only=read_only,
+            principal=_request_principal(scope),
+            last_write_at=_request_last_write_at(scope),
+        ) as uow:
+
+            async def _send(message):
+                if message["type"] == "http.response.start":
+                    if message["status"] < 400:
+                        await uow.commit()
+                    else:
+                        await uow.rollback()
+                    if uow.wrote and read_your_writes.seconds > 0:
+                        message = {
+                            **message,
+                            "headers": [
+                                *message.get("headers", []),
+                                (b"set-cookie", read_your_writes.cookie()),
+                            ],
+                        }
+                await send(message)
+
+            await self.app(scope, receive, _send)
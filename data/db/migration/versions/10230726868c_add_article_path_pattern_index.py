@@ -0,0 +1,45 @@
+"""add article path pattern index
+
+Revision ID: 10230726868c
+Revises: 56a3f986a74e
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "10230726868c"
+down_revision: Union[str, None] = "56a3f986a74e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_article_path_pattern",
+            "article",
+            ["path"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_ops={"path": "text_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_article_path_pattern",
+            table_name="article",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,132 @@
+"""add article path key
+
+Revision ID: 3b7c9e0d4a18
+Revises: 8e4d2a61c3f5
+Create Date: 2026-10-18 17:02:45.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7c9e0d4a18"
+down_revision: Union[str, None] = "8e4d2a61c3f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 이 리비전을 만들 때의 endpoint/article/path.py 값입니다. 앱 코드가 바뀌어도 이 리비전의 동작은 바뀌지 않도록 옮겨 둡니다.
+PATH_KEY_WIDTH = 10
+
+
+def _path_key(path: str) -> str:
+    return ".".join(
+        segment.zfill(PATH_KEY_WIDTH) for segment in path.split("/") if segment
+    )
+
+
+def _backfill(dialect_name: str) -> None:
+    if dialect_name == "postgresql":
+        op.execute(
+            f"""
+            UPDATE article SET path_key = (
+                SELECT string_agg(lpad(segment, {PATH_KEY_WIDTH}, '0'), '.' ORDER BY n)
+                FROM unnest(string_to_array(ltrim(article.path, '/'), '/'))
+                    WITH ORDINALITY AS segments(segment, n)
+            )
+            """
+        )
+        return
+
+    article = sa.table(
+        "article", sa.column("id", sa.Integer), sa.column("path_key", sa.String)
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, path FROM article")).all()
+    for article_id, path in rows:
+        bind.execute(
+            article.update()
+            .where(article.c.id == article_id)
+            .values(path_key=_path_key(path or ""))
+        )
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    # 하위 트리를 키의 범위로 찾으려면 '.'가 '/'보다 앞에 오는 바이트 순서로 비교해야 하므로,
+    # PostgreSQL에서는 데이터베이스의 정렬 규칙 대신 "C" 정렬 규칙을 사용합니다.
+    op.add_column(
+        "article",
+        sa.Column(
+            "path_key",
+            sa.String().with_variant(sa.String(collation="C"), "postgresql"),
+            nullable=True,
+        ),
+    )
+    _backfill(dialect_name)
+
+    # PostgreSQL에서는 테이블 쓰기를 막지 않도록 CONCURRENTLY로 만들며, 이는 트랜잭션 밖에서만 실행할 수 있습니다.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_article_board_id_path_key",
+            "article",
+            ["board_id", "path_key"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_article_path_key",
+            "article",
+            ["path_key"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_article_board_id_path",
+            table_name="article",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+        if dialect_name == "postgresql":
+            # 하위 트리 조회가 path_key를 사용하므로 path의 접두어 검색 인덱스는 더 이상 쓰이지 않습니다.
+            op.drop_index(
+                "ix_article_path_pattern",
+                table_name="article",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_article_board_id_path",
+            "article",
+            ["board_id", "path"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        if dialect_name == "postgresql":
+            op.create_index(
+                "ix_article_path_pattern",
+                "article",
+                ["path"],
+                unique=False,
+                if_not_exists=True,
+                postgresql_ops={"path": "text_pattern_ops"},
+                postgresql_concurrently=True,
+            )
+        for name in ("ix_article_path_key", "ix_article_board_id_path_key"):
+            op.drop_index(
+                name,
+                table_name="article",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+    op.drop_column("article", "path_key")
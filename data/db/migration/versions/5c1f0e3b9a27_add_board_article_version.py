@@ -0,0 +1,34 @@
+"""add board article version
+
+Revision ID: 5c1f0e3b9a27
+Revises: 10230726868c
+Create Date: 2026-10-18 11:02:47.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1f0e3b9a27"
+down_revision: Union[str, None] = "10230726868c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "board",
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "article",
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("article", "version")
+    op.drop_column("board", "version")
@@ -0,0 +1,48 @@
+"""add foreign key composite indexes
+
+Revision ID: 8e4d2a61c3f5
+Revises: 5c1f0e3b9a27
+Create Date: 2026-10-18 15:40:12.584903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4d2a61c3f5"
+down_revision: Union[str, None] = "5c1f0e3b9a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_article_board_id_path", "article", ["board_id", "path"]),
+    ("ix_article_creator_id_id", "article", ["creator_id", "id"]),
+    ("ix_comment_article_id_id", "comment", ["article_id", "id"]),
+    ("ix_comment_creator_id_id", "comment", ["creator_id", "id"]),
+    ("ix_board_creator_id_id", "board", ["creator_id", "id"]),
+]
+
+
+def upgrade() -> None:
+    # PostgreSQL에서는 테이블 쓰기를 막지 않도록 CONCURRENTLY로 만들며, 이는 트랜잭션 밖에서만 실행할 수 있습니다.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, if_exists=True, postgresql_concurrently=True
+            )
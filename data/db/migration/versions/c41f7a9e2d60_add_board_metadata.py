@@ -0,0 +1,60 @@
+"""add board metadata
+
+Revision ID: c41f7a9e2d60
+Revises: 3b7c9e0d4a18
+Create Date: 2026-10-18 18:21:09.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41f7a9e2d60"
+down_revision: Union[str, None] = "3b7c9e0d4a18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("board", sa.Column("root_article_id", sa.Integer(), nullable=True))
+    op.add_column(
+        "board",
+        sa.Column("article_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "board",
+        sa.Column("comment_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "board",
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # 최상위 장작은 path_key에 '.'가 없는 장작입니다.
+    op.execute(
+        """
+        UPDATE board SET
+            root_article_id = (
+                SELECT min(article.id) FROM article
+                WHERE article.board_id = board.id AND article.path_key NOT LIKE '%.%'
+            ),
+            article_count = (
+                SELECT count(*) FROM article WHERE article.board_id = board.id
+            ),
+            comment_count = (
+                SELECT count(*) FROM comment
+                JOIN article ON article.id = comment.article_id
+                WHERE article.board_id = board.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("board", "last_activity_at")
+    op.drop_column("board", "comment_count")
+    op.drop_column("board", "article_count")
+    op.drop_column("board", "root_article_id")
@@ -0,0 +1,36 @@
+"""add article path key ltree index
+
+Revision ID: e5a8d2c7f913
+Revises: c41f7a9e2d60
+Create Date: 2026-10-18 21:40:12.204981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a8d2c7f913"
+down_revision: Union[str, None] = "c41f7a9e2d60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ARTICLE_PATH_LTREE를 나중에 켜도 인덱스가 있도록, PostgreSQL에서는 설정과 관계없이 만듭니다.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS ltree")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_article_path_key_ltree "
+            "ON article USING gist (CAST(path_key AS LTREE))"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_article_path_key_ltree")
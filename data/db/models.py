@@ -1,6 +1,29 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, event
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Boolean,
+    Index,
+    event,
+    cast,
+)
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import UserDefinedType
 from data.db.database import Base
+from config import ARTICLE_PATH_LTREE
+
+
+class LTREE(UserDefinedType):
+    """
+    PostgreSQL ltree 확장의 계층 경로 타입입니다. 컬럼 타입이 아니라 식을 변환(CAST)할 때 사용합니다.
+    """
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "LTREE"
 
 
 class User(Base):
@@ -19,11 +42,26 @@ class Board(Base):
     name = Column(String, index=True)
     description = Column(String)
 
+    # 불판이나 그 장작 목록이 바뀔 때마다 증가하며, 조회 응답의 ETag로 사용합니다.
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # 장작과 댓글을 추가하거나 삭제하는 트랜잭션 안에서 함께 갱신하여, 장작이나 댓글을 세지 않고 바로 읽습니다.
+    # 최상위 장작은 장작과 불판이 서로를 참조하지 않도록 외래 키 없이 id만 저장합니다.
+    root_article_id = Column(Integer, nullable=True)
+    article_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_activity_at = Column(DateTime(timezone=True), nullable=True)
+
     creator_id = Column(
         Integer, ForeignKey("user.id", onupdate="CASCADE", ondelete="CASCADE")
     )
     creator = relationship("User", backref="boards")
 
+    __table_args__ = (
+        # 사용자가 만든 불판을 찾거나, 사용자 삭제가 전파될 때 사용합니다.
+        Index("ix_board_creator_id_id", "creator_id", "id"),
+    )
+
 
 class Article(Base):
     __tablename__ = "article"
@@ -32,6 +70,9 @@ class Article(Base):
     name = Column(String, index=True)
     content = Column(String)
 
+    # 장작이나 그 댓글 목록이 바뀔 때마다 증가하며, 조회 응답의 ETag로 사용합니다.
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
     creator_id = Column(
         Integer, ForeignKey("user.id", onupdate="CASCADE", ondelete="CASCADE")
     )
@@ -49,6 +90,25 @@ class Article(Base):
 
     path = Column(String, index=True)
     path_logical = Column(String)
+    # path의 id들을 같은 폭으로 채워 '.'로 이은 키로, 정렬과 하위 트리 조회에 사용합니다. (endpoint/article/path.py)
+    # 키의 범위로 하위 트리를 찾으므로 '.'가 '/'보다 앞에 오는 바이트 순서로 비교해야 합니다. (PostgreSQL은 "C" 정렬 규칙)
+    path_key = Column(String().with_variant(String(collation="C"), "postgresql"))
+
+    __table_args__ = (
+        # 불판의 장작 목록(WHERE board_id = ? ORDER BY path_key)을 정렬 없이 인덱스 순서로 읽습니다.
+        Index("ix_article_board_id_path_key", "board_id", "path_key"),
+        # 하위 트리 조회(path_key 범위)에 사용합니다.
+        Index("ix_article_path_key", "path_key"),
+        # ARTICLE_PATH_LTREE를 켜면 ltree 연산자(<@, @>)로 상하위 장작을 찾을 때 사용합니다.
+        Index(
+            "ix_article_path_key_ltree",
+            cast(path_key, LTREE),
+            postgresql_using="gist",
+        ).ddl_if(
+            dialect="postgresql", callable_=lambda *args, **kw: ARTICLE_PATH_LTREE
+        ),
+        Index("ix_article_creator_id_id", "creator_id", "id"),
+    )
 
 
 class Comment(Base):
@@ -66,3 +126,9 @@ class Comment(Base):
         Integer, ForeignKey("article.id", onupdate="CASCADE", ondelete="CASCADE")
     )
     article = relationship("Article", backref="comments")
+
+    __table_args__ = (
+        # 장작의 댓글 목록(WHERE article_id = ? ORDER BY id DESC)을 정렬 없이 인덱스 순서로 읽습니다.
+        Index("ix_comment_article_id_id", "article_id", "id"),
+        Index("ix_comment_creator_id_id", "creator_id", "id"),
+    )
@@ -0,0 +1,32 @@
+"""
+작성자만 수정, 삭제할 수 있는 행을 다룰 때 사용합니다.
+수정, 삭제 문에 작성자 조건을 함께 걸어 한 번에 실행하고, 바뀐 행이 없을 때만 행이 있는지 확인하여
+존재하지 않는 행(400)과 다른 사용자의 행(401)을 구분합니다.
+"""
+
+from typing import Any, NoReturn
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from data.db.database import Transactional, Propagation
+
+
+@Transactional(Propagation.READ_ONLY)
+async def _exists(model: type, key: Any, session: AsyncSession = None) -> bool:
+    stmt = select(model.id).where(model.id == key)
+
+    res = await session.execute(stmt)
+
+    return res.first() is not None
+
+
+async def raise_not_owned(model: type, key: Any, missing_detail: str) -> NoReturn:
+    """
+    작성자 조건을 건 수정, 삭제가 아무 행도 바꾸지 못했을 때 호출합니다.
+    행이 없으면 missing_detail로 400을, 행이 있으면 다른 사용자의 행이므로 401을 발생시킵니다.
+    """
+    if await _exists(model, key):
+        raise HTTPException(status_code=401, detail="권한이 없습니다.")
+    raise HTTPException(status_code=400, detail=missing_detail)
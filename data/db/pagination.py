@@ -0,0 +1,61 @@
+"""
+키셋(커서) 기반 페이지네이션에 사용하는 커서를 만들고 해석합니다.
+커서는 마지막으로 받은 행의 정렬 키를 담은 불투명한 문자열이며, 다음 페이지는 그 키 다음부터 조회합니다.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Callable, Sequence
+
+
+def encode_cursor(kind: str, key: list) -> str:
+    """
+    kind(커서를 사용하는 목록의 종류)와 정렬 키를 커서 문자열로 만듭니다.
+    """
+    raw = json.dumps({"k": kind, "v": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(kind: str, cursor: str, expected: type) -> list:
+    """
+    커서 문자열에서 정렬 키를 꺼냅니다.
+    커서의 형식이 잘못되었거나, 다른 목록의 커서이거나, 정렬 키가 expected 타입 값들의 비어 있지 않은 목록이 아니면
+    ValueError를 발생시킵니다.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    key = payload.get("v")
+    # bool은 int의 하위 타입이므로 따로 걸러냅니다.
+    if (
+        not isinstance(key, list)
+        or not key
+        or not all(
+            isinstance(value, expected) and not isinstance(value, bool) for value in key
+        )
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return key
+
+
+def paginate(
+    rows: Sequence[Any], limit: int | None, kind: str, key: Callable[[Any], list]
+) -> tuple[list, str | None]:
+    """
+    limit + 1개까지 조회한 rows를 limit개로 자르고, 다음 페이지가 있으면 그 커서를 함께 반환합니다.
+    """
+    if limit is None or len(rows) <= limit:
+        return list(rows), None
+
+    items = list(rows[:limit])
+    return items, encode_cursor(kind, key(items[-1]))
+
+
+# 다음 페이지의 커서를 담아 보내는 응답 헤더입니다.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
@@ -0,0 +1,29 @@
+"""
+조회 전용 레코드(NamedTuple)의 필드 순서대로 조회할 컬럼 목록을 만듭니다.
+응답에 필요한 필드만 데이터베이스에서 읽어오도록, 나머지 컬럼은 NULL로 대신합니다.
+"""
+
+from typing import Iterable
+
+from sqlalchemy import null
+
+
+def record_columns(
+    model: type,
+    record: type,
+    fields: Iterable[str] | None = None,
+    required: Iterable[str] = (),
+) -> list:
+    """
+    record의 필드마다 model에서 같은 이름의 컬럼을 골라 select에 넘길 목록을 반환합니다.
+    fields가 주어지면 fields와 required(정렬이나 커서에 필요한 필드)에 속하지 않는 컬럼은 조회하지 않고 NULL로 채웁니다.
+    레코드의 모양은 그대로이므로 record._make로 만들 수 있습니다.
+    """
+    if fields is None:
+        return [getattr(model, field) for field in record._fields]
+
+    wanted = set(fields) | set(required)
+    return [
+        getattr(model, field) if field in wanted else null().label(field)
+        for field in record._fields
+    ]
@@ -0,0 +1,53 @@
+"""
+조회 응답의 ETag를 만들고, If-None-Match 조건부 요청에 304로 응답합니다.
+ETag는 엔티티의 버전으로 만들기 때문에, 행을 불러오지 않고도 변경 여부를 판단할 수 있습니다.
+"""
+
+from fastapi import Request, Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(kind: str, entity_id: int, version: int | None) -> str | None:
+    """
+    kind(응답의 종류)와 엔티티의 id, 버전으로 약한 ETag를 만듭니다.
+    엔티티가 없어 버전이 None이면 None을 반환합니다.
+    """
+    if version is None:
+        return None
+    return f'W/"{kind}-{entity_id}-{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    요청의 If-None-Match 헤더가 etag와 일치하는지 확인합니다. 약한 비교를 사용합니다.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    def _opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def conditional_response(
+    request: Request, response: Response, etag: str | None
+) -> Response | None:
+    """
+    응답에 ETag 헤더를 설정합니다.
+    요청의 If-None-Match가 etag와 일치하면 본문 없는 304 응답을 반환하고, 아니면 None을 반환합니다.
+    """
+    if etag is None:
+        return None
+
+    headers = {ETAG_HEADER: etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
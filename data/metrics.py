@@ -0,0 +1,21 @@
+"""
+서버 내부 구성 요소(캐시, 작업 풀 등)의 통계를 한 곳에 모아 조회할 수 있도록 합니다.
+"""
+
+from typing import Callable
+
+_collectors: dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, collector: Callable[[], dict]) -> None:
+    """
+    name으로 통계 수집 함수를 등록합니다. 같은 이름으로 다시 등록하면 덮어씁니다.
+    """
+    _collectors[name] = collector
+
+
+def collect() -> dict[str, dict]:
+    """
+    등록된 모든 통계 수집 함수를 호출하여 결과를 반환합니다.
+    """
+    return {name: collector() for name, collector in _collectors.items()}
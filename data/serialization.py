@@ -0,0 +1,283 @@
+"""
+조회 결과를 응답 모델에 맞추어 JSON 바이트로 직렬화합니다.
+singleflight로 여러 요청이 같은 결과 객체를 공유하면, 처음 만든 바이트를 재사용하여 직렬화도 한 번만 수행합니다.
+
+응답 모델의 필드가 모두 단순한 값(int, str, datetime 등과 그 Optional)이면, 행마다 Pydantic 검증을 거치지 않고
+행의 속성 값을 그대로 꺼내 JSON으로 인코딩합니다. orjson이 설치되어 있으면 orjson을 사용합니다.
+목록 조회 경로는 fields 쿼리 파라미터로 응답에 포함할 필드를 고를 수 있습니다.
+"""
+
+import json
+import types
+from collections import OrderedDict
+from datetime import datetime
+from operator import attrgetter
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from fastapi import HTTPException, Query
+from starlette.requests import Request
+from pydantic import BaseModel, StringConstraints, TypeAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_adapters: dict[Any, TypeAdapter] = {}
+_row_encoders: dict[tuple, "RowEncoder | None"] = {}
+
+# 최근에 직렬화한 결과 객체와 그 바이트입니다. 객체를 함께 보관하므로 id가 다른 객체에 재사용되지 않습니다.
+_recent: OrderedDict[tuple, tuple[Any, bytes]] = OrderedDict()
+_RECENT_SIZE = 32
+
+_SIMPLE_TYPES = (int, str, float, bool)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class RowEncoder:
+    """
+    ORM 객체나 ArticleRecord처럼 속성으로 값을 갖는 행들을, 응답 모델의 필드 순서대로 JSON 배열로 만듭니다.
+    값은 데이터베이스 컬럼에서 온 것으로 보고 타입 검증은 생략하며, 대문자 변환과 같은 변환만 적용합니다.
+    """
+
+    def __init__(self, fields: list[str], converters: dict[str, Callable]):
+        self.fields = tuple(fields)
+        self.converters = list(converters.items())
+        self._getter = attrgetter(*self.fields)
+        self._single = len(self.fields) == 1
+
+    def row(self, obj: Any) -> dict:
+        values = self._getter(obj)
+        row = dict(zip(self.fields, (values,) if self._single else values))
+        for field, convert in self.converters:
+            if row[field] is not None:
+                row[field] = convert(row[field])
+        return row
+
+    def encode(self, rows: Any) -> bytes:
+        return _dumps([self.row(obj) for obj in rows])
+
+    def encode_lines(self, rows: Any) -> bytes:
+        return b"".join(_dumps(self.row(obj)) + b"\n" for obj in rows)
+
+
+def _datetime_to_json(value: datetime) -> str:
+    """
+    Pydantic과 같은 형식(ISO 8601, UTC는 'Z')의 문자열로 바꿉니다.
+    """
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        return text[:-6] + "Z"
+    return text
+
+
+def _simple_annotation(annotation: Any) -> Any:
+    """
+    annotation이 단순한 값이나 datetime, 또는 그 Optional이면 None을 뺀 타입을, 아니면 None을 반환합니다.
+    """
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        annotation = args[0]
+    if annotation in _SIMPLE_TYPES or annotation is datetime:
+        return annotation
+    return None
+
+
+def _string_converter(constraints: StringConstraints) -> Callable | None:
+    """
+    대소문자 변환만 지정된 constr이면 그 변환 함수를, 그 밖의 제약이 있으면 None을 반환합니다.
+    """
+    if any(
+        getattr(constraints, name) is not None
+        for name in (
+            "strip_whitespace",
+            "strict",
+            "min_length",
+            "max_length",
+            "pattern",
+        )
+    ):
+        return None
+    if constraints.to_upper:
+        return str.upper
+    if constraints.to_lower:
+        return str.lower
+    return None
+
+
+def row_encoder(
+    model: type, fields: tuple[str, ...] | None = None
+) -> RowEncoder | None:
+    """
+    model을 행 단위 인코딩으로 직렬화할 수 있으면 RowEncoder를, 검증이 필요한 필드가 있으면 None을 반환합니다.
+    fields가 주어지면 그 필드들만 인코딩합니다.
+    """
+    key = (model, fields)
+    if key in _row_encoders:
+        return _row_encoders[key]
+
+    encoder = None
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        encoder = _build_row_encoder(model, fields)
+    _row_encoders[key] = encoder
+    return encoder
+
+
+def _build_row_encoder(
+    model: type[BaseModel], fields: tuple[str, ...] | None
+) -> RowEncoder | None:
+    decorators = model.__pydantic_decorators__
+    if any(
+        (
+            decorators.validators,
+            decorators.field_validators,
+            decorators.root_validators,
+            decorators.field_serializers,
+            decorators.model_serializers,
+            decorators.model_validators,
+            decorators.computed_fields,
+        )
+    ):
+        return None
+
+    names: list[str] = []
+    converters: dict[str, Callable] = {}
+    for name, field in model.model_fields.items():
+        if fields is not None and name not in fields:
+            continue
+        annotation = _simple_annotation(field.annotation)
+        if annotation is None or field.alias or field.exclude:
+            return None
+        if annotation is datetime:
+            converters[name] = _datetime_to_json
+        for metadata in field.metadata:
+            convert = (
+                _string_converter(metadata)
+                if isinstance(metadata, StringConstraints)
+                else None
+            )
+            if convert is None:
+                return None
+            converters[name] = convert
+        names.append(name)
+    return RowEncoder(names, converters)
+
+
+def _adapter(schema: Any) -> TypeAdapter:
+    adapter = _adapters.get(schema)
+    if adapter is None:
+        adapter = _adapters[schema] = TypeAdapter(schema)
+    return adapter
+
+
+def _encode(schema: Any, value: Any, fields: tuple[str, ...] | None) -> bytes:
+    if get_origin(schema) is list:
+        (item,) = get_args(schema)
+        encoder = row_encoder(item, fields)
+        if encoder is not None:
+            return encoder.encode(value)
+
+    adapter = _adapter(schema)
+    include = {"__all__": set(fields)} if fields is not None else None
+    return adapter.dump_json(
+        adapter.validate_python(value, from_attributes=True), include=include
+    )
+
+
+def dump_json(schema: Any, value: Any, fields: tuple[str, ...] | None = None) -> bytes:
+    """
+    value를 schema(예: list[ArticleGet])에 맞추어 JSON 바이트로 만듭니다.
+    ORM 객체처럼 속성으로 값을 갖는 객체도 사용할 수 있습니다.
+    schema가 목록이고 fields가 주어지면, 각 항목에서 그 필드들만 포함합니다.
+    """
+    key = (schema, id(value), fields)
+    entry = _recent.get(key)
+    if entry is not None and entry[0] is value:
+        return entry[1]
+
+    body = _encode(schema, value, fields)
+
+    _recent[key] = (value, body)
+    while len(_recent) > _RECENT_SIZE:
+        _recent.popitem(last=False)
+    return body
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    요청의 Accept 헤더가 NDJSON(한 줄에 JSON 객체 하나)을 요청하는지 확인합니다.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def encode_ndjson(
+    model: type, rows: Any, fields: tuple[str, ...] | None = None
+) -> bytes:
+    """
+    rows를 model에 맞추어 한 줄에 하나씩 JSON 객체로 만듭니다.
+    """
+    encoder = row_encoder(model, fields)
+    if encoder is not None:
+        return encoder.encode_lines(rows)
+
+    adapter = _adapter(model)
+    include = set(fields) if fields is not None else None
+    return b"".join(
+        adapter.dump_json(
+            adapter.validate_python(row, from_attributes=True), include=include
+        )
+        + b"\n"
+        for row in rows
+    )
+
+
+async def iter_ndjson(
+    model: type,
+    batches: AsyncIterable[Any],
+    fields: tuple[str, ...] | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    행 묶음(batches)을 받는 대로 NDJSON으로 인코딩하여 내보냅니다. StreamingResponse의 본문으로 사용합니다.
+    """
+    async for rows in batches:
+        if rows:
+            yield encode_ndjson(model, rows, fields)
+
+
+class FieldSelection:
+    """
+    목록 조회 경로에서 fields 쿼리 파라미터(쉼표로 구분한 필드 이름)를 해석하는 의존성입니다.
+    model의 필드 순서대로 정리한 튜플을 반환하며, fields가 없으면 None을 반환합니다.
+    """
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+
+    def __call__(
+        self,
+        fields: str | None = Query(default=None, description="응답에 포함할 필드 (쉼표로 구분)"),
+    ) -> tuple[str, ...] | None:
+        if fields is None:
+            return None
+
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        if not names or not names <= self.model.model_fields.keys():
+            raise HTTPException(status_code=400, detail="잘못된 필드입니다.")
+        return tuple(name for name in self.model.model_fields if name in names)
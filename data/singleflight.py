@@ -0,0 +1,92 @@
+"""
+같은 키로 동시에 들어온 비동기 호출을 하나로 합쳐, 실제 작업은 한 번만 수행하고 결과를 공유합니다.
+"""
+
+import asyncio
+from functools import wraps
+from typing import Any, Awaitable, Callable, Hashable
+
+from data import metrics
+from data.db.database import current_unit_of_work, unit_of_work
+
+
+class SingleFlight:
+    """
+    진행 중인 호출이 있는 키로 다시 호출하면, 새로 실행하지 않고 진행 중인 호출의 결과를 기다립니다.
+    기다리던 호출자 하나가 취소되어도 공유 중인 작업은 취소되지 않습니다.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def do(
+        self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._flights[key] = task
+            task.add_done_callback(lambda _task: self._forget(key, _task))
+            self.executions += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # 기다리는 호출자가 없어도 예외 경고가 남지 않도록 합니다.
+
+    def stats(self) -> dict:
+        calls = self.executions + self.shared
+        return {
+            "in_flight": len(self._flights),
+            "executions": self.executions,
+            "shared": self.shared,
+            "shared_rate": self.shared / calls if calls else 0.0,
+        }
+
+
+_read_flights: dict[str, SingleFlight] = {}
+
+
+async def _run_detached(func: Callable[..., Awaitable[Any]], args, kwargs) -> Any:
+    """
+    호출한 요청의 작업 단위와 분리된, 조회 전용 작업 단위에서 func를 실행합니다.
+    작업 단위가 끝나며 결과 객체가 만료되지 않도록, 종료 전에 세션에서 떼어냅니다.
+    """
+    async with unit_of_work(read_only=True) as uow:
+        result = await func(*args, **kwargs)
+        for session in (uow.read_session, uow.session):
+            if session is not None:
+                session.expunge_all()
+        return result
+
+
+def coalesced(func: Callable[..., Awaitable[Any]]):
+    """
+    조회 서비스 함수에 사용하여, 같은 인자로 동시에 들어온 호출이 하나의 조회를 공유하도록 합니다.
+    공유하는 조회는 요청과 분리된 조회 전용 작업 단위(읽기 복제본)에서 실행하므로,
+    쓰기를 했거나 read-your-writes 때문에 기본 데이터베이스를 봐야 하는 요청은 합치지 않고 직접 실행합니다.
+    """
+    flight = _read_flights.setdefault(func.__qualname__, SingleFlight())
+
+    @wraps(func)
+    async def _coalesced(*args, **kwargs):
+        uow = current_unit_of_work()
+        if uow is not None and (uow.dirty or not uow.use_replica):
+            return await func(*args, **kwargs)
+
+        key = (args, tuple(sorted(kwargs.items())))
+        return await flight.do(key, _run_detached, func, args, kwargs)
+
+    return _coalesced
+
+
+metrics.register(
+    "read_singleflight",
+    lambda: {name: flight.stats() for name, flight in _read_flights.items()},
+)
@@ -4,8 +4,7 @@
 """
 
 from enum import Enum
-from pydantic import BaseModel, constr, ValidationError, field_validator
-from pydantic import BaseModel, constr, ValidationError, field_validator
+from pydantic import BaseModel, ConfigDict, constr, ValidationError, field_validator
 
 
 class ArticleLogic(str, Enum):
@@ -30,12 +29,8 @@ class ArticleCreate(BaseModel):
     name: str
     content: str
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ArticleAppend(BaseModel):
@@ -48,12 +43,8 @@ class ArticleAppend(BaseModel):
     name: str
     content: str
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ArticleUpdate(BaseModel):
@@ -65,12 +56,8 @@ class ArticleUpdate(BaseModel):
     name: str
     content: str
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ArticleGet(BaseModel):
@@ -97,9 +84,14 @@ class ArticleGet(BaseModel):
     #             raise ValidationError(f"{logic}는 잘못된 경로입니다.")
     #     return logic
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArticleTree(ArticleGet):
+    """
+    장작을 트리 형태로 조회할 때 출력하는 정보입니다.
+    장작 정보와 함께, 자식 장작들을 반응(AGREE, DISAGREE, NEUTRAL)별로 묶어 포함하고 있습니다.
+    """
 
-        orm_mode = True
+    children: dict[str, list["ArticleTree"]] = {}
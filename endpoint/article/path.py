@@ -0,0 +1,36 @@
+"""
+장작의 path("/3/12/7")를 정렬과 하위 트리 조회에 사용하는 키("0000000003.0000000012.0000000007")로 바꿉니다.
+path는 id를 그대로 이어 붙인 문자열이라 문자열로 정렬하면 "10"이 "9"보다 앞에 오지만,
+키는 id를 같은 폭으로 채워 '.'로 이으므로 문자열 순서가 곧 트리 순서(부모 다음에 자식, 형제는 id 순서)가 됩니다.
+키는 PostgreSQL의 ltree 형식이기도 하므로, ltree로 변환하여 GiST 인덱스와 상하위 연산자(<@, @>)를 사용할 수 있습니다.
+"""
+
+# Integer 컬럼인 id의 최대 자릿수입니다.
+PATH_KEY_WIDTH = 10
+PATH_KEY_SEPARATOR = "."
+
+
+def path_key(path: str) -> str:
+    """
+    path를 키로 바꿉니다. 빈 path는 빈 키가 됩니다.
+    """
+    return PATH_KEY_SEPARATOR.join(
+        segment.zfill(PATH_KEY_WIDTH) for segment in path.split("/") if segment
+    )
+
+
+def child_key_prefix(parent_path: str) -> str:
+    """
+    parent_path 바로 아래에 생기는 장작의 키 앞부분입니다. 여기에 id를 PATH_KEY_WIDTH 폭으로 채워 붙입니다.
+    """
+    key = path_key(parent_path)
+    return key + PATH_KEY_SEPARATOR if key else ""
+
+
+def descendant_range(key: str) -> tuple[str, str]:
+    """
+    key 아래에 있는 모든 장작(자기 자신 제외)의 키가 속하는 [시작, 끝) 범위를 반환합니다.
+    '/'는 ASCII 순서에서 '.' 바로 다음 문자이므로, 두 값 사이가 곧 key + "."로 시작하는 범위입니다.
+    바이트 순서로 비교할 때만 성립하므로, 컬럼은 PostgreSQL에서 "C" 정렬 규칙을 씁니다. (data/db/models.py)
+    """
+    return key + PATH_KEY_SEPARATOR, key + "/"
@@ -0,0 +1,25 @@
+"""
+장작을 조회 전용으로 다룰 때 사용하는 가벼운 레코드를 정의합니다.
+ORM 객체와 달리 세션의 식별자 맵(identity map)이나 변경 추적 상태를 갖지 않는 튜플이므로,
+목록 조회처럼 JSON으로 바꾼 뒤 버리는 경우에 생성 비용과 메모리가 적고, 요청 간에 공유해도 안전합니다.
+"""
+
+from typing import NamedTuple
+
+
+class ArticleRecord(NamedTuple):
+    """
+    장작 한 개입니다. 필드 순서대로 Article의 컬럼을 조회하여 만듭니다.
+    """
+
+    id: int
+    name: str
+    content: str
+    creator_id: int
+    board_id: int
+    path: str
+    path_logical: str
+
+    @classmethod
+    def from_article(cls, article) -> "ArticleRecord":
+        return cls(*(getattr(article, field) for field in cls._fields))
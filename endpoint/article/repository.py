@@ -3,90 +3,466 @@
 불판 : Board, 장작 : Article
 """
 
+from typing import AsyncIterator, Iterable
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, insert
-from data.db.database import Transactional
-from data.db.models import Article
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased
+from sqlalchemy import (
+    select,
+    delete,
+    update,
+    insert,
+    func,
+    literal,
+    cast,
+    String,
+    Sequence,
+    and_,
+)
+from config import STREAM_BATCH_SIZE, ARTICLE_PATH_LTREE
+from data.db.database import Transactional, Propagation, streaming_session
+from data.db.projection import record_columns
+from data.cache.entity import entity_cache
+from data.db.models import Article, Board, Comment, LTREE
+from endpoint.article.path import (
+    PATH_KEY_WIDTH,
+    path_key,
+    child_key_prefix,
+    descendant_range,
+)
+from endpoint.article.record import ArticleRecord
 
 
-@Transactional()
+@Transactional(Propagation.READ_ONLY)
 async def get_article(article_id: int, session: AsyncSession = None) -> Article:
     """
     article_id를 바탕으로 장작을 데이터베이스에서 가져와서 반환합니다.
     """
+    article = entity_cache.get(Article, article_id)
+    if article is not None:
+        return article
 
     stmt = select(Article).where(Article.id == article_id)
 
     res = await session.execute(stmt)
 
-    return res.scalars().first()
+    article = res.scalars().first()
+    if article is not None:
+        entity_cache.set(
+            Article, article_id, article, tags=(f"board:{article.board_id}",)
+        )
+    return article
 
 
-@Transactional()
-async def get_articles_from_board(
-    board_id: int, session: AsyncSession = None
-) -> list[Article]:
+@Transactional(Propagation.READ_ONLY)
+async def get_article_records_from_board(
+    board_id: int,
+    limit: int | None = None,
+    before_path: str | None = None,
+    fields: Iterable[str] | None = None,
+    session: AsyncSession = None,
+) -> list[ArticleRecord]:
+    """
+    불판에 있는 장작들을 트리 역순(path_key 내림차순)으로 조회하여 ArticleRecord로 반환합니다.
+    limit이 주어지면 before_path 다음부터 limit개만 조회합니다.
+    필요한 컬럼만 조회하며, 세션의 식별자 맵에 등록하지 않습니다.
+    fields가 주어지면 그 필드와 커서에 필요한 path만 조회하고, 나머지 필드는 None입니다.
+    """
+    stmt = _article_records_stmt(board_id, before_path, fields)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await session.execute(stmt)
+
+    return list(map(ArticleRecord._make, result))
+
+
+async def stream_article_records_from_board(
+    board_id: int,
+    before_path: str | None = None,
+    fields: Iterable[str] | None = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[list[ArticleRecord]]:
     """
-    불판에 있는 모든 장작을 조회하여 반환합니다.
+    get_article_records_from_board와 같은 장작들을 서버 측 커서로 batch_size개씩 나누어 읽어 내보냅니다.
+    응답을 보내는 동안 읽으므로, 요청의 작업 단위 대신 별도의 세션을 사용합니다.
     """
+    stmt = _article_records_stmt(board_id, before_path, fields).execution_options(
+        yield_per=batch_size
+    )
+    async with streaming_session() as session:
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            yield list(map(ArticleRecord._make, rows))
 
+
+def _article_records_stmt(
+    board_id: int, before_path: str | None, fields: Iterable[str] | None
+):
     stmt = (
-        select(Article)
+        select(*record_columns(Article, ArticleRecord, fields, required=("path",)))
         .where(Article.board_id == board_id)
-        .order_by(Article.path.desc())
+        .order_by(Article.path_key.desc())
     )
+    if before_path is not None:
+        stmt = stmt.where(Article.path_key < path_key(before_path))
+    return stmt
+
+
+def _path_depth(path):
+    """
+    경로에 포함된 '/'의 개수, 즉 트리에서의 깊이를 계산하는 SQL 식을 반환합니다.
+    """
+    return func.length(path) - func.length(func.replace(path, "/", ""))
+
+
+def _descendant_of(path: str, dialect_name: str, include_self: bool):
+    """
+    path 아래에 있는 모든 장작을 찾는 조건을 반환합니다. include_self가 참이면 path의 장작도 포함합니다.
+    ARTICLE_PATH_LTREE를 켠 PostgreSQL은 ltree의 <@ 연산자(GiST 인덱스)를, 그 밖에는 path_key 인덱스의 범위 조회를 사용합니다.
+    """
+    key = path_key(path)
+    if dialect_name == "postgresql" and ARTICLE_PATH_LTREE:
+        condition = cast(Article.path_key, LTREE).op("<@")(
+            cast(literal(key, String), LTREE)
+        )
+        return condition if include_self else and_(condition, Article.path_key != key)
+    # 키는 숫자와 '.'로만 이루어지므로, key와 key + "." 사이에는 key 자신밖에 없습니다.
+    start, end = descendant_range(key)
+    return and_(
+        Article.path_key >= (key if include_self else start), Article.path_key < end
+    )
+
+
+def _owned_subtree(article_id: int, creator_id: int, dialect_name: str):
+    """
+    creator_id가 작성한 article_id 장작과 그 아래에 있는 장작들을 찾는 조건을 반환합니다.
+    장작의 path_key를 같은 문장 안의 서브쿼리로 읽으므로, 장작이 없거나 다른 사용자의 장작이면 아무 장작도 찾지 않습니다.
+    """
+    top = aliased(Article)
+    key = (
+        select(top.path_key)
+        .where(top.id == article_id, top.creator_id == creator_id)
+        .scalar_subquery()
+    )
+    if dialect_name == "postgresql" and ARTICLE_PATH_LTREE:
+        return cast(Article.path_key, LTREE).op("<@")(cast(key, LTREE))
+    # descendant_range와 같은 범위입니다.
+    return and_(Article.path_key >= key, Article.path_key < key + "/")
+
+
+@Transactional(Propagation.READ_ONLY)
+async def get_articles_under_path(
+    path: str,
+    max_depth: int | None = None,
+    include_self: bool = True,
+    session: AsyncSession = None,
+) -> list[ArticleRecord]:
+    """
+    path에 해당하는 장작과 그 아래에 있는 장작들을 트리 역순으로 조회하여 ArticleRecord로 반환합니다.
+    max_depth가 주어지면 path로부터 max_depth 단계 아래까지만 조회합니다.
+    불판 전체를 불러오지 않고 path_key 인덱스의 범위만 읽습니다.
+    """
+    stmt = select(*record_columns(Article, ArticleRecord)).where(
+        _descendant_of(path, session.bind.dialect.name, include_self)
+    )
+    if max_depth is not None:
+        depth = path.count("/") + max_depth
+        stmt = stmt.where(_path_depth(Article.path) <= depth)
+    stmt = stmt.order_by(Article.path_key.desc())
+
     result = await session.execute(stmt)
 
-    return result.scalars().all()
+    return list(map(ArticleRecord._make, result))
+
+
+@Transactional(Propagation.READ_ONLY)
+async def get_articles_by_ids(
+    article_ids: list[int], session: AsyncSession = None
+) -> list[ArticleRecord]:
+    """
+    article_ids에 해당하는 장작들을 경로 순서(위에서 아래로)로 조회하여 ArticleRecord로 반환합니다.
+    """
+    if not article_ids:
+        return []
+
+    stmt = (
+        select(*record_columns(Article, ArticleRecord))
+        .where(Article.id.in_(article_ids))
+        .order_by(Article.path_key)
+    )
+    result = await session.execute(stmt)
+
+    return list(map(ArticleRecord._make, result))
+
+
+def _next_article_id(dialect_name: str):
+    """
+    새 장작에 부여할 id를 계산하는 SQL 식을 반환합니다.
+    PostgreSQL에서는 시퀀스에서 미리 id를 받아오고, SQLite에서는 rowid 할당 규칙과 같은 max(id) + 1을 사용합니다.
+    """
+    if dialect_name == "postgresql":
+        return Sequence(f"{Article.__tablename__}_id_seq").next_value()
+    return func.coalesce(func.max(Article.id), 0) + 1
+
+
+def _padded_id(article_id, dialect_name: str):
+    """
+    id를 PATH_KEY_WIDTH 폭으로 0을 채운 문자열로 바꾸는 SQL 식을 반환합니다.
+    """
+    if dialect_name == "postgresql":
+        return func.lpad(cast(article_id, String), PATH_KEY_WIDTH, "0")
+    return func.printf(f"%0{PATH_KEY_WIDTH}d", article_id)
 
 
 @Transactional()
 async def create_article(article_req: dict, session: AsyncSession = None) -> Article:
     """
     장작을 생성한 후, 그 장작을 반환합니다.
+    article_req의 path에는 부모 장작의 경로를 넘기며, 새 장작의 id를 붙인 전체 경로와 키는 INSERT 문 안에서 계산합니다.
     """
+    dialect_name = session.bind.dialect.name
+    new_id = select(_next_article_id(dialect_name).label("id")).subquery("new_article")
 
-    _article = Article(**article_req)
+    columns = ["name", "content", "creator_id", "board_id", "path_logical"]
+    stmt = (
+        insert(Article)
+        .from_select(
+            ["id", "path", "path_key", *columns],
+            select(
+                new_id.c.id,
+                literal(article_req["path"]) + "/" + cast(new_id.c.id, String),
+                literal(child_key_prefix(article_req["path"]))
+                + _padded_id(new_id.c.id, dialect_name),
+                *[literal(article_req[column]) for column in columns],
+            ),
+        )
+        .returning(Article)
+    )
+    result = await session.execute(stmt)
 
-    session.add(_article)
+    return result.scalars().one()
 
-    await session.commit()
 
-    _article.path = _article.path + f"/{_article.id}"
-    await session.commit()  # TODO: 2번 커밋보다 더 깔끔한 해결책을 찾자!
+@Transactional()
+async def update_article(
+    article_id: int, article_req: dict, creator_id: int, session: AsyncSession = None
+) -> int | None:
+    """
+    creator_id가 작성한 장작이면 수정하고 버전을 1 증가시킨 뒤, 장작이 속한 불판의 id를 반환합니다.
+    그런 장작이 없으면 None을 반환합니다.
+    """
+    stmt = (
+        update(Article)
+        .where(Article.id == article_id, Article.creator_id == creator_id)
+        .values(**article_req, version=Article.version + 1)
+        .returning(Article.board_id)
+    )
+    res = await session.execute(stmt)
+    entity_cache.invalidate(Article, article_id)
 
-    await session.refresh(_article)
+    return res.scalar_one_or_none()
 
-    return _article
+
+@Transactional()
+async def delete_article_subtree(
+    article_id: int, creator_id: int, session: AsyncSession = None
+) -> tuple[list[Row], int]:
+    """
+    creator_id가 작성한 article_id 장작과 그 아래에 있는 장작들을 그 댓글들과 함께 삭제하고,
+    삭제한 장작들(id, board_id, path)과 삭제한 댓글 수를 반환합니다. 그런 장작이 없으면 빈 목록을 반환합니다.
+    댓글과 장작을 각각 한 번의 DELETE 문으로 삭제합니다.
+    """
+    subtree = _owned_subtree(article_id, creator_id, session.bind.dialect.name)
+
+    # 불판의 댓글 수를 맞추기 위해 ON DELETE CASCADE에 맡기지 않고 직접 삭제하여 그 수를 셉니다.
+    comments = await session.execute(
+        delete(Comment)
+        .where(Comment.article_id.in_(select(Article.id).where(subtree)))
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(
+        delete(Article)
+        .where(subtree)
+        .returning(Article.id, Article.board_id, Article.path)
+        .execution_options(synchronize_session=False)
+    )
+
+    articles = result.all()
+    entity_cache.invalidate_many(Article, (article.id for article in articles))
+    entity_cache.invalidate_tags(f"article:{article.id}" for article in articles)
+    return articles, comments.rowcount
+
+
+@Transactional(Propagation.READ_ONLY)
+async def get_articles_by_creator(
+    creator_id: int, session: AsyncSession = None
+) -> list[Row]:
+    """
+    creator_id가 다른 유저의 불판에 작성한 장작들(id, board_id, path)을 트리 순서(path_key 오름차순)로 조회하여 반환합니다.
+    """
+    stmt = (
+        select(Article.id, Article.board_id, Article.path)
+        .join(Board, Board.id == Article.board_id)
+        .where(Article.creator_id == creator_id, Board.creator_id != creator_id)
+        .order_by(Article.path_key)
+    )
+    result = await session.execute(stmt)
+
+    return result.all()
+
+
+def _replace_prefix(column, old_prefix: str, new_prefix: str):
+    """
+    column 값의 앞부분 old_prefix를 new_prefix로 바꾸는 SQL 식을 반환합니다.
+    """
+    return literal(new_prefix) + func.substr(column, len(old_prefix) + 1)
 
 
 @Transactional()
-async def update_article(
-    article_id: int, article_req: dict, session: AsyncSession = None
-) -> None:
+async def lock_articles(
+    article_ids: Iterable[int], session: AsyncSession = None
+) -> dict[int, ArticleRecord]:
     """
-    장작을 수정합니다.
+    article_ids에 해당하는 장작들을 기본 데이터베이스에서 SELECT ... FOR UPDATE로 잠그고 읽어 id별로 반환합니다.
+    엔티티 캐시와 세션의 식별자 맵을 거치지 않으며, 교착 상태를 피하도록 id 순서로 잠급니다.
     """
+    stmt = (
+        select(*record_columns(Article, ArticleRecord))
+        .where(Article.id.in_(set(article_ids)))
+        .order_by(Article.id)
+        .with_for_update()
+    )
+    result = await session.execute(stmt)
 
-    stmt = update(Article).where(Article.id == article_id).values(**article_req)
-    await session.execute(stmt)
+    return {article.id: article for article in map(ArticleRecord._make, result)}
 
 
 @Transactional()
-async def delete_article(article_id: int, session: AsyncSession = None) -> None:
+async def lock_subtree(path: str, session: AsyncSession = None) -> None:
     """
-    장작을 삭제합니다.
+    path 아래에 있는 장작들을 SELECT ... FOR UPDATE로 잠급니다.
+    그 장작들 아래에 장작을 추가하던 트랜잭션이 있으면 커밋될 때까지 기다리므로,
+    이어서 실행하는 UPDATE 문이 그동안 추가된 장작까지 봅니다.
     """
-    stmt = delete(Article).where(Article.id == article_id)
+    stmt = (
+        select(Article.id)
+        .where(_descendant_of(path, session.bind.dialect.name, include_self=False))
+        .with_for_update()
+    )
     await session.execute(stmt)
 
 
+def _unchanged(article_id: int, path: str, creator_id: int | None = None):
+    """
+    article_id 장작이 아직 path에 있고, creator_id가 주어지면 creator_id가 작성한 장작인지 확인하는 조건을 반환합니다.
+    """
+    top = aliased(Article)
+    conditions = [top.id == article_id, top.path_key == path_key(path)]
+    if creator_id is not None:
+        conditions.append(top.creator_id == creator_id)
+    return select(top.id).where(*conditions).exists()
+
+
 @Transactional()
-async def update_article_path(
-    article_id: int, path: str, session: AsyncSession = None
-) -> None:
+async def move_article_subtree(
+    article_id: int,
+    path: str,
+    path_logical: str,
+    parent_id: int,
+    parent_path: str,
+    parent_path_logical: str,
+    creator_id: int,
+    session: AsyncSession = None,
+) -> list[ArticleRecord]:
     """
-    장작의 경로를 수정합니다.
+    path의 장작과 그 아래에 있는 장작들을 parent_path의 장작 아래로 옮기고, 옮긴 장작들을 반환합니다.
+    옮기는 장작들의 path, path_key, path_logical의 앞부분을 한 번의 UPDATE 문으로 바꾸며, 버전도 함께 올립니다.
+    article_id 장작이 creator_id의 장작이 아니거나, 두 장작 중 하나라도 읽은 뒤에 옮겨졌으면 아무 장작도 옮기지 않고 빈 목록을 반환합니다.
     """
-    stmt = update(Article).where(Article.id == article_id).values(path=path)
-    await session.execute(stmt)
+    old_parent_path = path.rsplit("/", 1)[0]
+    old_parent_path_logical = path_logical.rsplit("/", 1)[0]
+
+    stmt = (
+        update(Article)
+        .where(
+            _descendant_of(path, session.bind.dialect.name, include_self=True),
+            _unchanged(article_id, path, creator_id),
+            _unchanged(parent_id, parent_path),
+        )
+        .values(
+            path=_replace_prefix(Article.path, old_parent_path, parent_path),
+            path_key=_replace_prefix(
+                Article.path_key,
+                child_key_prefix(old_parent_path),
+                child_key_prefix(parent_path),
+            ),
+            path_logical=_replace_prefix(
+                Article.path_logical, old_parent_path_logical, parent_path_logical
+            ),
+            version=Article.version + 1,
+        )
+        .returning(*record_columns(Article, ArticleRecord))
+    )
+    result = await session.execute(stmt)
+
+    articles = list(map(ArticleRecord._make, result))
+    entity_cache.invalidate_many(Article, (article.id for article in articles))
+    return articles
+
+
+@Transactional(Propagation.READ_ONLY)
+async def get_article_version(
+    article_id: int, session: AsyncSession = None
+) -> int | None:
+    """
+    장작의 버전만 가져와 반환합니다. 장작이 없으면 None을 반환합니다.
+    """
+    stmt = select(Article.version).where(Article.id == article_id)
+
+    res = await session.execute(stmt)
+
+    return res.scalar_one_or_none()
+
+
+@Transactional()
+async def bump_article_version(
+    article_id: int, session: AsyncSession = None
+) -> int | None:
+    """
+    장작의 버전을 1 증가시키고, 장작이 속한 불판의 id를 반환합니다. 장작이 없으면 None을 반환합니다.
+    """
+    stmt = (
+        update(Article)
+        .where(Article.id == article_id)
+        .values(version=Article.version + 1)
+        .returning(Article.board_id)
+    )
+    res = await session.execute(stmt)
+    entity_cache.invalidate(Article, article_id)
+
+    return res.scalar_one_or_none()
+
+
+@Transactional()
+async def bump_article_versions(
+    article_ids: Iterable[int], session: AsyncSession = None
+) -> dict[int, int]:
+    """
+    장작들의 버전을 한 번의 UPDATE 문으로 1씩 증가시키고, 장작의 id별로 장작이 속한 불판의 id를 반환합니다.
+    """
+    article_ids = set(article_ids)
+    if not article_ids:
+        return {}
+
+    stmt = (
+        update(Article)
+        .where(Article.id.in_(article_ids))
+        .values(version=Article.version + 1)
+        .returning(Article.id, Article.board_id)
+        .execution_options(synchronize_session=False)
+    )
+    res = await session.execute(stmt)
+    entity_cache.invalidate_many(Article, article_ids)
+
+    return dict(res.all())
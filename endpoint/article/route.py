@@ -2,7 +2,8 @@
 장작과 관련된 모든 라우팅 경로 URL을 정의합니다.
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from endpoint.article import service
 from endpoint.article.entity import (
@@ -10,8 +11,21 @@ from endpoint.article.entity import (
     ArticleAppend,
     ArticleUpdate,
     ArticleGet,
+    ArticleTree,
 )
+from endpoint.article.tree import iter_article_tree_json
+from endpoint.board.service import get_board_version_by_id
 from endpoint.user.service import get_current_user
+from data.db.pagination import NEXT_CURSOR_HEADER
+from data.etag import make_etag, conditional_response
+from data.serialization import (
+    NDJSON_MEDIA_TYPE,
+    FieldSelection,
+    dump_json,
+    iter_ndjson,
+    wants_ndjson,
+)
+from config import ARTICLE_TREE_STREAM_THRESHOLD, PAGE_SIZE_MAX
 
 
 router = APIRouter(prefix="/article")
@@ -62,19 +76,126 @@ async def append_article(
 
 
 @router.get("/{article_id}", response_model=ArticleGet, tags=["Article"])
-async def get_article(article_id: int) -> ArticleGet:
+async def get_article(
+    article_id: int, request: Request, response: Response
+) -> ArticleGet:
     """
     장작을 조회하는 라우팅 경로를 정의합니다.
+    If-None-Match가 장작의 ETag와 같으면 장작을 불러오지 않고 304로 응답합니다.
     """
+    etag = make_etag(
+        "article", article_id, await service.get_article_version_by_id(article_id)
+    )
+    if not_modified := conditional_response(request, response, etag):
+        return not_modified
     return await service.get_article_by_id(article_id)
 
 
 @router.get("/list/{board_id}", response_model=list[ArticleGet], tags=["Article"])
-async def get_article_list(board_id: int) -> list[ArticleGet]:
+async def get_article_list(
+    board_id: int,
+    request: Request,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=PAGE_SIZE_MAX),
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = Depends(FieldSelection(ArticleGet)),
+) -> list[ArticleGet]:
     """
     불판에 있는 모든 장작을 조회하는 경로를 정의합니다.
+    limit을 주면 나누어 조회하며, 다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 전달합니다.
+    fields(예: name,path,path_logical)를 주면 그 필드들만 응답합니다.
+    Accept 헤더가 application/x-ndjson이면 limit 없이 커서 다음의 모든 장작을 한 줄에 하나씩 스트리밍합니다.
+    If-None-Match가 불판의 ETag와 같으면 장작을 불러오지 않고 304로 응답합니다.
+    """
+    ndjson = wants_ndjson(request)
+    response.headers["Vary"] = "Accept"
+    version = await get_board_version_by_id(board_id)
+    etag = make_etag("article-ndjson" if ndjson else "article-list", board_id, version)
+    if not_modified := conditional_response(request, response, etag):
+        return not_modified
+
+    if ndjson:
+        batches = await service.stream_article_list_by_board_id(
+            board_id, cursor, fields
+        )
+        return StreamingResponse(
+            iter_ndjson(ArticleGet, batches, fields),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=dict(response.headers),
+        )
+
+    articles, next_cursor = await service.get_article_list_by_board_id(
+        board_id, version, limit, cursor, fields
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(
+        dump_json(list[ArticleGet], articles, fields),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
+
+@router.get("/tree/{board_id}", response_model=list[ArticleTree], tags=["Article"])
+async def get_article_tree(board_id: int, request: Request, response: Response):
+    """
+    불판에 있는 모든 장작을 트리 형태로 조회하는 경로를 정의합니다.
+    장작이 많은 불판은 응답을 나누어 스트리밍합니다.
+    If-None-Match가 불판의 ETag와 같으면 장작을 불러오지 않고 304로 응답합니다.
+    """
+    version = await get_board_version_by_id(board_id)
+    etag = make_etag("article-tree", board_id, version)
+    if not_modified := conditional_response(request, response, etag):
+        return not_modified
+
+    roots, size = await service.get_article_tree_by_board_id(board_id, version)
+    if size > ARTICLE_TREE_STREAM_THRESHOLD:
+        return StreamingResponse(
+            iter_article_tree_json(roots),
+            media_type="application/json",
+            headers=dict(response.headers),
+        )
+    return roots
+
+
+@router.get("/{article_id}/subtree", response_model=list[ArticleGet], tags=["Article"])
+async def get_article_subtree(
+    article_id: int, depth: int | None = Query(default=None, ge=0)
+):
+    """
+    장작과 그 아래에 달린 장작들을 조회하는 경로를 정의합니다.
+    depth로 조회할 깊이를 제한할 수 있습니다.
+    """
+    return Response(
+        dump_json(
+            list[ArticleGet], await service.get_article_subtree(article_id, depth)
+        ),
+        media_type="application/json",
+    )
+
+
+@router.get("/{article_id}/children", response_model=list[ArticleGet], tags=["Article"])
+async def get_article_children(article_id: int):
     """
-    return await service.get_article_list_by_board_id(board_id)
+    장작에 바로 달린 장작들을 조회하는 경로를 정의합니다.
+    """
+    return Response(
+        dump_json(list[ArticleGet], await service.get_article_children(article_id)),
+        media_type="application/json",
+    )
+
+
+@router.get(
+    "/{article_id}/ancestors", response_model=list[ArticleGet], tags=["Article"]
+)
+async def get_article_ancestors(article_id: int):
+    """
+    최상위 장작부터 부모 장작까지의 상위 경로를 조회하는 경로를 정의합니다.
+    """
+    return Response(
+        dump_json(list[ArticleGet], await service.get_article_ancestors(article_id)),
+        media_type="application/json",
+    )
 
 
 # @router.get("/{article_id}/comment", response_model=list[CommentGet])
@@ -97,11 +218,25 @@ async def update_article(
     )
 
 
+@router.put(
+    "/{article_id}/parent/{parent_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["Article"],
+)
+async def move_article(
+    article_id: int, parent_id: int, user=Depends(get_current_user)
+) -> None:
+    """
+    장작과 그 아래에 달린 장작들을 다른 장작 아래로 옮기는 라우팅 경로를 정의합니다.
+    """
+    await service.move_article(article_id, parent_id, user.id)
+
+
 @router.delete(
     "/{article_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Article"]
 )
 async def delete_article(article_id: int, user=Depends(get_current_user)) -> None:
     """
-    장작을 삭제하는 라우팅 경로를 정의합니다.
+    장작과 그 아래에 달린 장작들을 삭제하는 라우팅 경로를 정의합니다.
     """
     await service.delete_article(article_id, user.id)
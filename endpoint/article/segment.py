@@ -0,0 +1,444 @@
+"""
+같은 호스트의 여러 워커 프로세스가 함께 사용하는, 불판 장작들의 공유 메모리 세그먼트를 정의합니다.
+불판마다 하나의 파일을 두고 mmap으로 읽으므로, 워커 수와 관계없이 불판의 장작들은 한 벌만 메모리에 올라갑니다.
+
+세그먼트의 구조는 다음과 같습니다. (정수는 모두 little endian)
+    헤더        magic, 형식 버전, 불판 id, 세대(generation), 장작 수 n, 문자열 영역 크기
+    ids         int64[n]    path_key 오름차순(트리 순서)으로 정렬한 장작 id
+    creator_ids int64[n]    작성자 id (없으면 -1)
+    parents     int32[n]    부모 장작의 위치 (없으면 -1)
+    id_order    int32[n]    id 오름차순으로 정렬한 장작의 위치
+    offsets     uint32[4n+1] 문자열 영역 안에서 장작마다 name, content, path, path_logical이 시작하는 위치
+    strings     utf-8 문자열 영역
+
+세대는 세그먼트를 만들 때의 불판 버전이며, 워커는 이 값이 불판의 버전보다 작으면 세그먼트가 오래된 것으로 판단합니다.
+세그먼트는 임시 파일에 쓴 뒤 rename으로 교체하므로, 이미 세그먼트를 읽고 있는 워커는 교체 중에도 온전한 이전 세그먼트를 봅니다.
+워커가 세그먼트를 쓸 때마다 파일의 접근 시각(atime)을 갱신하고, 파일 개수나 크기의 합이 한도를 넘으면
+세그먼트를 만드는 워커가 접근 시각이 가장 오래된 파일부터 지웁니다.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Iterable, Iterator, Sequence
+
+from config import (
+    ARTICLE_SHARED_CACHE_DIR,
+    ARTICLE_SHARED_CACHE_MAX_BOARDS,
+    ARTICLE_SHARED_CACHE_MAX_FILES,
+    ARTICLE_SHARED_CACHE_MAX_BYTES,
+)
+from data import metrics
+from data.db.database import current_unit_of_work
+from endpoint.article.path import path_key, descendant_range
+from endpoint.article.record import ArticleRecord
+from endpoint.article.tree_cache import BoardArticles
+
+_MAGIC = b"GLAB"
+_LAYOUT_VERSION = 2
+_HEADER = struct.Struct("<4sHHqqII")
+_NAME, _CONTENT, _PATH, _PATH_LOGICAL = range(4)
+_STRINGS_PER_ARTICLE = 4
+
+
+def _parent_id(path: str) -> int | None:
+    segments = path.split("/")
+    if len(segments) < 3:
+        return None
+    return int(segments[-2])
+
+
+def encode_board(
+    board_id: int, generation: int, articles: Iterable[ArticleRecord]
+) -> bytes:
+    """
+    장작들을 세그먼트 형식의 바이트열로 만듭니다.
+    """
+    records = sorted(articles, key=lambda article: path_key(article.path))
+    position = {article.id: i for i, article in enumerate(records)}
+
+    ids = array("q", (article.id for article in records))
+    creator_ids = array(
+        "q",
+        (
+            article.creator_id if article.creator_id is not None else -1
+            for article in records
+        ),
+    )
+    parents = array(
+        "i", (position.get(_parent_id(article.path), -1) for article in records)
+    )
+    id_order = array("i", sorted(range(len(records)), key=ids.__getitem__))
+
+    strings = bytearray()
+    offsets = array("I")
+    for article in records:
+        for value in (
+            article.name,
+            article.content,
+            article.path,
+            article.path_logical,
+        ):
+            offsets.append(len(strings))
+            strings += (value or "").encode()
+    offsets.append(len(strings))
+
+    header = _HEADER.pack(
+        _MAGIC, _LAYOUT_VERSION, 0, board_id, generation, len(records), len(strings)
+    )
+    return b"".join(
+        [
+            header,
+            ids.tobytes(),
+            creator_ids.tobytes(),
+            parents.tobytes(),
+            id_order.tobytes(),
+            offsets.tobytes(),
+            bytes(strings),
+        ]
+    )
+
+
+class _Paths(Sequence):
+    """
+    세그먼트의 path들을 필요할 때만 읽어오는 시퀀스입니다. bisect(key=path_key)로 범위를 찾는 데 사용합니다.
+    """
+
+    def __init__(self, segment: "SegmentBoardArticles"):
+        self._segment = segment
+
+    def __len__(self) -> int:
+        return len(self._segment)
+
+    def __getitem__(self, i: int) -> str:
+        return self._segment._string(i, _PATH)
+
+
+class SegmentBoardArticles:
+    """
+    mmap으로 연 세그먼트를 BoardArticles와 같은 방식으로 조회할 수 있게 합니다.
+    장작은 조회할 때마다 세그먼트에서 읽어 ArticleRecord로 만듭니다.
+    """
+
+    def __init__(self, buffer):
+        (
+            magic,
+            layout_version,
+            _,
+            self.board_id,
+            self.version,
+            count,
+            strings_size,
+        ) = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or layout_version != _LAYOUT_VERSION:
+            raise ValueError("Invalid article segment")
+
+        view = memoryview(buffer)
+        offset = _HEADER.size
+
+        def _take(typecode: str, size: int, length: int) -> memoryview:
+            nonlocal offset
+            taken = view[offset : offset + size * length].cast(typecode)
+            offset += size * length
+            return taken
+
+        self._count = count
+        self._ids = _take("q", 8, count)
+        self._creator_ids = _take("q", 8, count)
+        self._parents = _take("i", 4, count)
+        self._id_order = _take("i", 4, count)
+        self._offsets = _take("I", 4, _STRINGS_PER_ARTICLE * count + 1)
+        self._strings = view[offset : offset + strings_size]
+        self.paths = _Paths(self)
+        self.nbytes = len(view)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[ArticleRecord]:
+        return (self._record(i) for i in range(self._count))
+
+    def _string(self, i: int, field: int) -> str:
+        start = _STRINGS_PER_ARTICLE * i + field
+        return str(
+            self._strings[self._offsets[start] : self._offsets[start + 1]], "utf-8"
+        )
+
+    def _record(self, i: int) -> ArticleRecord:
+        creator_id = self._creator_ids[i]
+        return ArticleRecord(
+            id=self._ids[i],
+            name=self._string(i, _NAME),
+            content=self._string(i, _CONTENT),
+            creator_id=creator_id if creator_id != -1 else None,
+            board_id=self.board_id,
+            path=self._string(i, _PATH),
+            path_logical=self._string(i, _PATH_LOGICAL),
+        )
+
+    def _position(self, article_id: int) -> int | None:
+        i = bisect_left(self._id_order, article_id, key=self._ids.__getitem__)
+        if i < self._count and self._ids[self._id_order[i]] == article_id:
+            return self._id_order[i]
+        return None
+
+    def get(self, article_id: int) -> ArticleRecord | None:
+        i = self._position(article_id)
+        return self._record(i) if i is not None else None
+
+    def ancestors(self, article_id: int) -> list[ArticleRecord]:
+        """
+        최상위 장작부터 부모 장작까지의 상위 장작들을 부모 위치를 따라가며 반환합니다.
+        """
+        i = self._position(article_id)
+        if i is None:
+            return []
+        ancestors = []
+        i = self._parents[i]
+        while i != -1:
+            ancestors.append(self._record(i))
+            i = self._parents[i]
+        return ancestors[::-1]
+
+    def page(
+        self, limit: int | None = None, before_path: str | None = None
+    ) -> list[ArticleRecord]:
+        """
+        트리 역순으로 before_path 다음부터 limit개의 장작을 반환합니다.
+        """
+        end = (
+            bisect_left(self.paths, path_key(before_path), key=path_key)
+            if before_path is not None
+            else None
+        )
+        positions = range(self._count)[:end][::-1]
+        if limit is not None:
+            positions = positions[:limit]
+        return [self._record(i) for i in positions]
+
+    def subtree(
+        self, path: str, max_depth: int | None = None, include_self: bool = True
+    ) -> list[ArticleRecord]:
+        """
+        path 아래에 있는 장작들을 트리 역순으로 반환합니다.
+        max_depth가 주어지면 path로부터 max_depth 단계 아래까지만 반환합니다.
+        """
+        key = path_key(path)
+        low, high = descendant_range(key)
+        start = bisect_left(self.paths, low, key=path_key)
+        end = bisect_left(self.paths, high, start, key=path_key)
+        records = [self._record(i) for i in range(start, end)]
+        if max_depth is not None:
+            depth = path.count("/") + max_depth
+            records = [r for r in records if r.path.count("/") <= depth]
+        if include_self:
+            i = bisect_left(self.paths, key, key=path_key)
+            if i < self._count and self.paths[i] == path:
+                records.insert(0, self._record(i))
+        return records[::-1]
+
+
+class SharedArticleTreeCache:
+    """
+    directory 아래에 불판별 세그먼트 파일을 두고, ArticleTreeCache와 같은 방식으로 사용할 수 있게 합니다.
+    각 워커는 최근에 연 세그먼트를 max_boards개까지 mmap으로 열어 둡니다.
+    디렉터리의 세그먼트 파일은 max_files개, 크기의 합 max_bytes까지 두고, 넘으면 가장 오래 쓰이지 않은 파일부터 지웁니다.
+    """
+
+    # 접근 시각은 이 간격(나노초)보다 오래되었을 때만 갱신하여, 조회마다 시스템 호출을 하지 않도록 합니다.
+    _TOUCH_INTERVAL_NS = 1_000_000_000
+
+    def __init__(
+        self,
+        directory: str,
+        max_boards: int,
+        max_files: int = ARTICLE_SHARED_CACHE_MAX_FILES,
+        max_bytes: int = ARTICLE_SHARED_CACHE_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.max_boards = max_boards
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._segments: OrderedDict[
+            int, tuple[tuple[int, int], SegmentBoardArticles]
+        ] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.publishes = 0
+        self.evictions = 0
+
+    def _path(self, board_id: int) -> str:
+        return os.path.join(self.directory, f"board-{board_id}.seg")
+
+    def _open(self, board_id: int) -> SegmentBoardArticles | None:
+        """
+        불판의 세그먼트를 엽니다. 다른 워커가 세그먼트를 교체했으면 새 세그먼트를 다시 엽니다.
+        """
+        try:
+            stat = os.stat(self._path(board_id))
+        except FileNotFoundError:
+            self._segments.pop(board_id, None)
+            return None
+
+        self._touch(board_id, stat)
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        opened = self._segments.get(board_id)
+        if opened is not None and opened[0] == identity:
+            self._segments.move_to_end(board_id)
+            return opened[1]
+
+        try:
+            with open(self._path(board_id), "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            segment = SegmentBoardArticles(buffer)
+        except (FileNotFoundError, ValueError, struct.error):
+            self._segments.pop(board_id, None)
+            return None
+
+        # 내보낸 세그먼트는 요청이 끝날 때까지 쓰일 수 있으므로 직접 닫지 않고, 참조가 사라지면 닫히도록 둡니다.
+        self._segments[board_id] = (identity, segment)
+        self._segments.move_to_end(board_id)
+        while len(self._segments) > self.max_boards:
+            self._segments.popitem(last=False)
+        return segment
+
+    def _touch(self, board_id: int, stat: os.stat_result) -> None:
+        """
+        세그먼트 파일의 접근 시각을 지금으로 바꿉니다. 수정 시각은 세그먼트를 구분하는 데 쓰므로 그대로 둡니다.
+        """
+        now = time.time_ns()
+        if now - stat.st_atime_ns < self._TOUCH_INTERVAL_NS:
+            return
+        try:
+            os.utime(self._path(board_id), ns=(now, stat.st_mtime_ns))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, keep: int) -> None:
+        """
+        세그먼트 파일의 개수나 크기의 합이 한도를 넘으면, 접근 시각이 가장 오래된 파일부터 지웁니다.
+        방금 만든 keep 불판의 파일은 지우지 않습니다.
+        """
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".seg"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_atime_ns, stat.st_size, entry.path))
+
+        count, total = len(files), sum(size for _, size, _ in files)
+        if count <= self.max_files and total <= self.max_bytes:
+            return
+
+        kept = self._path(keep)
+        for _, size, path in sorted(files):
+            if count <= self.max_files and total <= self.max_bytes:
+                break
+            if path == kept:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            count -= 1
+            total -= size
+            self.evictions += 1
+
+    def _publish(
+        self, board_id: int, version: int, articles: Iterable[ArticleRecord]
+    ) -> None:
+        data = encode_board(board_id, version, articles)
+        fd, tmp = tempfile.mkstemp(
+            dir=self.directory, prefix=f"board-{board_id}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(board_id))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.publishes += 1
+        self._evict(keep=board_id)
+
+    def get(self, board_id: int, version: int) -> SegmentBoardArticles | None:
+        segment = self._open(board_id)
+        if segment is None or segment.version < version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return segment
+
+    def load(
+        self, board_id: int, version: int, articles: Iterable[ArticleRecord]
+    ) -> SegmentBoardArticles | BoardArticles:
+        """
+        데이터베이스에서 불러온 장작들로 세그먼트를 만들어 다른 워커와 공유하고 반환합니다.
+        그 사이 다른 워커가 더 새로운 세그먼트를 만들었으면 그 세그먼트를 반환합니다.
+        """
+        records = list(articles)
+        uow = current_unit_of_work()
+        if uow is not None and uow.dirty:
+            return BoardArticles(version, records)
+
+        segment = self._open(board_id)
+        if segment is None or segment.version < version:
+            self._publish(board_id, version, records)
+            segment = self._open(board_id)
+        return segment or BoardArticles(version, records)
+
+    def discard(self, board_id: int) -> None:
+        self._segments.pop(board_id, None)
+        try:
+            os.unlink(self._path(board_id))
+        except FileNotFoundError:
+            pass
+
+    def apply(self, board_id: int, version: int, change) -> None:
+        """
+        불판의 버전을 version으로 올린 쓰기가 커밋된 뒤, 그 변경(change)을 반영한 새 세그먼트를 만듭니다.
+        세그먼트가 바로 이전 버전이 아니면 아무것도 하지 않으며, 다음 조회에서 새로 불러옵니다.
+        """
+        segment = self._open(board_id)
+        if segment is None or segment.version != version - 1:
+            return
+
+        board = BoardArticles(segment.version, segment)
+        change(board)
+        self._publish(board_id, version, board)
+
+    def clear(self) -> None:
+        for board_id in list(self._segments):
+            self.discard(board_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "boards": len(self._segments),
+            "bytes": sum(segment.nbytes for _, segment in self._segments.values()),
+            "max_boards": self.max_boards,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "publishes": self.publishes,
+            "evictions": self.evictions,
+        }
+
+
+shared_tree_cache: SharedArticleTreeCache | None = None
+if ARTICLE_SHARED_CACHE_DIR:
+    shared_tree_cache = SharedArticleTreeCache(
+        ARTICLE_SHARED_CACHE_DIR, max_boards=ARTICLE_SHARED_CACHE_MAX_BOARDS
+    )
+    metrics.register("article_shared_cache", shared_tree_cache.stats)
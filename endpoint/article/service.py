@@ -2,12 +2,71 @@
 장작과 관련된 작업을 수행할 때, 구체적인 동작을 정의합니다.
 """
 
+from collections import Counter
+from typing import AsyncIterator
+
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 
 import endpoint.article.repository as repo
-from endpoint.board.repository import get_board
+from endpoint.article.tree import build_article_tree
+from endpoint.article.record import ArticleRecord
+from endpoint.article.tree_cache import BoardArticles, article_tree_cache
+from endpoint.article.segment import SegmentBoardArticles, shared_tree_cache
+from endpoint.board.repository import (
+    get_board,
+    get_board_version,
+    record_board_activity,
+)
+from data.db.database import on_commit
 from data.db.models import Article
+from data.cache.response import response_cache
+from data.db.ownership import raise_not_owned
+from data.db.pagination import decode_cursor, paginate
+from data.singleflight import coalesced
+from config import STREAM_BATCH_SIZE
+
+# 공유 메모리 세그먼트를 설정했으면 워커 간에 공유하는 세그먼트를, 아니면 워커의 메모리를 사용합니다.
+board_cache = shared_tree_cache if shared_tree_cache is not None else article_tree_cache
+
+
+async def _get_board_articles(
+    board_id: int, load: bool = True
+) -> BoardArticles | SegmentBoardArticles | None:
+    """
+    메모리에 보관 중인 불판의 장작들을 반환합니다.
+    보관 중이지 않거나 불판의 버전보다 오래되었으면 데이터베이스에서 다시 불러옵니다.
+    load가 False이면 다시 불러오지 않고 None을 반환합니다.
+    """
+    return await _get_board_articles_at(
+        board_id, await get_board_version(board_id), load
+    )
+
+
+async def _get_board_articles_at(
+    board_id: int, version: int | None, load: bool = True
+) -> BoardArticles | SegmentBoardArticles | None:
+    """
+    _get_board_articles와 같지만, 이미 조회한 불판의 버전 version을 사용합니다.
+    """
+    if version is None:
+        board_cache.discard(board_id)
+        raise HTTPException(status_code=400, detail="존재하지 않는 게시판입니다.")
+
+    board = board_cache.get(board_id, version)
+    if board is None and load:
+        articles = await repo.get_article_records_from_board(board_id)
+        board = board_cache.load(board_id, version, articles)
+    return board
+
+
+def _apply_on_commit(board_id: int, version: int | None, change) -> None:
+    """
+    불판의 버전을 version으로 올린 쓰기가 커밋되면, 메모리에 보관 중인 불판에도 change를 반영합니다.
+    """
+    if version is None:
+        return
+    on_commit(lambda: board_cache.apply(board_id, version, change))
 
 
 async def create_article(
@@ -16,8 +75,10 @@ async def create_article(
     """
     장작을 생성할 때의 구체적인 동작을 정의합니다.
     """
-    prev: list = await repo.get_articles_from_board(board_id)
-    if len(prev) != 0:
+    board = await get_board(board_id)
+    if not board:
+        raise HTTPException(status_code=400, detail="존재하지 않는 게시판입니다.")
+    if board.root_article_id is not None:
         raise HTTPException(status_code=400, detail="이미 게시글이 존재하는 게시판입니다, 게시글을 추가해주세요.")
 
     try:
@@ -31,6 +92,17 @@ async def create_article(
                 "path_logical": "ROOT",
             }
         )
+        # 동시에 최상위 장작을 만든 요청이 있으면 먼저 기록된 쪽만 남깁니다.
+        version = await record_board_activity(
+            board_id, articles=1, root_article_id=res.id
+        )
+        if version is None:
+            raise HTTPException(
+                status_code=400, detail="이미 게시글이 존재하는 게시판입니다, 게시글을 추가해주세요."
+            )
+        record = ArticleRecord.from_article(res)
+        _apply_on_commit(board_id, version, lambda board: board.put(record))
+        response_cache.invalidate("boards", f"board:{board_id}")
         return res
     except IntegrityError as e:
         code: int = e.orig.pgcode
@@ -51,13 +123,17 @@ async def append_article(
 ) -> None:
     """
     장작을 불판에 추가할 때의 구체적인 동작을 정의합니다.
+    부모 장작을 캐시 대신 기본 데이터베이스에서 잠그고 읽으므로, 부모 장작을 옮기는 요청과 동시에 실행되어도
+    옮기기 전이나 옮긴 뒤의 경로 중 하나로 일관되게 추가됩니다.
     """
-    prev_article: Article = await repo.get_article(prev_article_id)
+    prev_article = (await repo.lock_articles((prev_article_id,))).get(prev_article_id)
     if not prev_article:
         raise HTTPException(status_code=400, detail="존재하지 않는 게시글입니다.")
+    if prev_article.board_id != board_id:
+        raise HTTPException(status_code=400, detail="다른 게시판의 게시글에는 추가할 수 없습니다.")
 
     try:
-        await repo.create_article(
+        res = await repo.create_article(
             {
                 "name": name,
                 "content": content,
@@ -67,6 +143,10 @@ async def append_article(
                 "path_logical": prev_article.path_logical + f"/{logic}",
             }
         )
+        version = await record_board_activity(board_id, articles=1)
+        record = ArticleRecord.from_article(res)
+        _apply_on_commit(board_id, version, lambda board: board.put(record))
+        response_cache.invalidate("boards", f"board:{board_id}")
     except IntegrityError as e:
         code: int = e.orig.pgcode
         if code == 23503:
@@ -94,52 +174,275 @@ async def get_article_by_id(article_id: int) -> Article:
     return res
 
 
-async def get_article_list_by_board_id(board_id: int) -> list[Article]:
+async def get_article_version_by_id(article_id: int) -> int | None:
+    """
+    장작의 버전을 조회할 때의 구체적인 동작을 정의합니다. 장작이 없으면 None을 반환합니다.
+    """
+    return await repo.get_article_version(article_id)
+
+
+@coalesced
+async def get_article_list_by_board_id(
+    board_id: int,
+    version: int | None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> tuple[list[ArticleRecord], str | None]:
     """
     불판의 id를 받아 장작의 목록을 불러올 때의 구체적인 동작을 정의합니다.
+    limit이 주어지면 커서 다음부터 limit개를 불러오며, 다음 페이지의 커서를 함께 반환합니다.
+    fields가 주어졌고 불판이 메모리에 없으면, 불판 전체를 불러오는 대신 그 필드들만 데이터베이스에서 불러옵니다.
+    version은 호출한 쪽이 ETag를 만들 때 읽은 불판의 버전입니다. 합쳐지는 호출의 키에 포함되므로,
+    쓰기 전에 시작된 조회의 결과를 쓰기 뒤의 ETag와 함께 응답하지 않습니다.
     """
-    board = await get_board(board_id)
-    if not board:
-        raise HTTPException(status_code=400, detail="존재하지 않는 게시판입니다.")
+    kind = f"article:{board_id}"
+    try:
+        before_path = decode_cursor(kind, cursor, str)[0] if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.") from e
 
+    fetch_limit = limit + 1 if limit is not None else None
+    board = await _get_board_articles_at(board_id, version, load=fields is None)
+    if board is not None:
+        res = board.page(limit=fetch_limit, before_path=before_path)
+    else:
+        res = await repo.get_article_records_from_board(
+            board_id, limit=fetch_limit, before_path=before_path, fields=fields
+        )
+
+    return paginate(res, limit, kind, lambda article: [article.path])
+
+
+async def stream_article_list_by_board_id(
+    board_id: int, cursor: str | None = None, fields: tuple[str, ...] | None = None
+) -> AsyncIterator[list[ArticleRecord]]:
+    """
+    불판의 장작 목록을 나누어 내보낼 때의 구체적인 동작을 정의합니다.
+    커서 다음의 모든 장작을 STREAM_BATCH_SIZE개씩 내보내며,
+    불판이 메모리에 있으면 메모리에서, 없으면 데이터베이스에서 불판 전체를 불러오지 않고 나누어 읽습니다.
+    """
+    kind = f"article:{board_id}"
     try:
-        res: list[Article] = await repo.get_articles_from_board(board_id)
-    except IntegrityError as e:
-        code: int = e.orig.pgcode
-        if code == 23503:
-            raise HTTPException(status_code=400, detail="존재하지 않는 게시글입니다.") from e
-        raise HTTPException(
-            status_code=500, detail=f"Unknown DB Error: {e.orig}"
-        ) from e
+        before_path = decode_cursor(kind, cursor, str)[0] if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.") from e
 
-    return res
+    board = await _get_board_articles(board_id, load=False)
+    if board is None:
+        return repo.stream_article_records_from_board(board_id, before_path, fields)
+    return _in_batches(board.page(limit=None, before_path=before_path))
+
+
+async def _in_batches(articles: list[ArticleRecord]) -> AsyncIterator[list]:
+    for i in range(0, len(articles), STREAM_BATCH_SIZE):
+        yield articles[i : i + STREAM_BATCH_SIZE]
+
+
+async def get_article_tree_by_board_id(
+    board_id: int, version: int | None
+) -> tuple[list[dict], int]:
+    """
+    불판의 장작들을 트리 형태로 불러올 때의 구체적인 동작을 정의합니다.
+    최상위 장작 목록과 전체 장작 수를 반환합니다. version은 get_article_list_by_board_id와 같습니다.
+    """
+    articles, _ = await get_article_list_by_board_id(board_id, version)
+
+    return build_article_tree(articles), len(articles)
+
+
+async def get_article_subtree(
+    article_id: int, depth: int | None = None
+) -> list[ArticleRecord]:
+    """
+    장작과 그 아래에 달린 장작들을 불러올 때의 구체적인 동작을 정의합니다.
+    depth가 주어지면 그 깊이까지만 불러옵니다.
+    불판이 메모리에 없으면 불판 전체를 불러오지 않고, 그 아래의 장작들만 데이터베이스에서 불러옵니다.
+    """
+    article = await get_article_by_id(article_id)
+    board = await _get_board_articles(article.board_id, load=False)
+    if board is None:
+        return await repo.get_articles_under_path(article.path, max_depth=depth)
+
+    return board.subtree(article.path, max_depth=depth)
+
+
+async def get_article_children(article_id: int) -> list[ArticleRecord]:
+    """
+    장작에 바로 달린 장작들을 불러올 때의 구체적인 동작을 정의합니다.
+    """
+    article = await get_article_by_id(article_id)
+    board = await _get_board_articles(article.board_id, load=False)
+    if board is None:
+        return await repo.get_articles_under_path(
+            article.path, max_depth=1, include_self=False
+        )
+
+    return board.subtree(article.path, max_depth=1, include_self=False)
+
+
+async def get_article_ancestors(article_id: int) -> list[ArticleRecord]:
+    """
+    최상위 장작부터 부모 장작까지, 장작의 상위 경로(breadcrumb)를 불러올 때의 구체적인 동작을 정의합니다.
+    불판이 메모리에 없으면 경로에 담긴 상위 장작들의 id로 그 장작들만 데이터베이스에서 불러옵니다.
+    """
+    article = await get_article_by_id(article_id)
+    board = await _get_board_articles(article.board_id, load=False)
+    if board is None:
+        ancestor_ids = [int(_id) for _id in article.path.split("/")[1:-1]]
+        return await repo.get_articles_by_ids(ancestor_ids)
+
+    return board.ancestors(article.id)
 
 
 async def update_article(article_id: int, name: str, content: str, user_id: int):
     """
     장작을 수정할 때의 구체적인 동작을 정의합니다.
     """
-    original_article: Article = await repo.get_article(article_id)
+    board_id = await repo.update_article(
+        article_id=article_id,
+        article_req={"name": name, "content": content},
+        creator_id=user_id,
+    )
+    if board_id is None:
+        await raise_not_owned(Article, article_id, "존재하지 않는 게시글입니다.")
+    version = await record_board_activity(board_id)
+
+    def _update(board: BoardArticles):
+        article = board.get(article_id)
+        if article is not None:
+            board.put(article._replace(name=name, content=content))
+
+    _apply_on_commit(board_id, version, _update)
+    response_cache.invalidate(f"article:{article_id}", "boards", f"board:{board_id}")
+
+
+async def move_article(article_id: int, parent_id: int, user_id: int):
+    """
+    장작과 그 아래에 달린 장작들을 같은 불판의 다른 장작 아래로 옮길 때의 구체적인 동작을 정의합니다.
+    두 장작을 캐시 대신 기본 데이터베이스에서 잠그고 읽으며, 그사이에 다른 요청이 장작을 옮겼으면 409를 발생시킵니다.
+    """
+    articles = await repo.lock_articles((article_id, parent_id))
+    article, parent = articles.get(article_id), articles.get(parent_id)
 
-    if not original_article.name:
+    if not article or not parent or parent.board_id != article.board_id:
         raise HTTPException(status_code=400, detail="존재하지 않는 게시글입니다.")
-    if not original_article.creator_id == user_id:
+    if not article.creator_id == user_id:
         raise HTTPException(status_code=401, detail="권한이 없습니다.")
+    if article.path.count("/") < 2:
+        raise HTTPException(status_code=400, detail="최상위 게시글은 옮길 수 없습니다.")
+    if parent.path == article.path or parent.path.startswith(article.path + "/"):
+        raise HTTPException(status_code=400, detail="하위 게시글 아래로는 옮길 수 없습니다.")
 
-    await repo.update_article(
-        article_id=original_article.id, article_req={"name": name, "content": content}
+    board_id, path = article.board_id, article.path
+    # 옮길 장작들 아래에 장작을 추가 중인 요청이 끝나기를 기다려, 추가된 장작도 함께 옮깁니다.
+    await repo.lock_subtree(path)
+    moved = await repo.move_article_subtree(
+        article_id,
+        path,
+        article.path_logical,
+        parent_id,
+        parent.path,
+        parent.path_logical,
+        creator_id=user_id,
+    )
+    if not moved:
+        raise HTTPException(status_code=409, detail="다른 요청이 게시글을 먼저 옮겼습니다. 다시 시도해 주세요.")
+    version = await record_board_activity(board_id)
+
+    def _move(board: BoardArticles):
+        board.remove_subtree(path)
+        for record in moved:
+            board.put(record)
+
+    _apply_on_commit(board_id, version, _move)
+    response_cache.invalidate(
+        *(f"article:{record.id}" for record in moved), "boards", f"board:{board_id}"
     )
 
 
 async def delete_article(article_id: int, user_id: int):
     """
-    장작을 삭제할 때의 구체적인 동작을 정의합니다.
+    장작을 삭제할 때의 구체적인 동작을 정의합니다. 장작 아래에 달린 장작들도 함께 삭제합니다.
     """
-    original_article: Article = await repo.get_article(article_id)
+    deleted, comment_count = await repo.delete_article_subtree(
+        article_id, creator_id=user_id
+    )
+    if not deleted:
+        await raise_not_owned(Article, article_id, "존재하지 않는 게시글입니다.")
 
-    if not original_article:
-        raise HTTPException(status_code=400, detail="존재하지 않는 게시글입니다.")
-    if not original_article.creator_id == user_id:
-        raise HTTPException(status_code=401, detail="권한이 없습니다.")
+    board_id, path = next(
+        (article.board_id, article.path)
+        for article in deleted
+        if article.id == article_id
+    )
+    version = await record_board_activity(
+        board_id,
+        articles=-len(deleted),
+        comments=-comment_count,
+        clear_root=path.count("/") == 1,
+    )
+    _apply_on_commit(board_id, version, lambda board: board.remove_subtree(path))
+    response_cache.invalidate(
+        *(f"article:{article.id}" for article in deleted),
+        "boards",
+        f"board:{board_id}",
+    )
+
+
+async def delete_articles_by_creator(user_id: int) -> None:
+    """
+    탈퇴하는 유저가 다른 유저의 불판에 작성한 장작들을 그 아래에 달린 장작, 댓글과 함께 삭제할 때의 구체적인 동작을 정의합니다.
+    ON DELETE CASCADE에 맡기면 아래에 달린 장작들이 남고 불판의 장작 수, 댓글 수, 최상위 장작 기록이 맞지 않게 되므로,
+    delete_article처럼 하위 트리째 삭제하고 불판마다 한 번씩 기록을 고칩니다.
+    """
+    # 트리 순서이므로, 앞서 고른 장작 아래에 있는 장작은 바로 뒤에 이어집니다.
+    tops = []
+    for article in await repo.get_articles_by_creator(user_id):
+        if not tops or not article.path.startswith(tops[-1].path + "/"):
+            tops.append(article)
+
+    removed: dict[int, list[str]] = {}
+    articles, comments = Counter(), Counter()
+    deleted_ids = []
+    for top in tops:
+        deleted, comment_count = await repo.delete_article_subtree(
+            top.id, creator_id=user_id
+        )
+        removed.setdefault(top.board_id, []).append(top.path)
+        articles[top.board_id] += len(deleted)
+        comments[top.board_id] += comment_count
+        deleted_ids.extend(article.id for article in deleted)
+
+    for board_id, paths in removed.items():
+        version = await record_board_activity(
+            board_id,
+            articles=-articles[board_id],
+            comments=-comments[board_id],
+            clear_root=any(path.count("/") == 1 for path in paths),
+        )
+        _apply_on_commit(board_id, version, _subtrees_remover(paths))
+    if removed:
+        response_cache.invalidate(
+            *(f"article:{article_id}" for article_id in deleted_ids),
+            "boards",
+            *(f"board:{board_id}" for board_id in removed),
+        )
 
-    await repo.delete_article(article_id)
+
+def _subtrees_remover(paths: list[str]):
+    def _remove(board: BoardArticles):
+        for path in paths:
+            board.remove_subtree(path)
+
+    return _remove
+
+
+async def record_comment_activity(board_id: int, comments: int) -> None:
+    """
+    댓글을 추가하거나 삭제할 때, 불판의 댓글 수를 comments만큼 바꾸고 마지막 활동 시각을 갱신합니다.
+    불판의 버전이 오르므로, 메모리에 보관 중인 장작들도 바뀐 것 없이 같은 버전으로 맞춥니다.
+    """
+    version = await record_board_activity(board_id, comments=comments)
+    _apply_on_commit(board_id, version, lambda board: None)
+    response_cache.invalidate("boards", f"board:{board_id}")
@@ -0,0 +1,94 @@
+"""
+불판의 장작 목록을 트리 구조로 조립하고, JSON으로 직렬화합니다.
+장작의 자식들은 자식의 반응(path_logical의 마지막 값: AGREE, DISAGREE, NEUTRAL)별로 묶습니다.
+"""
+
+import json
+from typing import Iterable, Iterator
+
+from data.db.models import Article
+
+TREE_FIELDS = ("id", "name", "content", "creator_id", "path", "path_logical")
+
+
+def _parent_id(path: str) -> int | None:
+    segments = path.split("/")
+    if len(segments) < 3:
+        return None
+    return int(segments[-2])
+
+
+def build_article_tree(articles: Iterable[Article]) -> list[dict]:
+    """
+    장작 목록을 한 번만 순회하여 트리를 만들고, 최상위 장작들의 목록을 반환합니다.
+    부모 장작이 목록에 없는 장작은 최상위 장작으로 취급합니다.
+    """
+    nodes: dict[int, dict] = {}
+    ordered: list[dict] = []
+    for article in articles:
+        node = {field: getattr(article, field) for field in TREE_FIELDS}
+        node["path_logical"] = node["path_logical"].upper()
+        node["children"] = {}
+        nodes[node["id"]] = node
+        ordered.append(node)
+
+    # get_article_records_from_board는 path 내림차순이므로, 거꾸로 순회하여 먼저 생긴 장작이 앞에 오도록 합니다.
+    roots: list[dict] = []
+    for node in reversed(ordered):
+        parent = nodes.get(_parent_id(node["path"]))
+        if parent is None:
+            roots.append(node)
+            continue
+        logic = node["path_logical"].rsplit("/", 1)[-1]
+        parent["children"].setdefault(logic, []).append(node)
+
+    return roots
+
+
+def _expand(node: dict) -> list:
+    parts: list = [
+        json.dumps({field: node[field] for field in TREE_FIELDS}, ensure_ascii=False)[
+            :-1
+        ]
+        + ',"children":{'
+    ]
+    for i, (logic, children) in enumerate(node["children"].items()):
+        if i:
+            parts.append(",")
+        parts.append(json.dumps(logic) + ":[")
+        for j, child in enumerate(children):
+            if j:
+                parts.append(",")
+            parts.append(child)
+        parts.append("]")
+    parts.append("}}")
+    return parts
+
+
+def iter_article_tree_json(roots: list[dict], chunk_size: int = 65536) -> Iterator[str]:
+    """
+    트리를 JSON 배열로 직렬화하면서 chunk_size 정도의 조각으로 나누어 내보냅니다.
+    재귀 대신 스택을 사용하므로 트리가 깊어도 호출 깊이 제한에 걸리지 않습니다.
+    """
+    stack: list = ["]"]
+    for i, root in enumerate(reversed(roots)):
+        if i:
+            stack.append(",")
+        stack.append(root)
+    stack.append("[")
+
+    buffer: list[str] = []
+    size = 0
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(reversed(_expand(item)))
+            continue
+        buffer.append(item)
+        size += len(item)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,210 @@
+"""
+최근에 조회된 불판의 장작들을 메모리에 보관합니다.
+장작은 id와 path로 색인하며, 트리 순서(path_key 순서)를 유지하므로 불판 전체나 하위 트리를 데이터베이스 조회 없이 꺼낼 수 있습니다.
+장작의 추가, 수정, 삭제는 커밋된 뒤 보관 중인 불판에 바로 반영합니다.
+"""
+
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Iterable, Iterator
+
+from config import ARTICLE_TREE_CACHE_MAX_ARTICLES
+from data import metrics
+from data.db.database import current_unit_of_work
+from endpoint.article.path import path_key, descendant_range
+from endpoint.article.record import ArticleRecord
+
+
+class BoardArticles:
+    """
+    불판 하나의 장작들입니다. paths는 path_key 오름차순으로 정렬된 path 목록입니다.
+    version은 이 장작들이 반영하고 있는 불판의 버전입니다.
+    """
+
+    __slots__ = ("version", "paths", "by_path", "by_id")
+
+    def __init__(self, version: int, articles: Iterable[ArticleRecord]):
+        self.version = version
+        self.by_path: dict[str, ArticleRecord] = {}
+        self.by_id: dict[int, str] = {}
+        for article in articles:
+            self.by_path[article.path] = article
+            self.by_id[article.id] = article.path
+        self.paths: list[str] = sorted(self.by_path, key=path_key)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self) -> Iterator[ArticleRecord]:
+        return (self.by_path[path] for path in self.paths)
+
+    def get(self, article_id: int) -> ArticleRecord | None:
+        path = self.by_id.get(article_id)
+        return self.by_path[path] if path is not None else None
+
+    def ancestors(self, article_id: int) -> list[ArticleRecord]:
+        """
+        최상위 장작부터 부모 장작까지의 상위 장작들을 반환합니다.
+        """
+        path = self.by_id.get(article_id)
+        if path is None:
+            return []
+        ancestors = [self.get(int(_id)) for _id in path.split("/")[1:-1]]
+        return [ancestor for ancestor in ancestors if ancestor is not None]
+
+    def page(
+        self, limit: int | None = None, before_path: str | None = None
+    ) -> list[ArticleRecord]:
+        """
+        트리 역순으로 before_path 다음부터 limit개의 장작을 반환합니다.
+        """
+        end = (
+            bisect_left(self.paths, path_key(before_path), key=path_key)
+            if before_path is not None
+            else len(self.paths)
+        )
+        # 앞부분 전체가 아니라 반환할 limit개만 잘라 뒤집습니다.
+        start = max(end - limit, 0) if limit is not None else 0
+        return [self.by_path[path] for path in self.paths[start:end][::-1]]
+
+    def subtree(
+        self, path: str, max_depth: int | None = None, include_self: bool = True
+    ) -> list[ArticleRecord]:
+        """
+        path 아래에 있는 장작들을 트리 역순으로 반환합니다.
+        max_depth가 주어지면 path로부터 max_depth 단계 아래까지만 반환합니다.
+        """
+        low, high = descendant_range(path_key(path))
+        start = bisect_left(self.paths, low, key=path_key)
+        end = bisect_left(self.paths, high, start, key=path_key)
+        paths = self.paths[start:end]
+        if max_depth is not None:
+            depth = path.count("/") + max_depth
+            paths = [p for p in paths if p.count("/") <= depth]
+        if include_self and path in self.by_path:
+            paths.insert(0, path)
+        return [self.by_path[p] for p in reversed(paths)]
+
+    def put(self, article: ArticleRecord) -> None:
+        old_path = self.by_id.get(article.id)
+        if old_path is not None and old_path != article.path:
+            self.remove(article.id)
+        if article.path not in self.by_path:
+            insort(self.paths, article.path, key=path_key)
+        self.by_path[article.path] = article
+        self.by_id[article.id] = article.path
+
+    def remove(self, article_id: int) -> None:
+        path = self.by_id.pop(article_id, None)
+        if path is None:
+            return
+        del self.by_path[path]
+        del self.paths[bisect_left(self.paths, path_key(path), key=path_key)]
+
+    def remove_subtree(self, path: str) -> None:
+        """
+        path의 장작과 그 아래에 있는 장작들을 제거합니다.
+        """
+        key = path_key(path)
+        _, high = descendant_range(key)
+        start = bisect_left(self.paths, key, key=path_key)
+        end = bisect_left(self.paths, high, start, key=path_key)
+        for removed in self.paths[start:end]:
+            del self.by_id[self.by_path.pop(removed).id]
+        del self.paths[start:end]
+
+
+class ArticleTreeCache:
+    """
+    불판별 장작들을 LRU 순서로 보관합니다.
+    보관 중인 장작 수의 합이 max_articles를 넘으면 가장 오래 조회되지 않은 불판부터 버립니다.
+    """
+
+    def __init__(self, max_articles: int):
+        self.max_articles = max_articles
+        self._boards: OrderedDict[int, BoardArticles] = OrderedDict()
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, board_id: int, version: int) -> BoardArticles | None:
+        """
+        불판의 장작들을 반환합니다.
+        보관 중인 장작들이 version보다 오래되었으면 버리고 None을 반환합니다.
+        """
+        board = self._boards.get(board_id)
+        if board is not None and board.version < version:
+            self.discard(board_id)
+            board = None
+        if board is None:
+            self.misses += 1
+            return None
+
+        self._boards.move_to_end(board_id)
+        self.hits += 1
+        return board
+
+    def load(
+        self, board_id: int, version: int, articles: Iterable[ArticleRecord]
+    ) -> BoardArticles:
+        """
+        데이터베이스에서 불러온 장작들로 불판을 만들어 보관하고 반환합니다.
+        쓰기를 한 작업 단위 안에서 불러온 장작들은 커밋되지 않았을 수 있으므로 보관하지 않습니다.
+        """
+        board = BoardArticles(version, articles)
+        uow = current_unit_of_work()
+        if (uow is not None and uow.dirty) or len(board) > self.max_articles:
+            return board
+
+        self.discard(board_id)
+        self._boards[board_id] = board
+        self._size += len(board)
+        while self._size > self.max_articles:
+            _, evicted = self._boards.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+        return board
+
+    def discard(self, board_id: int) -> None:
+        board = self._boards.pop(board_id, None)
+        if board is not None:
+            self._size -= len(board)
+
+    def apply(self, board_id: int, version: int, change) -> None:
+        """
+        불판의 버전을 version으로 올린 쓰기가 커밋된 뒤, 그 변경(change)을 보관 중인 장작들에 반영합니다.
+        보관 중인 장작들이 바로 이전 버전이 아니면, 반영 대신 버립니다.
+        """
+        board = self._boards.get(board_id)
+        if board is None or board.version >= version:
+            return
+        if board.version != version - 1:
+            self.discard(board_id)
+            return
+
+        before = len(board)
+        change(board)
+        board.version = version
+        self._size += len(board) - before
+
+    def clear(self) -> None:
+        self._boards.clear()
+        self._size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "boards": len(self._boards),
+            "articles": self._size,
+            "max_articles": self.max_articles,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+article_tree_cache = ArticleTreeCache(max_articles=ARTICLE_TREE_CACHE_MAX_ARTICLES)
+metrics.register("article_tree_cache", article_tree_cache.stats)
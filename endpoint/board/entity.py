@@ -3,7 +3,9 @@
 불판 : Board, 장작 : Article
 """
 
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
 
 
 class BoardCreate(BaseModel):
@@ -14,12 +16,8 @@ class BoardCreate(BaseModel):
     name: str
     description: str = "Board Description"
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BoardUpdate(BaseModel):
@@ -30,26 +28,22 @@ class BoardUpdate(BaseModel):
     name: str
     description: str = "Board Description"
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BoardGet(BaseModel):
     """
-    불판을 조회할 때에는 id와 제목, 상세 설명을 출력합니다.
+    불판을 조회할 때에는 id와 제목, 상세 설명, 최상위 장작의 id, 장작 수와 댓글 수, 마지막 활동 시각을 출력합니다.
     """
 
     id: int
     name: str
     description: str = "Board Description"
+    root_article_id: int | None = None
+    article_count: int = 0
+    comment_count: int = 0
+    last_activity_at: datetime | None = None
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,20 @@
+"""
+불판을 조회 전용으로 다룰 때 사용하는 가벼운 레코드를 정의합니다.
+"""
+
+from datetime import datetime
+from typing import NamedTuple
+
+
+class BoardRecord(NamedTuple):
+    """
+    불판 한 개입니다. 필드 순서대로 Board의 컬럼을 조회하여 만듭니다.
+    """
+
+    id: int
+    name: str
+    description: str
+    root_article_id: int | None
+    article_count: int
+    comment_count: int
+    last_activity_at: datetime | None
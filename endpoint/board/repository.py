@@ -3,25 +3,36 @@
 불판 : Board, 장작 : Article
 """
 
+from typing import Iterable
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update, insert
-from data.db.database import Transactional
-from data.db.models import Board
+from sqlalchemy import select, delete, update, insert, func
+from data.db.database import Transactional, Propagation
+from data.db.projection import record_columns
+from data.cache.entity import entity_cache
+from data.db.models import Article, Board
+from endpoint.board.record import BoardRecord
 
 
-@Transactional()
+@Transactional(Propagation.READ_ONLY)
 async def get_board(board_id: int, session: AsyncSession = None) -> Board:
     """
     board_id를 바탕으로 불판을 데이터베이스에서 가져와 반환합니다.
     """
+    board = entity_cache.get(Board, board_id)
+    if board is not None:
+        return board
+
     stmt = select(Board).where(Board.id == board_id)
 
     res = await session.execute(stmt)
 
-    return res.scalars().first()
+    board = res.scalars().first()
+    entity_cache.set(Board, board_id, board)
+    return board
 
 
-@Transactional()
+@Transactional(Propagation.READ_ONLY)
 async def get_board_by_name(board_name: str, session: AsyncSession = None) -> Board:
     """
     board_name을 바탕으로 불판을 데이터베이스에서 가져와 반환합니다.
@@ -33,23 +44,53 @@ async def get_board_by_name(board_name: str, session: AsyncSession = None) -> Bo
     return res.scalars().first()
 
 
-@Transactional()
+@Transactional(Propagation.READ_ONLY)
 async def get_boards(
-    per_page: int, page: int, session: AsyncSession = None
+    limit: int,
+    offset: int = 0,
+    before_id: int | None = None,
+    session: AsyncSession = None,
 ) -> list[Board]:
     """
     불판을 데이터베이스에서 가져와 리스트 형태로 반환합니다.
     이때 id를 내림차 순으로 정렬합니다.
+    before_id가 주어지면 그보다 id가 작은 불판부터 조회하며, 이때는 offset을 사용하지 않습니다.
+    """
+    stmt = select(Board).order_by(Board.id.desc()).limit(limit)
+    if before_id is not None:
+        stmt = stmt.where(Board.id < before_id)
+    elif offset:
+        stmt = stmt.offset(offset)
+    result = await session.execute(stmt)
+
+    return result.scalars().all()
+
+
+@Transactional(Propagation.READ_ONLY)
+async def get_board_records(
+    limit: int,
+    offset: int = 0,
+    before_id: int | None = None,
+    fields: Iterable[str] | None = None,
+    session: AsyncSession = None,
+) -> list[BoardRecord]:
+    """
+    get_boards와 같은 불판들을 ORM 객체 대신 BoardRecord로 조회하여 반환합니다.
+    필요한 컬럼만 조회하며, 세션의 식별자 맵에 등록하지 않습니다.
+    fields가 주어지면 그 필드와 커서에 필요한 id만 조회하고, 나머지 필드는 None입니다.
     """
     stmt = (
-        select(Board)
-        .limit(per_page)
+        select(*record_columns(Board, BoardRecord, fields, required=("id",)))
         .order_by(Board.id.desc())
-        .offset(per_page * (page - 1))
+        .limit(limit)
     )
+    if before_id is not None:
+        stmt = stmt.where(Board.id < before_id)
+    elif offset:
+        stmt = stmt.offset(offset)
     result = await session.execute(stmt)
 
-    return result.scalars().all()
+    return list(map(BoardRecord._make, result))
 
 
 @Transactional()
@@ -62,27 +103,151 @@ async def create_board(board_req: dict, session: AsyncSession = None) -> Board:
 
     session.add(_board)
 
-    await session.commit()
-    await session.refresh(_board)
+    await session.flush()
 
     return _board
 
 
 @Transactional()
 async def update_board(
-    board_id: int, board_req: dict, session: AsyncSession = None
-) -> None:
+    board_id: int, board_req: dict, creator_id: int, session: AsyncSession = None
+) -> bool:
+    """
+    creator_id가 만든 불판이면 수정하고 버전을 1 증가시킨 뒤 True를, 그런 불판이 없으면 False를 반환합니다.
+    """
+    stmt = (
+        update(Board)
+        .where(Board.id == board_id, Board.creator_id == creator_id)
+        .values(**board_req, version=Board.version + 1)
+        .returning(Board.id)
+    )
+    res = await session.execute(stmt)
+    entity_cache.invalidate(Board, board_id)
+
+    return res.first() is not None
+
+
+async def _delete_board_articles(*conditions, session: AsyncSession) -> list[int]:
+    """
+    conditions에 맞는 불판들의 장작을 삭제하고, 삭제한 장작들의 id를 반환합니다.
+    장작의 응답 캐시를 지울 수 있도록 ON DELETE CASCADE에 맡기지 않고 직접 삭제합니다. 댓글은 장작과 함께 지워집니다.
+    """
+    stmt = (
+        delete(Article)
+        .where(Article.board_id.in_(select(Board.id).where(*conditions)))
+        .returning(Article.id)
+        .execution_options(synchronize_session=False)
+    )
+    res = await session.execute(stmt)
+
+    return res.scalars().all()
+
+
+@Transactional()
+async def delete_board(
+    board_id: int, creator_id: int, session: AsyncSession = None
+) -> list[int] | None:
     """
-    불판을 수정합니다.
+    creator_id가 만든 불판이면 그 장작들과 함께 삭제하고 삭제한 장작들의 id를, 그런 불판이 없으면 None을 반환합니다.
     """
-    stmt = update(Board).where(Board.id == board_id).values(**board_req)
-    await session.execute(stmt)
+    article_ids = await _delete_board_articles(
+        Board.id == board_id, Board.creator_id == creator_id, session=session
+    )
+    stmt = (
+        delete(Board)
+        .where(Board.id == board_id, Board.creator_id == creator_id)
+        .returning(Board.id)
+    )
+    res = await session.execute(stmt)
+    if res.first() is None:
+        return None
+
+    entity_cache.invalidate(Board, board_id)
+    entity_cache.invalidate_tag(f"board:{board_id}")
+    return article_ids
+
+
+@Transactional()
+async def delete_boards_by_creator(
+    creator_id: int, session: AsyncSession = None
+) -> tuple[list[int], list[int]]:
+    """
+    creator_id가 만든 불판들을 그 장작들과 함께 삭제하고, 삭제한 불판들과 장작들의 id를 반환합니다.
+    """
+    article_ids = await _delete_board_articles(
+        Board.creator_id == creator_id, session=session
+    )
+    stmt = (
+        delete(Board)
+        .where(Board.creator_id == creator_id)
+        .returning(Board.id)
+        .execution_options(synchronize_session=False)
+    )
+    res = await session.execute(stmt)
+
+    board_ids = res.scalars().all()
+    entity_cache.invalidate_many(Board, board_ids)
+    entity_cache.invalidate_tags(f"board:{board_id}" for board_id in board_ids)
+    return board_ids, article_ids
+
+
+@Transactional(Propagation.READ_ONLY)
+async def get_board_version(board_id: int, session: AsyncSession = None) -> int | None:
+    """
+    불판의 버전만 가져와 반환합니다. 불판이 없으면 None을 반환합니다.
+    """
+    stmt = select(Board.version).where(Board.id == board_id)
+
+    res = await session.execute(stmt)
+
+    return res.scalar_one_or_none()
+
+
+@Transactional()
+async def bump_board_version(board_id: int, session: AsyncSession = None) -> int | None:
+    """
+    불판의 버전을 1 증가시키고, 증가한 버전을 반환합니다.
+    """
+    stmt = (
+        update(Board)
+        .where(Board.id == board_id)
+        .values(version=Board.version + 1)
+        .returning(Board.version)
+    )
+    res = await session.execute(stmt)
+    entity_cache.invalidate(Board, board_id)
+
+    return res.scalar_one_or_none()
 
 
 @Transactional()
-async def delete_board(board_id: int, session: AsyncSession = None) -> None:
+async def record_board_activity(
+    board_id: int,
+    articles: int = 0,
+    comments: int = 0,
+    root_article_id: int | None = None,
+    clear_root: bool = False,
+    session: AsyncSession = None,
+) -> int | None:
     """
-    불판을 삭제합니다.
+    불판의 장작 수와 댓글 수를 articles, comments만큼 바꾸고, 마지막 활동 시각과 함께 버전을 1 증가시켜 증가한 버전을 반환합니다.
+    root_article_id가 주어지면 최상위 장작이 아직 없는 불판에만 그 장작을 최상위 장작으로 기록하며, 이미 있으면 None을 반환합니다.
+    clear_root가 참이면 최상위 장작 기록을 지웁니다.
     """
-    stmt = delete(Board).where(Board.id == board_id)
-    await session.execute(stmt)
+    values = {
+        "version": Board.version + 1,
+        "article_count": Board.article_count + articles,
+        "comment_count": Board.comment_count + comments,
+        "last_activity_at": func.now(),
+    }
+    stmt = update(Board).where(Board.id == board_id)
+    if root_article_id is not None:
+        values["root_article_id"] = root_article_id
+        stmt = stmt.where(Board.root_article_id.is_(None))
+    elif clear_root:
+        values["root_article_id"] = None
+
+    res = await session.execute(stmt.values(**values).returning(Board.version))
+    entity_cache.invalidate(Board, board_id)
+
+    return res.scalar_one_or_none()
@@ -2,17 +2,23 @@
 불판과 관련된 모든 라우팅 경로 URL을 정의합니다.
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
 from endpoint.board.service import (
     get_board_by_id,
     get_board_list,
+    get_board_list_version,
+    get_board_version_by_id,
     create_new_board,
     update_existing_board,
     delete_existing_board,
 )
 from endpoint.board.entity import BoardGet, BoardCreate, BoardUpdate
 from endpoint.user.service import get_current_user
+from data.db.pagination import NEXT_CURSOR_HEADER
+from data.etag import make_etag, conditional_response
+from data.serialization import FieldSelection, dump_json
+from config import PAGE_SIZE_MAX
 
 
 router = APIRouter(prefix="/board")
@@ -29,24 +35,44 @@ async def create_board(_board_create: BoardCreate, user=Depends(get_current_user
         board_name=_board_create.name,
         board_description=_board_create.description,
         user_id=user.id,
-        user=user,
     )
 
 
 @router.get("/{board_id}", response_model=BoardGet, tags=["Board"])
-async def get_board(board_id: int) -> BoardGet:
+async def get_board(board_id: int, request: Request, response: Response) -> BoardGet:
     """
     특정 불판을 조회하는 라우팅 경로를 정의합니다.
+    If-None-Match가 불판의 ETag와 같으면 불판을 불러오지 않고 304로 응답합니다.
     """
+    etag = make_etag("board", board_id, await get_board_version_by_id(board_id))
+    if not_modified := conditional_response(request, response, etag):
+        return not_modified
     return await get_board_by_id(board_id)
 
 
 @router.get("/", response_model=list[BoardGet], tags=["Board"])
-async def get_boards(per_page: int = 10, page: int = 1) -> list[BoardGet]:
+async def get_boards(
+    response: Response,
+    per_page: int = Query(default=10, ge=1, le=PAGE_SIZE_MAX),
+    page: int = Query(default=1, ge=1),
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = Depends(FieldSelection(BoardGet)),
+) -> list[BoardGet]:
     """
     모든 불판 목록을 조회하는 라우팅 경로를 정의합니다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 전달하며, cursor로 넘기면 page 대신 사용합니다.
+    fields를 주면 그 필드들만 응답합니다.
     """
-    return await get_board_list(per_page, page)
+    boards, next_cursor = await get_board_list(
+        get_board_list_version(), per_page, page, cursor, fields
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(
+        dump_json(list[BoardGet], boards, fields),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
 
 
 @router.put("/{board_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Board"])
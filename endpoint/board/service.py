@@ -10,9 +10,32 @@ from endpoint.board.repository import (
     create_board,
     update_board,
     delete_board,
-    get_boards,
+    delete_boards_by_creator,
+    get_board_records,
+    get_board_version,
+)
+from data.db.models import Board
+from endpoint.board.record import BoardRecord
+from data.bus import invalidation_bus
+from data.cache.response import response_cache
+from data.db.ownership import raise_not_owned
+from data.db.pagination import decode_cursor, paginate
+from data.singleflight import coalesced
+
+# 불판 목록이 바뀔 때마다, 곧 "boards" 태그의 응답들이 커밋 뒤에 지워질 때마다 올리는 세대 번호입니다.
+# 무효화 버스로 전달되므로 다른 프로세스에서 바뀐 것도 반영됩니다.
+_board_list_generation = 0
+
+
+def _bump_board_list_generation(tags: list | None = None) -> None:
+    global _board_list_generation
+    if tags is None or "boards" in tags:
+        _board_list_generation += 1
+
+
+invalidation_bus.subscribe(
+    "response", _bump_board_list_generation, reset=_bump_board_list_generation
 )
-from data.db.models import Board, User
 
 
 async def get_board_by_id(board_id: int) -> Board:
@@ -33,12 +56,33 @@ async def get_board_by_id(board_id: int) -> Board:
     return res
 
 
-async def get_board_list(per_page: int, page: int) -> list[Board]:
+@coalesced
+async def get_board_list(
+    version: int,
+    per_page: int,
+    page: int = 1,
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> tuple[list[BoardRecord], str | None]:
     """
     불판의 목록을 불러올 때의 구체적인 동작을 정의합니다.
+    cursor가 주어지면 page 대신 커서 다음부터 불러오며, 다음 페이지의 커서를 함께 반환합니다.
+    fields가 주어지면 그 필드들만 데이터베이스에서 불러옵니다.
+    version은 호출한 쪽이 읽은 불판 목록의 세대 번호로, 조회에는 쓰지 않고 합쳐지는 호출의 키에만 포함됩니다.
+    버전이 다른 호출끼리는 합쳐지지 않으므로, 불판을 만든 뒤의 조회가 그 전에 시작된 조회의 결과를 받지 않습니다.
     """
     try:
-        res: list[Board] = await get_boards(per_page, page)
+        before_id = decode_cursor("board", cursor, int)[0] if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.") from e
+
+    try:
+        res: list[BoardRecord] = await get_board_records(
+            per_page + 1,
+            offset=per_page * (page - 1),
+            before_id=before_id,
+            fields=fields,
+        )
     except IntegrityError as e:
         code: int = e.orig.pgcode
         if code == 23503:
@@ -47,11 +91,25 @@ async def get_board_list(per_page: int, page: int) -> list[Board]:
             status_code=500, detail=f"Unknown DB Error: {e.orig}"
         ) from e
 
-    return res
+    return paginate(res, per_page, "board", lambda board: [board.id])
+
+
+def get_board_list_version() -> int:
+    """
+    불판 목록의 세대 번호를 반환합니다. 불판이 만들어지거나 수정, 삭제되어 커밋되면 바뀝니다.
+    """
+    return _board_list_generation
+
+
+async def get_board_version_by_id(board_id: int) -> int | None:
+    """
+    불판의 버전을 조회할 때의 구체적인 동작을 정의합니다. 불판이 없으면 None을 반환합니다.
+    """
+    return await get_board_version(board_id)
 
 
 async def create_new_board(
-    board_name: str, board_description: str, user_id: int, user: User
+    board_name: str, board_description: str, user_id: int
 ) -> Board:
     """
     새 불판을 생성할 때의 구체적인 동작을 정의합니다.
@@ -62,9 +120,9 @@ async def create_new_board(
                 "name": board_name,
                 "description": board_description,
                 "creator_id": user_id,
-                "creator": user,
             }
         )
+        response_cache.invalidate("boards")
 
         return res
 
@@ -83,27 +141,39 @@ async def update_existing_board(
     """
     현재 존재하는 불판의 이름과 설명을 수정할 때의 구체적인 동작을 정의합니다.
     """
-    original_board = await get_board(board_id)
-    if not original_board.name:
-        raise HTTPException(status_code=400, detail="존재하지 않는 게시판입니다.")
-    if not original_board.creator_id == user_id:
-        raise HTTPException(status_code=401, detail="권한이 없습니다.")
-
-    await update_board(
-        board_id=original_board.id,
+    updated = await update_board(
+        board_id=board_id,
         board_req={"name": board_name, "description": board_description},
+        creator_id=user_id,
     )
+    if not updated:
+        await raise_not_owned(Board, board_id, "존재하지 않는 게시판입니다.")
+    response_cache.invalidate("boards", f"board:{board_id}")
 
 
 async def delete_existing_board(board_id: int, user_id: int) -> None:
     """
     현재 존재하는 불판을 삭제할 때의 구체적인 동작을 정의합니다.
+    불판의 장작들도 함께 삭제되므로 장작들의 응답 캐시도 지웁니다.
     """
-    original_board = await get_board(board_id)
-    if not original_board:
-        raise HTTPException(status_code=400, detail="존재하지 않는 게시판입니다.")
+    article_ids = await delete_board(board_id, creator_id=user_id)
+    if article_ids is None:
+        await raise_not_owned(Board, board_id, "존재하지 않는 게시판입니다.")
+    response_cache.invalidate(
+        "boards",
+        f"board:{board_id}",
+        *(f"article:{article_id}" for article_id in article_ids),
+    )
 
-    if not original_board.creator_id == user_id:
-        raise HTTPException(status_code=401, detail="권한이 없습니다.")
 
-    await delete_board(board_id)
+async def delete_boards_by_user(user_id: int) -> None:
+    """
+    탈퇴하는 유저가 만든 불판들을 삭제할 때의 구체적인 동작을 정의합니다. 불판의 장작과 댓글도 함께 삭제됩니다.
+    """
+    board_ids, article_ids = await delete_boards_by_creator(user_id)
+    if board_ids:
+        response_cache.invalidate(
+            "boards",
+            *(f"board:{board_id}" for board_id in board_ids),
+            *(f"article:{article_id}" for article_id in article_ids),
+        )
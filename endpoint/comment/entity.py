@@ -2,7 +2,7 @@
 댓글의 입출력 형식(스키마)을 정의합니다.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class CommentCreate(BaseModel):
@@ -12,12 +12,8 @@ class CommentCreate(BaseModel):
 
     content: str = "Default Comment"
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CommentUpdate(BaseModel):
@@ -27,12 +23,8 @@ class CommentUpdate(BaseModel):
 
     content: str = "Default Comment"
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CommentGet(BaseModel):
@@ -44,9 +36,5 @@ class CommentGet(BaseModel):
     content: str = "Default Comment"
     creator_id: int
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
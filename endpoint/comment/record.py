@@ -0,0 +1,16 @@
+"""
+댓글을 조회 전용으로 다룰 때 사용하는 가벼운 레코드를 정의합니다.
+"""
+
+from typing import NamedTuple
+
+
+class CommentRecord(NamedTuple):
+    """
+    댓글 한 개입니다. 필드 순서대로 Comment의 컬럼을 조회하여 만듭니다.
+    """
+
+    id: int
+    content: str
+    creator_id: int
+    article_id: int
@@ -2,10 +2,16 @@
 댓글과 관련하여 데이터베이스와 실질적으로 상호작용하는 모듈입니다.
 """
 
+from typing import AsyncIterator, Iterable
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, update
-from data.db.database import Transactional
-from data.db.models import Comment
+from config import STREAM_BATCH_SIZE
+from data.db.database import Transactional, Propagation, streaming_session
+from data.db.projection import record_columns
+from data.cache.entity import entity_cache
+from data.db.models import Article, Board, Comment
+from endpoint.comment.record import CommentRecord
 
 
 @Transactional()
@@ -17,58 +23,173 @@ async def create_comment(comment_req: dict, session: AsyncSession = None) -> Com
 
     session.add(_comment)
 
-    await session.commit()
-    await session.refresh(_comment)
+    await session.flush()
 
     return _comment
 
 
-@Transactional()
+@Transactional(Propagation.READ_ONLY)
 async def get_comment(comment_id: int, session: AsyncSession = None) -> Comment:
     """
     comment_id를 바탕으로 댓글을 데이터베이스에서 가져와 반환합니다.
     """
+    comment = entity_cache.get(Comment, comment_id)
+    if comment is not None:
+        return comment
+
     stmt = select(Comment).where(Comment.id == comment_id)
 
     res = await session.execute(stmt)
 
-    return res.scalars().first()
+    comment = res.scalars().first()
+    if comment is not None:
+        entity_cache.set(
+            Comment, comment_id, comment, tags=(f"article:{comment.article_id}",)
+        )
+    return comment
 
 
-@Transactional()
+@Transactional(Propagation.READ_ONLY)
 async def get_comments_from_article(
-    article_id: int, session: AsyncSession = None
+    article_id: int,
+    limit: int | None = None,
+    before_id: int | None = None,
+    session: AsyncSession = None,
 ) -> list[Comment]:
     """
     장작의 id를 바탕으로 장작에 달린 모든 댓글을 조회합니다.
+    limit이 주어지면 id 내림차순으로 before_id 다음부터 limit개만 조회합니다.
     """
     stmt = (
         select(Comment)
         .where(Comment.article_id == article_id)
         .order_by(Comment.id.desc())
     )
+    if before_id is not None:
+        stmt = stmt.where(Comment.id < before_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
     res = await session.execute(stmt)
 
     return res.scalars().all()
 
 
+@Transactional(Propagation.READ_ONLY)
+async def get_comment_records_from_article(
+    article_id: int,
+    limit: int | None = None,
+    before_id: int | None = None,
+    fields: Iterable[str] | None = None,
+    session: AsyncSession = None,
+) -> list[CommentRecord]:
+    """
+    get_comments_from_article과 같은 댓글들을 ORM 객체 대신 CommentRecord로 조회하여 반환합니다.
+    필요한 컬럼만 조회하며, 세션의 식별자 맵에 등록하지 않습니다.
+    fields가 주어지면 그 필드와 커서에 필요한 id만 조회하고, 나머지 필드는 None입니다.
+    """
+    stmt = _comment_records_stmt(article_id, before_id, fields)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    res = await session.execute(stmt)
+
+    return list(map(CommentRecord._make, res))
+
+
+async def stream_comment_records_from_article(
+    article_id: int,
+    before_id: int | None = None,
+    fields: Iterable[str] | None = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[list[CommentRecord]]:
+    """
+    get_comment_records_from_article과 같은 댓글들을 서버 측 커서로 batch_size개씩 나누어 읽어 내보냅니다.
+    응답을 보내는 동안 읽으므로, 요청의 작업 단위 대신 별도의 세션을 사용합니다.
+    """
+    stmt = _comment_records_stmt(article_id, before_id, fields).execution_options(
+        yield_per=batch_size
+    )
+    async with streaming_session() as session:
+        res = await session.stream(stmt)
+        async for rows in res.partitions():
+            yield list(map(CommentRecord._make, rows))
+
+
+def _comment_records_stmt(
+    article_id: int, before_id: int | None, fields: Iterable[str] | None
+):
+    stmt = (
+        select(*record_columns(Comment, CommentRecord, fields, required=("id",)))
+        .where(Comment.article_id == article_id)
+        .order_by(Comment.id.desc())
+    )
+    if before_id is not None:
+        stmt = stmt.where(Comment.id < before_id)
+    return stmt
+
+
 @Transactional()
 async def update_comment(
-    comment_id: int, comment_req: dict, session: AsyncSession = None
-) -> None:
+    comment_id: int, comment_req: dict, creator_id: int, session: AsyncSession = None
+) -> int | None:
     """
-    댓글의 id와 comment_req를 바탕으로 댓글을 수정합니다.
+    creator_id가 작성한 댓글이면 comment_req를 바탕으로 수정하고 댓글이 달린 장작의 id를 반환합니다.
+    그런 댓글이 없으면 None을 반환합니다.
     """
-    stmt = update(Comment).where(Comment.id == comment_id).values(**comment_req)
-    await session.execute(stmt)
+    stmt = (
+        update(Comment)
+        .where(Comment.id == comment_id, Comment.creator_id == creator_id)
+        .values(**comment_req)
+        .returning(Comment.article_id)
+    )
+    res = await session.execute(stmt)
+    entity_cache.invalidate(Comment, comment_id)
 
-    return await get_comment(comment_id)
+    return res.scalar_one_or_none()
 
 
 @Transactional()
-async def delete_comment(comment_id: int, session: AsyncSession = None) -> None:
+async def delete_comment(
+    comment_id: int, creator_id: int, session: AsyncSession = None
+) -> int | None:
     """
-    댓글의 id를 바탕으로 댓글을 삭제합니다.
+    creator_id가 작성한 댓글이면 삭제하고 댓글이 달려 있던 장작의 id를 반환합니다.
+    그런 댓글이 없으면 None을 반환합니다.
     """
-    stmt = delete(Comment).where(Comment.id == comment_id)
-    await session.execute(stmt)
+    stmt = (
+        delete(Comment)
+        .where(Comment.id == comment_id, Comment.creator_id == creator_id)
+        .returning(Comment.article_id)
+    )
+    res = await session.execute(stmt)
+    entity_cache.invalidate(Comment, comment_id)
+
+    return res.scalar_one_or_none()
+
+
+@Transactional()
+async def delete_comments_by_creator(
+    creator_id: int, session: AsyncSession = None
+) -> list[int]:
+    """
+    creator_id가 다른 유저의 불판에 작성한 댓글들을 한 번의 DELETE 문으로 삭제하고,
+    삭제한 댓글마다 댓글이 달려 있던 장작의 id를 반환합니다.
+    """
+    others_articles = (
+        select(Article.id)
+        .join(Board, Board.id == Article.board_id)
+        .where(Board.creator_id != creator_id)
+    )
+    stmt = (
+        delete(Comment)
+        .where(
+            Comment.creator_id == creator_id,
+            Comment.article_id.in_(others_articles),
+        )
+        .returning(Comment.id, Comment.article_id)
+        .execution_options(synchronize_session=False)
+    )
+    res = await session.execute(stmt)
+
+    comments = res.all()
+    entity_cache.invalidate_many(Comment, (comment.id for comment in comments))
+    return [comment.article_id for comment in comments]
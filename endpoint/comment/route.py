@@ -2,11 +2,23 @@
 댓글과 관련된 모든 라우팅 경로 URL을 정의합니다.
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from endpoint.comment import service
 from endpoint.comment.entity import CommentCreate, CommentUpdate, CommentGet
 from endpoint.user.service import get_current_user
+from endpoint.article.service import get_article_version_by_id
+from data.db.pagination import NEXT_CURSOR_HEADER
+from data.etag import make_etag, conditional_response
+from data.serialization import (
+    NDJSON_MEDIA_TYPE,
+    FieldSelection,
+    dump_json,
+    iter_ndjson,
+    wants_ndjson,
+)
+from config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
 
 
 router = APIRouter(prefix="/comment")
@@ -38,11 +50,48 @@ async def get_comment(comment_id: int) -> CommentGet:
 
 
 @router.get("/article/{article_id}", response_model=list[CommentGet], tags=["Comment"])
-async def get_comments(article_id: int) -> list[CommentGet]:
+async def get_comments(
+    article_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = Depends(FieldSelection(CommentGet)),
+) -> list[CommentGet]:
     """
     장작에 달려있는 댓글 목록을 조회하는 라우팅 경로를 정의합니다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 전달합니다.
+    fields를 주면 그 필드들만 응답합니다.
+    Accept 헤더가 application/x-ndjson이면 limit 없이 커서 다음의 모든 댓글을 한 줄에 하나씩 스트리밍합니다.
+    If-None-Match가 장작의 ETag와 같으면 댓글을 불러오지 않고 304로 응답합니다.
     """
-    return await service.read_comments_by_article(article_id)
+    ndjson = wants_ndjson(request)
+    response.headers["Vary"] = "Accept"
+    version = await get_article_version_by_id(article_id)
+    etag = make_etag(
+        "comment-ndjson" if ndjson else "comment-list", article_id, version
+    )
+    if not_modified := conditional_response(request, response, etag):
+        return not_modified
+
+    if ndjson:
+        batches = await service.stream_comments_by_article(article_id, cursor, fields)
+        return StreamingResponse(
+            iter_ndjson(CommentGet, batches, fields),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=dict(response.headers),
+        )
+
+    comments, next_cursor = await service.read_comments_by_article(
+        article_id, version, limit, cursor, fields
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(
+        dump_json(list[CommentGet], comments, fields),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
 
 
 @router.put("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Comment"])
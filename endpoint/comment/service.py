@@ -2,13 +2,22 @@
 댓글과 관련된 작업을 수행할 때, 구체적인 동작을 정의합니다.
 """
 
+from collections import Counter
+from typing import AsyncIterator
+
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 
 import endpoint.comment.repository as repo
+from endpoint.comment.record import CommentRecord
 from data.db.models import Article, Comment
+from data.cache.response import response_cache
+from data.db.pagination import decode_cursor, paginate
+from data.singleflight import coalesced
 
-from endpoint.article.service import get_article_by_id
+from endpoint.article.service import get_article_by_id, record_comment_activity
+from endpoint.article.repository import bump_article_version, bump_article_versions
+from data.db.ownership import raise_not_owned
 
 
 async def create_new_comment(
@@ -26,6 +35,9 @@ async def create_new_comment(
         res = await repo.create_comment(
             {"content": content, "article_id": _article.id, "creator_id": user_id}
         )
+        await bump_article_version(_article.id)
+        await record_comment_activity(_article.board_id, 1)
+        response_cache.invalidate(f"article:{_article.id}")
         return res
     except IntegrityError as e:
         code: int = e.orig.pgcode
@@ -55,12 +67,31 @@ async def read_comment_by_id(comment_id: int) -> Article:
     return res
 
 
-async def read_comments_by_article(article_id: int) -> list[Article]:
+@coalesced
+async def read_comments_by_article(
+    article_id: int,
+    version: int | None,
+    limit: int,
+    cursor: str | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> tuple[list[CommentRecord], str | None]:
     """
     장작에 달려있는 댓글 목록을 조회할 때의 구체적인 동작을 정의합니다.
+    커서 다음부터 limit개를 불러오며, 다음 페이지의 커서를 함께 반환합니다.
+    fields가 주어지면 그 필드들만 데이터베이스에서 불러옵니다.
+    version은 호출한 쪽이 ETag를 만들 때 읽은 장작의 버전으로, 조회에는 쓰지 않고 합쳐지는 호출의 키에만 포함됩니다.
+    버전이 다른 호출끼리는 합쳐지지 않으므로, 쓰기 전에 시작된 조회의 결과를 쓰기 뒤의 ETag와 함께 응답하지 않습니다.
     """
+    kind = f"comment:{article_id}"
+    try:
+        before_id = decode_cursor(kind, cursor, int)[0] if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.") from e
+
     try:
-        res: list[Article] = await repo.get_comments_from_article(article_id)
+        res: list[CommentRecord] = await repo.get_comment_records_from_article(
+            article_id, limit=limit + 1, before_id=before_id, fields=fields
+        )
     except IntegrityError as e:
         code: int = e.orig.pgcode
         if code == 23503:
@@ -69,32 +100,67 @@ async def read_comments_by_article(article_id: int) -> list[Article]:
             status_code=500, detail=f"Unknown DB Error: {e.orig}"
         ) from e
 
-    return res
+    return paginate(res, limit, kind, lambda comment: [comment.id])
+
+
+async def stream_comments_by_article(
+    article_id: int, cursor: str | None = None, fields: tuple[str, ...] | None = None
+) -> AsyncIterator[list[CommentRecord]]:
+    """
+    장작에 달려있는 댓글 목록을 나누어 내보낼 때의 구체적인 동작을 정의합니다.
+    커서 다음의 모든 댓글을 STREAM_BATCH_SIZE개씩 데이터베이스에서 나누어 읽어 내보냅니다.
+    """
+    kind = f"comment:{article_id}"
+    try:
+        before_id = decode_cursor(kind, cursor, int)[0] if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.") from e
+
+    return repo.stream_comment_records_from_article(article_id, before_id, fields)
 
 
 async def update_comment(comment_id: int, content: str, user_id: int) -> None:
     """
     댓글을 수정할 때의 구체적인 동작을 정의합니다.
     """
-    original_comment = await repo.get_comment(comment_id)
-    if not original_comment:
-        raise HTTPException(status_code=400, detail="존재하지 않는 댓글입니다.")
-    if not original_comment.creator_id == user_id:
-        raise HTTPException(status_code=401, detail="권한이 없습니다.")
-
-    await repo.update_comment(
-        comment_id=original_comment.id, comment_req={"content": content}
+    article_id = await repo.update_comment(
+        comment_id=comment_id, comment_req={"content": content}, creator_id=user_id
     )
+    if article_id is None:
+        await raise_not_owned(Comment, comment_id, "존재하지 않는 댓글입니다.")
+
+    await bump_article_version(article_id)
+    response_cache.invalidate(f"article:{article_id}")
 
 
 async def delete_comment(comment_id: int, user_id: int) -> None:
     """
     댓글을 삭제할 때의 구체적인 동작을 정의합니다.
     """
-    original_comment = await repo.get_comment(comment_id)
-    if not original_comment:
-        raise HTTPException(status_code=400, detail="존재하지 않는 댓글입니다.")
-    if not original_comment.creator_id == user_id:
-        raise HTTPException(status_code=401, detail="권한이 없습니다.")
+    article_id = await repo.delete_comment(comment_id=comment_id, creator_id=user_id)
+    if article_id is None:
+        await raise_not_owned(Comment, comment_id, "존재하지 않는 댓글입니다.")
+
+    board_id = await bump_article_version(article_id)
+    if board_id is not None:
+        await record_comment_activity(board_id, -1)
+    response_cache.invalidate(f"article:{article_id}")
 
-    await repo.delete_comment(comment_id=original_comment.id)
+
+async def delete_comments_by_creator(user_id: int) -> None:
+    """
+    탈퇴하는 유저가 다른 유저의 불판에 작성한 댓글들을 삭제할 때의 구체적인 동작을 정의합니다.
+    댓글이 달려 있던 장작들의 버전을 올리고, 불판마다 한 번씩 댓글 수를 고칩니다.
+    """
+    article_ids = await repo.delete_comments_by_creator(user_id)
+    board_ids = await bump_article_versions(article_ids)
+
+    comments = Counter(
+        board_ids[article_id] for article_id in article_ids if article_id in board_ids
+    )
+    for board_id, count in comments.items():
+        await record_comment_activity(board_id, -count)
+    if board_ids:
+        response_cache.invalidate(
+            *(f"article:{article_id}" for article_id in board_ids)
+        )
@@ -0,0 +1,18 @@
+"""
+서버 내부 통계를 조회하는 라우팅 경로 URL을 정의합니다.
+"""
+
+from fastapi import APIRouter
+
+from data import metrics
+
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("/", tags=["Metrics"])
+async def get_metrics() -> dict:
+    """
+    캐시 적중률, 작업 풀 사용량 등 서버 내부 통계를 조회하는 라우팅 경로를 정의합니다.
+    """
+    return metrics.collect()
@@ -2,7 +2,7 @@
 유저의 입출력 형식(스키마)을 정의합니다.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class UnivVerify(BaseModel):
@@ -12,12 +12,8 @@ class UnivVerify(BaseModel):
 
     email: str = "email@email.com"
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserCreate(BaseModel):
@@ -31,12 +27,8 @@ class UserCreate(BaseModel):
     password1: str
     password2: str
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdate(BaseModel):
@@ -47,12 +39,8 @@ class UserUpdate(BaseModel):
     username: str
     email: str = "email@email.com"
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserGet(BaseModel):
@@ -64,12 +52,8 @@ class UserGet(BaseModel):
     username: str
     email: str = "email@email.com"
 
-    class Config:
-        """
-        SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
-        """
-
-        orm_mode = True
+    # SQLAlchemy의 ORM Model 형태의 데이터를 Pydantic 모델로 변환합니다.
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
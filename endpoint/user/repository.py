@@ -4,18 +4,25 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, update
-from data.db.database import Transactional
+from data.db.database import Transactional, Propagation
+from data.cache.entity import entity_cache
 from data.db.models import User
 
 
-@Transactional()
+@Transactional(Propagation.READ_ONLY)
 async def get_user(username: str, session: AsyncSession = None) -> User:
     """
     username을 바탕으로 유저 정보를 데이터베이스에서 가져와 반환합니다.
     """
+    user = entity_cache.get(User, username)
+    if user is not None:
+        return user
+
     stmt = select(User).where(User.username == username)
     result = await session.execute(stmt)
-    return result.scalars().first()
+    user = result.scalars().first()
+    entity_cache.set(User, username, user)
+    return user
 
 
 @Transactional()
@@ -27,8 +34,7 @@ async def create_user(user_req: dict, session: AsyncSession = None) -> None:
 
     session.add(_user)
 
-    await session.commit()
-    await session.refresh(_user)
+    await session.flush()
 
 
 @Transactional()
@@ -40,6 +46,7 @@ async def update_user(
     """
     stmt = update(User).where(User.username == username).values(**user_req)
     await session.execute(stmt)
+    entity_cache.invalidate(User, username)
 
 
 @Transactional()
@@ -49,3 +56,4 @@ async def delete_user(username: str, session: AsyncSession = None) -> None:
     """
     stmt = delete(User).where(User.username == username)
     await session.execute(stmt)
+    entity_cache.invalidate(User, username)
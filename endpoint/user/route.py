@@ -13,7 +13,6 @@ from endpoint.user.service import (
     delete_current_user,
 )
 from endpoint.user.entity import UnivVerify, UserGet, UserCreate, UserUpdate, Token
-from endpoint.user.repository import User
 
 
 router = APIRouter(prefix="/user")
@@ -57,7 +56,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
 
 
 @router.get("/me", response_model=UserGet, tags=["User"])
-async def get_user_me(user: User = Depends(get_current_user)) -> UserGet:
+async def get_user_me(user: UserGet = Depends(get_current_user)) -> UserGet:
     """
     로그인한 유저의 정보를 반환합니다.
     """
@@ -66,7 +65,7 @@ async def get_user_me(user: User = Depends(get_current_user)) -> UserGet:
 
 @router.put("/{username}", tags=["User"])
 async def update_user(
-    _user_update: UserUpdate, user: User = Depends(get_current_user)
+    _user_update: UserUpdate, user: UserGet = Depends(get_current_user)
 ) -> None:
     """
     유저의 정보를 수정할 때의 라우팅 경로를 정의합니다.
@@ -79,7 +78,7 @@ async def update_user(
 
 
 @router.delete("/{username}", tags=["User"])
-async def delete_user(user: User = Depends(get_current_user)) -> None:
+async def delete_user(user: UserGet = Depends(get_current_user)) -> None:
     """
     유저를 삭제할 때의 라우팅 경로를 정의합니다.
     """
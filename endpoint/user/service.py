@@ -2,49 +2,54 @@
 유저와 관련된 작업을 수행할 때, 구체적인 동작을 정의합니다.
 """
 
+import time
 from datetime import datetime, timedelta
 
 from jose import jwt, JWTError
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from sqlalchemy.exc import IntegrityError
 
 from endpoint.user.repository import get_user, create_user, update_user, delete_user
+from endpoint.user.entity import UserGet
+from endpoint.user.password import password_hasher
+from endpoint.user.univcert import univcert_client
+from endpoint.article.service import delete_articles_by_creator
+from endpoint.board.service import delete_boards_by_user
+from endpoint.comment.service import delete_comments_by_creator
+from data.bus import invalidation_bus
+from data.cache.lru import LRUCache
 from data.db.models import User
 
-from config import CREDENTIAL_SECRET_KEY, CREDENTIAL_ALGORITHM, UNIVCERT_API_KEY
+from config import (
+    CREDENTIAL_SECRET_KEY,
+    CREDENTIAL_ALGORITHM,
+    TOKEN_CACHE_SIZE,
+    TOKEN_CACHE_TTL_SECONDS,
+)
 
 import requests
 
-import aiohttp
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/user/login")
 
-univcert_url = "https://univcert.com/api/v1/"
+# 토큰 -> 검증된 유저 정보(UserGet). 유저명으로 태그를 달아 유저 정보가 바뀌면 한꺼번에 무효화합니다.
+token_cache = LRUCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+
 
+def _purge_token_tags(tags: list) -> None:
+    for tag in tags:
+        token_cache.purge_tag(tag)
 
-async def fetch(url, json):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=json) as response:
-            return await response.json()
+
+invalidation_bus.subscribe("token", _purge_token_tags, reset=token_cache.clear)
 
 
 async def verify_univ(email: str) -> None:
     """
     유저의 대학교 이메일에 인증 코드를 전송할 때의 구체적인 동작을 정의합니다.
     """
-    result = await fetch(
-        univcert_url + "certify",
-        {
-            "key": UNIVCERT_API_KEY,
-            "email": email,
-            "univName": "서울대학교",
-            "univ_check": True,
-        },
-    )
+    result = await univcert_client.certify(email, "서울대학교")
 
     if result["success"] == False:
         raise HTTPException(status_code=400, detail=result["message"])
@@ -61,15 +66,7 @@ async def register_user(
     if password1 != password2:
         raise HTTPException(status_code=400, detail="비밀번호가 일치하지 않습니다.")
 
-    result = await fetch(
-        univcert_url + "certifycode",
-        {
-            "key": UNIVCERT_API_KEY,
-            "email": email,
-            "univName": "서울대학교",
-            "code": verification_code,
-        },
-    )
+    result = await univcert_client.certify_code(email, "서울대학교", verification_code)
     if result["success"] == False:
         raise HTTPException(status_code=400, detail=result["message"])
 
@@ -78,12 +75,12 @@ async def register_user(
             {
                 "username": username,
                 "email": email,
-                "password": pwd_context.hash(password1),
+                "password": await password_hasher.hash(password1),
             }
         )
 
     except IntegrityError as e:
-        await fetch(univcert_url + "clear/" + email, {"key": UNIVCERT_API_KEY})
+        await univcert_client.clear(email)
         code: int = int(e.orig.pgcode)
         if code == 23505:
             raise HTTPException(
@@ -117,7 +114,7 @@ async def verify_user(username, password) -> str:
     """
     user = await get_user_by_username(username)
 
-    if not user or not pwd_context.verify(password, user.password):
+    if not user or not await password_hasher.verify(password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -135,10 +132,24 @@ async def verify_user(username, password) -> str:
     return access_token
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+def invalidate_user_tokens(username: str) -> None:
+    """
+    username 유저에 대해 캐시된 토큰 검증 결과를 모두 제거합니다.
+    커밋된 뒤에는 다른 프로세스에 캐시된 검증 결과도 제거합니다.
+    """
+    token_cache.purge_tag(f"user:{username}")
+    invalidation_bus.publish_on_commit("token", [f"user:{username}"])
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserGet:
     """
     현재 로그인한 유저의 정보를 jwt 토큰을 바탕으로 불러옵니다.
+    한 번 검증한 토큰은 캐시하여, 같은 토큰으로 들어온 요청은 디코딩과 유저 조회를 생략합니다.
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -159,7 +170,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     if user is None:
         raise credentials_exception
 
-    return user
+    principal = UserGet.model_validate(user, from_attributes=True)
+
+    ttl = TOKEN_CACHE_TTL_SECONDS
+    if payload.get("exp") is not None:
+        ttl = min(ttl, payload["exp"] - time.time())
+    token_cache.set(token, principal, ttl=ttl, tags=(f"user:{username}",))
+
+    return principal
 
 
 async def update_current_user(
@@ -173,6 +191,7 @@ async def update_current_user(
             username=username_original,
             user_req={"username": username_to_update, "email": email_to_update},
         )
+        invalidate_user_tokens(username_original)
     except IntegrityError as e:
         code: int = int(e.orig.pgcode)
         if code == 23505:
@@ -190,11 +209,17 @@ async def delete_current_user(username: str) -> None:
     """
     현재 존재하는 유저를 삭제할 때의 구체적인 동작을 정의합니다.
     UNIVCERT 인증 또한 초기화 합니다.
+    유저가 작성한 불판, 장작, 댓글을 ON DELETE CASCADE에 맡기지 않고 같은 트랜잭션에서 먼저 삭제하여,
+    다른 유저의 불판에 남는 장작 수, 댓글 수, 최상위 장작 기록과 버전을 함께 고칩니다.
     """
     try:
         user = await get_user_by_username(username)
-        await fetch(univcert_url + "clear/" + user.email, {"key": UNIVCERT_API_KEY})
+        await univcert_client.clear(user.email)
+        await delete_comments_by_creator(user.id)
+        await delete_articles_by_creator(user.id)
+        await delete_boards_by_user(user.id)
         await delete_user(username)
+        invalidate_user_tokens(username)
     except IntegrityError as e:
         code: int = int(e.orig.pgcode)
         if code == 23503:
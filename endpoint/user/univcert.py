@@ -0,0 +1,219 @@
+"""
+대학교 이메일 인증 서비스(UNIVCERT)와 통신하는 HTTP 클라이언트를 정의합니다.
+서버가 떠 있는 동안 하나의 커넥션 풀을 재사용하며, 호출마다 시간 제한과 동시 호출 수 제한을 적용합니다.
+"""
+
+import asyncio
+import time
+
+import aiohttp
+from fastapi import HTTPException, status
+
+from data import metrics
+from data.singleflight import SingleFlight
+from config import (
+    UNIVCERT_API_KEY,
+    UNIVCERT_URL,
+    UNIVCERT_TIMEOUT_SECONDS,
+    UNIVCERT_MAX_CONNECTIONS,
+    UNIVCERT_MAX_CONCURRENCY,
+    UNIVCERT_FAILURE_THRESHOLD,
+    UNIVCERT_RESET_SECONDS,
+)
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 일정 횟수를 넘으면 일정 시간 동안 호출을 차단합니다.
+    차단 시간이 지나면 한 번의 시험 호출을 허용하고, 성공하면 차단을 해제합니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            return True
+        if self.state == self.HALF_OPEN:
+            # 시험 호출이 진행 중인 동안에는 다른 호출을 차단합니다.
+            self.rejected += 1
+            return False
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_aborted(self) -> None:
+        """
+        호출이 취소되는 등 성공도 실패도 아닌 채로 끝났을 때 호출합니다.
+        시험 호출이었으면 차단 상태로 되돌리되 차단 시작 시각은 그대로 두어, 다음 호출이 바로 다시 시험하도록 합니다.
+        """
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+class UnivCertClient:
+    """
+    UNIVCERT API 호출을 담당합니다.
+    start()와 close()는 FastAPI의 lifespan(startup/shutdown)에서 호출합니다.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float,
+        max_connections: int,
+        max_concurrency: int,
+        breaker: CircuitBreaker,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.breaker = breaker
+        self.max_concurrency = max_concurrency
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._certify_flight = SingleFlight()
+
+    async def start(self) -> aiohttp.ClientSession:
+        """
+        커넥션 풀을 가진 세션을 만듭니다. 세션은 만들어진 이벤트 루프에서만 사용할 수 있으므로,
+        다른 이벤트 루프에서 호출되면 그 루프에서 사용할 세션을 새로 만듭니다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def post(self, path: str, json: dict, timeout: float | None = None) -> dict:
+        """
+        path로 json을 POST하고 응답 본문을 반환합니다.
+        인증 서버에 연결할 수 없거나 차단 중이면 503 에러를 발생시킵니다.
+        """
+        if not self.breaker.allow():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="인증 서버를 일시적으로 사용할 수 없습니다.",
+            )
+
+        session = await self.start()
+        call_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+        try:
+            async with self._semaphore:
+                async with session.post(
+                    self.base_url + path, json=json, timeout=call_timeout
+                ) as response:
+                    if response.status >= 500:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                        )
+                    result = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.breaker.record_failure()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="인증 서버에 연결할 수 없습니다.",
+            ) from e
+        except BaseException:
+            # 취소(CancelledError)나 예상하지 못한 예외로 끝나도 시험 호출 상태(HALF_OPEN)에 머물지 않도록 합니다.
+            self.breaker.record_aborted()
+            raise
+
+        self.breaker.record_success()
+        return result
+
+    async def certify(self, email: str, univ_name: str) -> dict:
+        """
+        인증 코드를 전송합니다. 같은 이메일로 동시에 들어온 요청은 한 번만 전송합니다.
+        """
+        return await self._certify_flight.do(
+            ("certify", email, univ_name),
+            self.post,
+            "certify",
+            {
+                "key": UNIVCERT_API_KEY,
+                "email": email,
+                "univName": univ_name,
+                "univ_check": True,
+            },
+        )
+
+    async def certify_code(self, email: str, univ_name: str, code: int) -> dict:
+        """
+        인증 코드가 유효한지 확인합니다.
+        """
+        return await self.post(
+            "certifycode",
+            {
+                "key": UNIVCERT_API_KEY,
+                "email": email,
+                "univName": univ_name,
+                "code": code,
+            },
+        )
+
+    async def clear(self, email: str) -> dict:
+        """
+        이메일의 인증 기록을 초기화합니다.
+        """
+        return await self.post("clear/" + email, {"key": UNIVCERT_API_KEY})
+
+    def stats(self) -> dict:
+        return {
+            "breaker": self.breaker.stats(),
+            "certify_singleflight": self._certify_flight.stats(),
+        }
+
+
+univcert_client = UnivCertClient(
+    base_url=UNIVCERT_URL,
+    timeout=UNIVCERT_TIMEOUT_SECONDS,
+    max_connections=UNIVCERT_MAX_CONNECTIONS,
+    max_concurrency=UNIVCERT_MAX_CONCURRENCY,
+    breaker=CircuitBreaker(
+        failure_threshold=UNIVCERT_FAILURE_THRESHOLD,
+        reset_seconds=UNIVCERT_RESET_SECONDS,
+    ),
+)
+metrics.register("univcert", univcert_client.stats)
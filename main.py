@@ -1,10 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from data.db.database import UnitOfWorkMiddleware
+from data.cache.response import ResponseCacheMiddleware, response_cache
+from data.bus import invalidation_bus
+
 from endpoint.user.route import router as user_router
 from endpoint.board.route import router as board_router
 from endpoint.article.route import router as article_router
 from endpoint.comment.route import router as comment_router
+from endpoint.metrics.route import router as metrics_router
+from endpoint.user.password import password_hasher
+from endpoint.user.univcert import univcert_client
 
 tags_metadata = [
     {
@@ -23,6 +30,10 @@ tags_metadata = [
         "name": "Comment",
         "description": "댓글과 관련된 API 엔드포인트를 정의합니다.",
     },
+    {
+        "name": "Metrics",
+        "description": "서버 내부 통계와 관련된 API 엔드포인트를 정의합니다.",
+    },
 ]
 
 
@@ -32,24 +43,42 @@ app = FastAPI(
     openapi_tags=tags_metadata,
 )
 
+# 나중에 추가한 미들웨어가 바깥쪽에서 먼저 실행됩니다. (CORS -> 응답 캐시 -> 작업 단위)
+app.add_middleware(UnitOfWorkMiddleware)
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cache=response_cache,
+    rules=[
+        ("/board/", ("boards",)),
+        ("/board/{board_id}", ("board:{board_id}",)),
+        ("/article/{article_id}", ("article:{article_id}",)),
+    ],
+)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.include_router(user_router)
 app.include_router(board_router)
 app.include_router(article_router)
 app.include_router(comment_router)
+app.include_router(metrics_router)
 
 
 @app.on_event("startup")
 async def startup():
+    await univcert_client.start()
+    await invalidation_bus.start()
     print("APP STARTUP")
 
 
 @app.on_event("shutdown")
 async def shutdown():
+    password_hasher.shutdown()
+    await univcert_client.close()
+    await invalidation_bus.close()
     print("APP SHUTDOWN")
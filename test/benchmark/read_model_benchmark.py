@@ -0,0 +1,95 @@
+"""
+불판의 장작 목록을 ORM 객체로 조회할 때와 ArticleRecord로 조회할 때의 시간과 메모리를 비교합니다.
+메모리 SQLite 데이터베이스를 사용하며, pytest로 수집되지 않습니다. 저장소 최상위에서 다음과 같이 실행합니다.
+
+    python -m test.benchmark.read_model_benchmark
+"""
+
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from data.db.models import Article, Base
+from endpoint.article.repository import get_article_records_from_board
+
+SIZES = (1000, 10000)
+REPEAT = 3
+
+
+async def _setup(engine, size: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Article),
+            [
+                {
+                    "id": i,
+                    "name": f"장작 {i}",
+                    "content": "내용 " * 20,
+                    "creator_id": 1,
+                    "board_id": 1,
+                    "path": f"/{i:08d}",
+                    "path_logical": "ROOT",
+                }
+                for i in range(1, size + 1)
+            ],
+        )
+
+
+async def _get_articles_from_board(board_id: int, session) -> list[Article]:
+    """
+    비교를 위해 같은 장작들을 ORM 객체로 조회합니다.
+    """
+    stmt = (
+        select(Article)
+        .where(Article.board_id == board_id)
+        .order_by(Article.path_key.desc())
+    )
+    result = await session.execute(stmt)
+
+    return result.scalars().all()
+
+
+async def _measure(session_factory, load, size: int) -> tuple[float, float]:
+    """
+    장작 하나당 조회 시간(µs)과, 조회한 결과를 들고 있는 동안의 메모리(byte)를 반환합니다.
+    """
+    best = float("inf")
+    retained = 0
+    for _ in range(REPEAT):
+        async with session_factory() as session:
+            gc.collect()
+            tracemalloc.start()
+            started_at = time.perf_counter()
+            articles = await load(1, session=session)
+            elapsed = time.perf_counter() - started_at
+            retained = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert len(articles) == size
+            del articles
+        best = min(best, elapsed)
+    return best / size * 1_000_000, retained / size
+
+
+async def main() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    print(f"{'방식':<34}{'장작 수':>8}{'시간/장작':>12}{'메모리/장작':>12}")
+    for size in SIZES:
+        await _setup(engine, size)
+        for name, load in (
+            ("ORM (select(Article))", _get_articles_from_board),
+            ("ArticleRecord (Core 조회)", get_article_records_from_board),
+        ):
+            cost, memory = await _measure(session_factory, load, size)
+            print(f"{name:<34}{size:>8}{cost:>10.2f}µs{memory:>10.0f}B")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+목록 조회 응답의 직렬화 비용을 장작 하나당 시간(µs)으로 비교합니다.
+pytest로 수집되지 않으며, 저장소 최상위에서 다음과 같이 실행합니다.
+
+    python -m test.benchmark.serialization_benchmark
+"""
+
+import asyncio
+import json
+import time
+import warnings
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel, constr
+
+from data.db.models import Article
+from data.serialization import _adapter, row_encoder
+from endpoint.article.entity import ArticleGet
+from endpoint.article.tree_cache import ArticleRecord
+
+SIZES = (100, 1000, 10000)
+REPEAT = 5
+
+_loop = asyncio.new_event_loop()
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+
+    class LegacyArticleGet(BaseModel):
+        """
+        변경 전의 ArticleGet입니다. v1 형식의 orm_mode 설정을 사용합니다.
+        """
+
+        id: int
+        name: str
+        content: str
+        creator_id: int
+        path: str
+        path_logical: constr(to_upper=True)
+
+        class Config:
+            orm_mode = True
+
+
+def _articles(size: int) -> list[Article]:
+    return [
+        Article(
+            id=i,
+            name=f"장작 {i}",
+            content="내용 " * 20,
+            creator_id=i % 10,
+            board_id=1,
+            path=f"/1/{i}",
+            path_logical="ROOT/AGREE",
+        )
+        for i in range(1, size + 1)
+    ]
+
+
+def _fastapi_response_model(articles: list) -> bytes:
+    """
+    response_model=list[ArticleGet]으로 반환하던 때와 같이, FastAPI가 검증한 뒤 json.dumps로 인코딩합니다.
+    """
+    field = create_response_field("response", list[LegacyArticleGet])
+    content = _loop.run_until_complete(
+        serialize_response(field=field, response_content=articles)
+    )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def _type_adapter(articles: list) -> bytes:
+    adapter = _adapter(list[ArticleGet])
+    return adapter.dump_json(adapter.validate_python(articles, from_attributes=True))
+
+
+def _row_encoder(articles: list) -> bytes:
+    return row_encoder(ArticleGet).encode(articles)
+
+
+def _measure(func, articles: list) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        started_at = time.perf_counter()
+        func(articles)
+        best = min(best, time.perf_counter() - started_at)
+    return best / len(articles) * 1_000_000
+
+
+def main() -> None:
+    cases = [
+        ("FastAPI response_model (이전)", _fastapi_response_model),
+        ("TypeAdapter", _type_adapter),
+        ("RowEncoder", _row_encoder),
+    ]
+    print(f"{'방식':<32}{'행 종류':<16}" + "".join(f"{size:>10}" for size in SIZES))
+    for name, func in cases:
+        for kind, make in (
+            ("ORM", _articles),
+            (
+                "ArticleRecord",
+                lambda size: list(map(ArticleRecord.from_article, _articles(size))),
+            ),
+        ):
+            costs = [_measure(func, make(size)) for size in SIZES]
+            print(
+                f"{name:<32}{kind:<16}" + "".join(f"{cost:>8.2f}µs" for cost in costs)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,23 @@ import os
 import httpx
 import pytest
 import asyncio
+import threading
 from datetime import datetime, timedelta
 from jose import jwt
 
 import pytest_asyncio
+from aiohttp import web
 from asgi_lifespan import LifespanManager
 
 from fastapi import FastAPI
 from main import app
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
 
 
 from data.db import database
 from data.db.models import User, Base
+from endpoint.user.univcert import univcert_client
 
 from test.utils.common import random_lower_string
 
@@ -63,11 +67,16 @@ async def db(event_loop) -> dict:
 
 @pytest_asyncio.fixture
 async def test_headers(db):
-    user = User(username=TEST_USERNAME, email=TEST_USERMAIL, password=TEST_PASSWORD)
     async with db["session"]() as session:
-        session.add(user)
-        await session.commit()
-        await session.refresh(user)
+        stmt = select(User).where(User.username == TEST_USERNAME)
+        user = (await session.execute(stmt)).scalars().first()
+        if user is None:
+            user = User(
+                username=TEST_USERNAME, email=TEST_USERMAIL, password=TEST_PASSWORD
+            )
+            session.add(user)
+            await session.commit()
+            await session.refresh(user)
 
     payload = {
         "sub": user.username,
@@ -79,3 +88,82 @@ async def test_headers(db):
     )
 
     yield {"Authorization": f"Bearer {access_token}"}
+
+
+class CapturedStatements(list):
+    """
+    실행된 SQL 문 목록입니다. by_engine에는 같은 문들이 실행된 엔진별로 나뉘어 담깁니다.
+    """
+
+    def __init__(self, engines):
+        super().__init__()
+        self.by_engine = {engine: [] for engine in engines}
+
+    def clear(self) -> None:
+        super().clear()
+        for statements in self.by_engine.values():
+            statements.clear()
+
+
+@pytest.fixture
+def captured_statements() -> CapturedStatements:
+    """
+    기본 데이터베이스와 읽기 전용 데이터베이스에서 실행되는 SQL 문을 모아 반환합니다.
+    테스트가 끝나면 모으기를 멈춥니다.
+    """
+    engines = dict.fromkeys((database.engine, database.read_engine))
+    statements = CapturedStatements(engines)
+
+    def _capturer(engine):
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+            statements.by_engine[engine].append(statement)
+
+        return _capture
+
+    captures = {engine: _capturer(engine) for engine in engines}
+    for engine, capture in captures.items():
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+
+    yield statements
+
+    for engine, capture in captures.items():
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+@pytest.fixture
+def univcert_server(monkeypatch) -> list:
+    """
+    univcert.com 대신 사용할 로컬 서버를 별도 스레드에서 띄우고, 서버가 받은 요청 본문 목록을 반환합니다.
+    fail로 시작하는 이메일에는 실패 응답을 보냅니다.
+    """
+    received = []
+
+    async def _handle(request: web.Request) -> web.Response:
+        body = await request.json()
+        received.append(body)
+        await asyncio.sleep(0.05)
+        if body.get("email", "").startswith("fail"):
+            return web.json_response({"success": False, "message": "failed"})
+        return web.json_response({"success": True})
+
+    stand_in = web.Application()
+    stand_in.router.add_post("/{path:.*}", _handle)
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(stand_in)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(univcert_client, "base_url", f"http://127.0.0.1:{port}/")
+
+    yield received
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
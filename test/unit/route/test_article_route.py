@@ -0,0 +1,653 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import update
+from sqlalchemy import inspect as sa_inspect
+
+from data.cache.entity import entity_cache
+from data.db import database
+from data.db.models import Article
+from data.singleflight import _read_flights
+from endpoint.article import service
+from endpoint.article.record import ArticleRecord
+from endpoint.article.segment import (
+    SharedArticleTreeCache,
+    SegmentBoardArticles,
+    encode_board,
+)
+from endpoint.article.tree_cache import BoardArticles
+
+
+@pytest_asyncio.fixture
+async def test_board(test_client: AsyncClient, test_headers: dict) -> dict:
+    response = await test_client.post(
+        "/board/",
+        json={"name": "article test", "description": "article test"},
+        headers=test_headers,
+    )
+    yield response.json()
+
+
+@pytest.mark.asyncio
+async def test_create_article(
+    test_client: AsyncClient, test_headers: dict, test_board: dict
+):
+    response = await test_client.post(
+        f"/article/{test_board['id']}",
+        json={"name": "root", "content": "root"},
+        headers=test_headers,
+    )
+    root = response.json()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert root["path"] == f"/{root['id']}"
+
+    response = await test_client.post(
+        f"/article/{test_board['id']}/{root['id']}",
+        json={"logic": "AGREE", "name": "child", "content": "child"},
+        headers=test_headers,
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await test_client.get(f"/article/list/{test_board['id']}")
+    child = response.json()[0]
+
+    assert child["path"] == f"{root['path']}/{child['id']}"
+    assert child["path_logical"] == "ROOT/AGREE"
+
+
+@pytest_asyncio.fixture
+async def test_tree(test_client: AsyncClient, test_headers: dict, test_board: dict):
+    """
+    root - a - b - c 형태의 장작 4개를 만들고, 만들어진 장작 목록을 root부터 반환합니다.
+    """
+    response = await test_client.post(
+        f"/article/{test_board['id']}",
+        json={"name": "root", "content": "root"},
+        headers=test_headers,
+    )
+    parent = response.json()
+    for name in ["a", "b", "c"]:
+        await test_client.post(
+            f"/article/{test_board['id']}/{parent['id']}",
+            json={"logic": "AGREE", "name": name, "content": name},
+            headers=test_headers,
+        )
+        response = await test_client.get(f"/article/{parent['id']}/children")
+        parent = response.json()[0]
+
+    response = await test_client.get(f"/article/list/{test_board['id']}")
+    yield sorted(response.json(), key=lambda article: len(article["path"]))
+
+
+@pytest.mark.asyncio
+async def test_get_article_subtree(test_client: AsyncClient, test_tree: list):
+    root, a, b, c = test_tree
+
+    response = await test_client.get(f"/article/{a['id']}/subtree")
+    assert [article["id"] for article in response.json()] == [c["id"], b["id"], a["id"]]
+
+    response = await test_client.get(f"/article/{a['id']}/subtree?depth=1")
+    assert [article["id"] for article in response.json()] == [b["id"], a["id"]]
+
+
+@pytest.mark.asyncio
+async def test_get_article_ancestors(test_client: AsyncClient, test_tree: list):
+    root, a, b, c = test_tree
+
+    response = await test_client.get(f"/article/{c['id']}/ancestors")
+
+    assert [article["id"] for article in response.json()] == [
+        root["id"],
+        a["id"],
+        b["id"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_article_subtree_without_loading_board(
+    test_client: AsyncClient,
+    test_board: dict,
+    test_tree: list,
+    captured_statements: list,
+):
+    root, a, b, c = test_tree
+    service.board_cache.discard(test_board["id"])
+    captured_statements.clear()
+
+    subtree = await test_client.get(f"/article/{a['id']}/subtree?depth=1")
+    children = await test_client.get(f"/article/{a['id']}/children")
+    ancestors = await test_client.get(f"/article/{c['id']}/ancestors")
+
+    assert [article["id"] for article in subtree.json()] == [b["id"], a["id"]]
+    assert [article["id"] for article in children.json()] == [b["id"]]
+    assert [article["id"] for article in ancestors.json()] == [
+        root["id"],
+        a["id"],
+        b["id"],
+    ]
+    assert not any(
+        "article.board_id = " in statement for statement in captured_statements
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_article_tree(
+    test_client: AsyncClient, test_board: dict, test_tree: list, monkeypatch
+):
+    root, a, b, c = test_tree
+
+    response = await test_client.get(f"/article/tree/{test_board['id']}")
+    tree = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [node["id"] for node in tree] == [root["id"]]
+    node = tree[0]
+    for article in [a, b, c]:
+        node = node["children"]["AGREE"][0]
+        assert node["id"] == article["id"]
+    assert node["children"] == {}
+
+    monkeypatch.setattr("endpoint.article.route.ARTICLE_TREE_STREAM_THRESHOLD", 0)
+    response = await test_client.get(f"/article/tree/{test_board['id']}")
+
+    assert response.json() == tree
+
+
+@pytest.mark.asyncio
+async def test_get_article_list_with_cursor(
+    test_client: AsyncClient, test_board: dict, test_tree: list
+):
+    response = await test_client.get(f"/article/list/{test_board['id']}?limit=3")
+    first_page = response.json()
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await test_client.get(
+        f"/article/list/{test_board['id']}?limit=3&cursor={cursor}"
+    )
+
+    assert len(first_page) == 3
+    assert response.json() == [test_tree[0]]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_get_article_list_not_modified(
+    test_client: AsyncClient, test_headers: dict, test_board: dict, test_tree: list
+):
+    root = test_tree[0]
+    url = f"/article/list/{test_board['id']}"
+
+    response = await test_client.get(url)
+    etag = response.headers["etag"]
+
+    response = await test_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+    await test_client.put(
+        f"/article/{root['id']}",
+        json={"name": "root", "content": "edited"},
+        headers=test_headers,
+    )
+
+    response = await test_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_get_article_uses_entity_cache(
+    test_client: AsyncClient,
+    test_headers: dict,
+    test_tree: list,
+    captured_statements: list,
+):
+    root = test_tree[0]
+
+    await test_client.get(f"/article/{root['id']}")
+    captured_statements.clear()
+    response = await test_client.get(f"/article/{root['id']}")
+
+    assert response.json()["name"] == "root"
+    assert not any("article.content" in statement for statement in captured_statements)
+
+    await test_client.put(
+        f"/article/{root['id']}",
+        json={"name": "root", "content": "edited"},
+        headers=test_headers,
+    )
+    response = await test_client.get(f"/article/{root['id']}")
+    assert response.json()["content"] == "edited"
+
+    response = await test_client.get("/metrics/")
+    assert response.json()["entity_cache"]["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_get_article_list_from_memory(
+    test_client: AsyncClient,
+    test_headers: dict,
+    test_board: dict,
+    test_tree: list,
+    captured_statements: list,
+):
+    root, a, b, c = test_tree
+    await test_client.post(
+        f"/article/{test_board['id']}/{a['id']}",
+        json={"logic": "DISAGREE", "name": "d", "content": "d"},
+        headers=test_headers,
+    )
+    await test_client.delete(f"/article/{c['id']}", headers=test_headers)
+
+    captured_statements.clear()
+    response = await test_client.get(f"/article/list/{test_board['id']}")
+    subtree = await test_client.get(f"/article/{a['id']}/subtree?depth=1")
+
+    names = {article["name"] for article in response.json()}
+    assert names == {"root", "a", "b", "d"}
+    assert {article["name"] for article in subtree.json()} == {"a", "b", "d"}
+    assert not any(
+        "ORDER BY article.path" in statement for statement in captured_statements
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_article_list_coalesced(
+    test_client: AsyncClient, test_board: dict, test_tree: list, monkeypatch
+):
+    monkeypatch.setattr(database.read_your_writes, "seconds", 0)
+    service.board_cache.discard(test_board["id"])
+
+    responses = await asyncio.gather(
+        *(test_client.get(f"/article/list/{test_board['id']}") for _ in range(5))
+    )
+
+    bodies = {response.content for response in responses}
+    assert len(bodies) == 1
+    assert {article["name"] for article in responses[0].json()} == {
+        "root",
+        "a",
+        "b",
+        "c",
+    }
+
+    response = await test_client.get("/metrics/")
+    flights = response.json()["read_singleflight"]
+    assert flights["get_article_list_by_board_id"]["shared"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_get_article_list_not_coalesced_across_versions(
+    test_client: AsyncClient, test_board: dict, test_tree: list
+):
+    """
+    불판의 버전이 다른 호출은 하나의 조회를 공유하지 않습니다.
+    """
+    version = await service.get_board_version(test_board["id"])
+    flight = _read_flights["get_article_list_by_board_id"]
+    executions, shared = flight.executions, flight.shared
+
+    await asyncio.gather(
+        service.get_article_list_by_board_id(test_board["id"], version),
+        service.get_article_list_by_board_id(test_board["id"], version + 1),
+    )
+
+    assert flight.executions - executions == 2
+    assert flight.shared == shared
+
+
+@pytest.mark.asyncio
+async def test_get_article_list_with_fields(
+    test_client: AsyncClient,
+    test_board: dict,
+    test_tree: list,
+    captured_statements: list,
+):
+    service.board_cache.discard(test_board["id"])
+    captured_statements.clear()
+
+    response = await test_client.get(
+        f"/article/list/{test_board['id']}?fields=name,path,path_logical"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert all(
+        article.keys() == {"name", "path", "path_logical"}
+        for article in response.json()
+    )
+    assert {article["name"] for article in response.json()} == {"root", "a", "b", "c"}
+    assert not any("article.content" in statement for statement in captured_statements)
+
+    response = await test_client.get(
+        f"/article/list/{test_board['id']}?fields=name,password"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_article_list_as_ndjson(
+    test_client: AsyncClient, test_board: dict, test_tree: list
+):
+    url = f"/article/list/{test_board['id']}"
+    headers = {"Accept": "application/x-ndjson"}
+
+    service.board_cache.discard(test_board["id"])
+    from_db = await test_client.get(url, headers=headers)
+    await test_client.get(url)
+    from_memory = await test_client.get(url, headers=headers)
+
+    for response in (from_db, from_memory):
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert from_db.text == from_memory.text
+    assert [json.loads(line)["name"] for line in from_db.text.splitlines()] == [
+        article["name"] for article in reversed(test_tree)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_article_tree_in_shared_segment(
+    test_client: AsyncClient,
+    test_headers: dict,
+    test_board: dict,
+    test_tree: list,
+    tmp_path,
+    monkeypatch,
+):
+    shared = SharedArticleTreeCache(str(tmp_path), max_boards=4)
+    monkeypatch.setattr(service, "board_cache", shared)
+    root, a, b, c = test_tree
+
+    response = await test_client.get(f"/article/list/{test_board['id']}")
+    assert [article["id"] for article in response.json()] == [
+        c["id"],
+        b["id"],
+        a["id"],
+        root["id"],
+    ]
+    assert (tmp_path / f"board-{test_board['id']}.seg").exists()
+
+    await test_client.post(
+        f"/article/{test_board['id']}/{a['id']}",
+        json={"logic": "NEUTRAL", "name": "한글", "content": "d"},
+        headers=test_headers,
+    )
+    response = await test_client.get(f"/article/{a['id']}/subtree?depth=1")
+    assert {article["name"] for article in response.json()} == {"a", "b", "한글"}
+
+    response = await test_client.get(f"/article/{c['id']}/ancestors")
+    assert [article["id"] for article in response.json()] == [
+        root["id"],
+        a["id"],
+        b["id"],
+    ]
+    assert shared.stats()["publishes"] == 2
+
+
+def test_shared_segment_evicts_least_recently_used(tmp_path):
+    shared = SharedArticleTreeCache(str(tmp_path), max_boards=4, max_files=2)
+
+    def _records(board_id: int) -> list[ArticleRecord]:
+        return [
+            ArticleRecord(board_id, "root", "root", 1, board_id, f"/{board_id}", "ROOT")
+        ]
+
+    for board_id in (1, 2):
+        shared.load(board_id, 1, _records(board_id))
+    # 불판 2의 세그먼트를 오래전에 마지막으로 쓴 것으로 만들고, 불판 1의 세그먼트는 지금 씁니다.
+    segment = tmp_path / "board-2.seg"
+    mtime_ns = segment.stat().st_mtime_ns
+    os.utime(segment, ns=(0, mtime_ns))
+    os.utime(tmp_path / "board-1.seg", ns=(0, mtime_ns))
+    assert shared.get(1, 1) is not None
+
+    shared.load(3, 1, _records(3))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "board-1.seg",
+        "board-3.seg",
+    ]
+    assert shared.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_move_article_subtree(
+    test_client: AsyncClient, test_headers: dict, test_board: dict, test_tree: list
+):
+    root, a, b, c = test_tree
+    await test_client.get(f"/article/list/{test_board['id']}")
+
+    response = await test_client.put(
+        f"/article/{b['id']}/parent/{root['id']}", headers=test_headers
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    moved_c = (await test_client.get(f"/article/{c['id']}")).json()
+    assert moved_c["path"] == f"{root['path']}/{b['id']}/{c['id']}"
+    assert moved_c["path_logical"] == "ROOT/AGREE/AGREE"
+
+    children = (await test_client.get(f"/article/{root['id']}/children")).json()
+    assert {article["id"] for article in children} == {a["id"], b["id"]}
+
+    service.board_cache.discard(test_board["id"])
+    from_db = (await test_client.get(f"/article/{b['id']}/subtree")).json()
+    assert [article["id"] for article in from_db] == [c["id"], b["id"]]
+
+    response = await test_client.put(
+        f"/article/{root['id']}/parent/{c['id']}", headers=test_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = await test_client.put(
+        f"/article/{b['id']}/parent/{c['id']}", headers=test_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_move_article_conflicts_with_concurrent_move(
+    test_client: AsyncClient,
+    test_headers: dict,
+    test_board: dict,
+    test_tree: list,
+    monkeypatch,
+):
+    """
+    장작을 읽은 뒤 다른 요청이 먼저 옮겼으면, 읽은 경로로 옮기지 않고 409로 응답합니다.
+    """
+    root, a, b, c = test_tree
+    lock_articles = service.repo.lock_articles
+
+    async def _lock_stale(article_ids):
+        articles = await lock_articles(article_ids)
+        # 읽은 직후 다른 요청이 b를 root 아래로 옮긴 상황을 만듭니다.
+        await service.repo.move_article_subtree(
+            b["id"],
+            b["path"],
+            b["path_logical"],
+            root["id"],
+            root["path"],
+            root["path_logical"],
+            creator_id=b["creator_id"],
+        )
+        return articles
+
+    monkeypatch.setattr(service.repo, "lock_articles", _lock_stale)
+    response = await test_client.put(
+        f"/article/{b['id']}/parent/{a['id']}", headers=test_headers
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    monkeypatch.setattr(service.repo, "lock_articles", lock_articles)
+    moved_c = (await test_client.get(f"/article/{c['id']}")).json()
+    assert moved_c["path"] == c["path"]
+
+
+@pytest.mark.asyncio
+async def test_delete_article_subtree(
+    test_client: AsyncClient, test_headers: dict, test_board: dict, test_tree: list
+):
+    root, a, b, c = test_tree
+    await test_client.get(f"/article/list/{test_board['id']}")
+
+    response = await test_client.delete(f"/article/{a['id']}", headers=test_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    for article in (a, b, c):
+        response = await test_client.get(f"/article/{article['id']}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    from_memory = (await test_client.get(f"/article/list/{test_board['id']}")).json()
+    service.board_cache.discard(test_board["id"])
+    from_db = (await test_client.get(f"/article/list/{test_board['id']}")).json()
+    assert [article["id"] for article in from_memory] == [root["id"]]
+    assert from_db == from_memory
+
+
+@pytest.mark.asyncio
+async def test_article_mutations_check_owner(
+    test_client: AsyncClient, test_headers: dict, test_tree: list, db
+):
+    root, a, b, c = test_tree
+    body = {"name": "edited", "content": "edited"}
+
+    response = await test_client.put("/article/0", json=body, headers=test_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = await test_client.delete("/article/0", headers=test_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async with db["session"]() as session:
+        await session.execute(
+            update(Article).where(Article.id == b["id"]).values(creator_id=0)
+        )
+        await session.commit()
+
+    response = await test_client.put(
+        f"/article/{b['id']}", json=body, headers=test_headers
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await test_client.delete(f"/article/{b['id']}", headers=test_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await test_client.get(f"/article/{b['id']}/subtree")
+    assert [article["name"] for article in response.json()] == ["c", "b"]
+
+
+@pytest.mark.asyncio
+async def test_append_article_reads_parent_from_database(
+    test_client: AsyncClient, test_headers: dict, test_board: dict, test_tree: list, db
+):
+    """
+    캐시에 남은 부모 장작의 경로가 오래되었어도, 기본 데이터베이스의 경로로 장작을 추가합니다.
+    """
+    root, a, b, c = test_tree
+    async with db["session"]() as session:
+        parent = await session.get(Article, b["id"])
+        stale = SimpleNamespace(
+            **{
+                attr.key: getattr(parent, attr.key)
+                for attr in sa_inspect(Article).column_attrs
+            }
+        )
+    stale.path, stale.path_logical = root["path"], root["path_logical"]
+    entity_cache.set(Article, b["id"], stale)
+
+    response = await test_client.post(
+        f"/article/{test_board['id']}/{b['id']}",
+        json={"logic": "AGREE", "name": "fresh", "content": "fresh"},
+        headers=test_headers,
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    articles = (await test_client.get(f"/article/list/{test_board['id']}")).json()
+    fresh = next(article for article in articles if article["name"] == "fresh")
+    assert fresh["path"] == f"{b['path']}/{fresh['id']}"
+    assert fresh["path_logical"] == f"{b['path_logical']}/AGREE"
+
+
+@pytest.mark.asyncio
+async def test_append_article_rejects_parent_from_other_board(
+    test_client: AsyncClient, test_headers: dict, test_tree: list
+):
+    root, a, b, c = test_tree
+    other = (
+        await test_client.post(
+            "/board/", json={"name": "other", "description": "o"}, headers=test_headers
+        )
+    ).json()
+
+    response = await test_client.post(
+        f"/article/{other['id']}/{b['id']}",
+        json={"logic": "AGREE", "name": "stray", "content": "stray"},
+        headers=test_headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    other = (await test_client.get(f"/board/{other['id']}")).json()
+    assert (other["article_count"], other["root_article_id"]) == (0, None)
+
+
+def _tree_order(article: dict) -> list[int]:
+    return [int(_id) for _id in article["path"].split("/")[1:]]
+
+
+@pytest.mark.asyncio
+async def test_get_article_list_in_tree_order(
+    test_client: AsyncClient, test_headers: dict, test_board: dict, test_tree: list
+):
+    root, a, b, c = test_tree
+    for parent in (root, a, root):
+        await test_client.post(
+            f"/article/{test_board['id']}/{parent['id']}",
+            json={"logic": "AGREE", "name": "sibling", "content": "sibling"},
+            headers=test_headers,
+        )
+
+    service.board_cache.discard(test_board["id"])
+    from_db = (await test_client.get(f"/article/list/{test_board['id']}")).json()
+    from_memory = (
+        await test_client.get(f"/article/list/{test_board['id']}?limit=100")
+    ).json()
+
+    expected = sorted(from_db, key=_tree_order, reverse=True)
+    assert from_db == expected
+    assert from_memory == expected
+
+    response = await test_client.get(f"/article/{root['id']}/subtree")
+    assert response.json() == expected
+
+
+def test_board_articles_order_ids_numerically():
+    def _record(path: str) -> ArticleRecord:
+        article_id = int(path.rsplit("/", 1)[1])
+        return ArticleRecord(article_id, "", "", None, 1, path, "ROOT")
+
+    paths = ["/9", "/9/10", "/9/10/100", "/9/11", "/9/9", "/10", "/10/99"]
+    expected = ["/10/99", "/10", "/9/11", "/9/10/100", "/9/10", "/9/9", "/9"]
+
+    memory = BoardArticles(1, map(_record, paths))
+    segment = SegmentBoardArticles(encode_board(1, 1, memory))
+    for board in (memory, segment):
+        assert [r.path for r in board.page()] == expected
+        assert [r.path for r in board.page(limit=2, before_path="/9/10/100")] == [
+            "/9/10",
+            "/9/9",
+        ]
+        assert [r.path for r in board.subtree("/9")] == expected[2:]
+        assert [r.path for r in board.subtree("/9/10", include_self=False)] == [
+            "/9/10/100"
+        ]
+
+    memory.put(_record("/9/10/20"))
+    memory.remove(100)
+    assert [r.path for r in memory.subtree("/9/10")] == ["/9/10/20", "/9/10"]
+
+    memory.remove_subtree("/9/10")
+    assert [r.path for r in memory.page()] == ["/10/99", "/10", "/9/11", "/9/9", "/9"]
+    assert memory.get(20) is None
@@ -1,6 +1,17 @@
 import pytest
 from httpx import AsyncClient
 from fastapi import status
+import json
+
+from sqlalchemy import update
+
+from data.bus import invalidation_bus
+from data.cache.entity import entity_cache
+from data.cache.response import response_cache
+from data.db import database
+from data.db.pagination import encode_cursor
+from data.db.models import Board
+from endpoint.board.service import get_board_list_version
 
 
 @pytest.mark.asyncio
@@ -24,3 +35,273 @@ async def test_post_board(test_client: AsyncClient, test_headers: dict):
     print(response.content)
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_get_board_uses_read_engine(
+    test_client: AsyncClient, monkeypatch, captured_statements: list
+):
+    monkeypatch.setattr(database.read_your_writes, "seconds", 0)
+
+    response = await test_client.get("/board/?per_page=10&page=1")
+
+    assert response.status_code == status.HTTP_200_OK
+    statements = captured_statements.by_engine[database.read_engine]
+    assert any(statement.startswith("SELECT") for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_get_boards_with_cursor(test_client: AsyncClient, test_headers: dict):
+    for i in range(3):
+        await test_client.post(
+            "/board/",
+            json={"name": f"cursor {i}", "description": "cursor"},
+            headers=test_headers,
+        )
+
+    response = await test_client.get("/board/?per_page=2")
+    first_page = response.json()
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await test_client.get(f"/board/?per_page=2&cursor={cursor}")
+    second_page = response.json()
+
+    assert len(first_page) == 2
+    assert second_page[0]["id"] < first_page[-1]["id"]
+
+    response = await test_client.get("/board/?per_page=2&cursor=invalid")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    for key in ([], ["1"], [None], [True], 1, {"0": 1}):
+        forged = encode_cursor("board", key)
+        response = await test_client.get(f"/board/?per_page=2&cursor={forged}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_boards_version_changes_on_create(
+    test_client: AsyncClient, test_headers: dict
+):
+    """
+    불판을 만들면 목록의 버전이 바뀌어, 그 전에 시작된 목록 조회와 합쳐지지 않습니다.
+    """
+    version = get_board_list_version()
+
+    response = await test_client.post(
+        "/board/",
+        json={"name": "version", "description": "version"},
+        headers=test_headers,
+    )
+    board_id = response.json()["id"]
+
+    assert get_board_list_version() != version
+    response = await test_client.get("/board/?per_page=1")
+    assert response.json()[0]["id"] == board_id
+
+
+@pytest.mark.asyncio
+async def test_get_board_from_response_cache(
+    test_client: AsyncClient, test_headers: dict
+):
+    response = await test_client.post(
+        "/board/",
+        json={"name": "cached", "description": "cached"},
+        headers=test_headers,
+    )
+    url = f"/board/{response.json()['id']}"
+
+    await test_client.get(url)
+    hits = (await test_client.get("/metrics/")).json()["response_cache"]["hits"]
+    response = await test_client.get(url)
+    etag = response.headers["etag"]
+
+    assert response.json()["name"] == "cached"
+    assert (await test_client.get("/metrics/")).json()["response_cache"][
+        "hits"
+    ] == hits + 1
+
+    response = await test_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    await test_client.put(
+        url,
+        json={"name": "renamed", "description": "cached"},
+        headers=test_headers,
+    )
+    response = await test_client.get(url)
+    assert response.json()["name"] == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_delete_board_purges_article_responses(
+    test_client: AsyncClient, test_headers: dict
+):
+    board = (
+        await test_client.post(
+            "/board/",
+            json={"name": "doomed", "description": "doomed"},
+            headers=test_headers,
+        )
+    ).json()
+    root = (
+        await test_client.post(
+            f"/article/{board['id']}",
+            json={"name": "root", "content": "root"},
+            headers=test_headers,
+        )
+    ).json()
+    for _ in range(2):
+        response = await test_client.get(f"/article/{root['id']}")
+        assert response.status_code == status.HTTP_200_OK
+
+    response = await test_client.delete(f"/board/{board['id']}", headers=test_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await test_client.get(f"/article/{root['id']}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_board_invalidated_by_other_worker(
+    test_client: AsyncClient, test_headers: dict, db
+):
+    response = await test_client.post(
+        "/board/",
+        json={"name": "bus", "description": "bus"},
+        headers=test_headers,
+    )
+    board_id = response.json()["id"]
+    await test_client.get(f"/board/{board_id}")
+
+    # 다른 워커가 불판을 수정하고 무효화 이벤트를 보낸 상황을 흉내냅니다.
+    async with db["session"]() as session:
+        await session.execute(
+            update(Board).where(Board.id == board_id).values(name="renamed")
+        )
+        await session.commit()
+    for topic, keys in [
+        ("entity", [["board", str(board_id)]]),
+        ("response", [f"board:{board_id}"]),
+    ]:
+        invalidation_bus._receive(
+            json.dumps({"origin": "other", "topic": topic, "keys": keys}).encode()
+        )
+
+    response = await test_client.get(f"/board/{board_id}")
+    assert response.json()["name"] == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_board_metadata(test_client: AsyncClient, test_headers: dict):
+    board = (
+        await test_client.post(
+            "/board/",
+            json={"name": "metadata", "description": "m"},
+            headers=test_headers,
+        )
+    ).json()
+    assert board["article_count"] == 0
+    assert board["root_article_id"] is None
+
+    root = (
+        await test_client.post(
+            f"/article/{board['id']}",
+            json={"name": "root", "content": "root"},
+            headers=test_headers,
+        )
+    ).json()
+    response = await test_client.post(
+        f"/article/{board['id']}",
+        json={"name": "root", "content": "root"},
+        headers=test_headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    await test_client.post(
+        f"/article/{board['id']}/{root['id']}",
+        json={"logic": "AGREE", "name": "child", "content": "child"},
+        headers=test_headers,
+    )
+    (child,) = (await test_client.get(f"/article/{root['id']}/children")).json()
+    for article in (root, child, child):
+        await test_client.post(
+            f"/comment/{article['id']}", json={"content": "c"}, headers=test_headers
+        )
+
+    response = await test_client.get(f"/board/{board['id']}")
+    assert response.json()["root_article_id"] == root["id"]
+    assert response.json()["article_count"] == 2
+    assert response.json()["comment_count"] == 3
+    assert response.json()["last_activity_at"] is not None
+
+    (listed,) = [
+        b
+        for b in (await test_client.get("/board/?per_page=100")).json()
+        if b["id"] == board["id"]
+    ]
+    assert listed == response.json()
+
+    await test_client.delete(f"/article/{child['id']}", headers=test_headers)
+    response = await test_client.get(f"/board/{board['id']}")
+    assert response.json()["article_count"] == 1
+    assert response.json()["comment_count"] == 1
+
+    await test_client.delete(f"/article/{root['id']}", headers=test_headers)
+    response = await test_client.get(f"/board/{board['id']}")
+    assert response.json()["root_article_id"] is None
+    assert response.json()["article_count"] == 0
+    assert response.json()["comment_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_board_mutations_check_owner(
+    test_client: AsyncClient, test_headers: dict, db
+):
+    board_id = (
+        await test_client.post(
+            "/board/", json={"name": "owner", "description": "o"}, headers=test_headers
+        )
+    ).json()["id"]
+    body = {"name": "renamed", "description": "o"}
+
+    response = await test_client.put("/board/0", json=body, headers=test_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = await test_client.delete("/board/0", headers=test_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async with db["session"]() as session:
+        await session.execute(
+            update(Board).where(Board.id == board_id).values(creator_id=0)
+        )
+        await session.commit()
+
+    response = await test_client.put(
+        f"/board/{board_id}", json=body, headers=test_headers
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await test_client.delete(f"/board/{board_id}", headers=test_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await test_client.get(f"/board/{board_id}")
+    assert response.json()["name"] == "owner"
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_cookie(
+    test_client: AsyncClient, test_headers: dict, captured_statements: list
+):
+    """
+    쓰기를 한 응답의 쿠키만 가진 조회는, 토큰이 없어도 기본 데이터베이스로 보냅니다.
+    """
+    response = await test_client.post(
+        "/board/", json={"name": "ryw", "description": "ryw"}, headers=test_headers
+    )
+    assert database.read_your_writes.cookie_name in response.cookies
+    entity_cache.clear()
+    response_cache.clear()
+
+    captured_statements.clear()
+    response = await test_client.get(f"/board/{response.json()['id']}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert captured_statements.by_engine[database.engine]
+    assert captured_statements.by_engine[database.read_engine] == []
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+
+@pytest.mark.asyncio
+async def test_get_comments_not_modified(test_client: AsyncClient, test_headers: dict):
+    response = await test_client.post(
+        "/board/",
+        json={"name": "comment test", "description": "comment test"},
+        headers=test_headers,
+    )
+    response = await test_client.post(
+        f"/article/{response.json()['id']}",
+        json={"name": "root", "content": "root"},
+        headers=test_headers,
+    )
+    url = f"/comment/article/{response.json()['id']}"
+
+    response = await test_client.get(url)
+    etag = response.headers["etag"]
+
+    response = await test_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    await test_client.post(
+        f"/comment/{url.rsplit('/', 1)[1]}",
+        json={"content": "first"},
+        headers=test_headers,
+    )
+
+    response = await test_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert [comment["content"] for comment in response.json()] == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_get_comments_as_ndjson(test_client: AsyncClient, test_headers: dict):
+    response = await test_client.post(
+        "/board/",
+        json={"name": "ndjson test", "description": "ndjson test"},
+        headers=test_headers,
+    )
+    response = await test_client.post(
+        f"/article/{response.json()['id']}",
+        json={"name": "root", "content": "root"},
+        headers=test_headers,
+    )
+    article_id = response.json()["id"]
+    for i in range(3):
+        await test_client.post(
+            f"/comment/{article_id}",
+            json={"content": f"comment {i}"},
+            headers=test_headers,
+        )
+
+    response = await test_client.get(
+        f"/comment/article/{article_id}?limit=1&fields=content",
+        headers={"Accept": "application/x-ndjson"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"content": f"comment {i}"} for i in (2, 1, 0)]
@@ -0,0 +1,158 @@
+import re
+
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+from sqlalchemy import event, text
+
+from data.cache.entity import entity_cache
+from data.cache.response import response_cache
+from data.db import database
+from endpoint.article import service as article_service
+
+# 기본 키 순서로 읽다가 LIMIT에서 멈추는 목록 조회는 테이블 전체를 읽지 않으므로 허용합니다.
+_PRIMARY_KEY_ORDER = re.compile(r"ORDER BY (\w+)\.id DESC\s+LIMIT", re.IGNORECASE)
+
+
+def _clear_caches(board_id: int | None = None) -> None:
+    entity_cache.clear()
+    response_cache.clear()
+    if board_id is not None:
+        article_service.board_cache.discard(board_id)
+
+
+async def _exercise(client: AsyncClient, headers: dict) -> None:
+    """
+    저장소(repository)의 조회, 수정, 삭제 쿼리가 모두 실행되도록 API를 호출합니다.
+    캐시가 응답하지 않도록 호출 전마다 캐시를 비웁니다.
+    """
+    board = (
+        await client.post(
+            "/board/", json={"name": "plan", "description": "plan"}, headers=headers
+        )
+    ).json()
+    root = (
+        await client.post(
+            f"/article/{board['id']}",
+            json={"name": "root", "content": "root"},
+            headers=headers,
+        )
+    ).json()
+    for name in ("child", "sibling"):
+        await client.post(
+            f"/article/{board['id']}/{root['id']}",
+            json={"logic": "AGREE", "name": name, "content": name},
+            headers=headers,
+        )
+    child, sibling = (await client.get(f"/article/{root['id']}/children")).json()
+    comment = (
+        await client.post(
+            f"/comment/{root['id']}", json={"content": "plan"}, headers=headers
+        )
+    ).json()
+
+    reads = [
+        "/board/?per_page=1",
+        f"/board/{board['id']}",
+        f"/article/{root['id']}",
+        f"/article/list/{board['id']}",
+        f"/article/list/{board['id']}?limit=1&fields=name,path",
+        f"/article/{root['id']}/subtree",
+        f"/comment/{comment['id']}",
+        f"/comment/article/{root['id']}?limit=1",
+    ]
+    for url in reads:
+        _clear_caches(board["id"])
+        response = await client.get(url)
+        assert response.status_code == status.HTTP_200_OK, url
+
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor:
+            separator = "&" if "?" in url else "?"
+            _clear_caches(board["id"])
+            await client.get(f"{url}{separator}cursor={cursor}")
+
+    _clear_caches(board["id"])
+    await client.get(
+        f"/comment/article/{root['id']}", headers={"Accept": "application/x-ndjson"}
+    )
+    await client.put(
+        f"/comment/{comment['id']}", json={"content": "edited"}, headers=headers
+    )
+    await client.delete(f"/comment/{comment['id']}", headers=headers)
+    await client.put(
+        f"/article/{root['id']}",
+        json={"name": "root", "content": "edited"},
+        headers=headers,
+    )
+    await client.put(f"/article/{sibling['id']}/parent/{child['id']}", headers=headers)
+    await client.delete(f"/article/{child['id']}", headers=headers)
+    await client.put(
+        f"/board/{board['id']}",
+        json={"name": "plan", "description": "edited"},
+        headers=headers,
+    )
+    await client.delete(f"/board/{board['id']}", headers=headers)
+
+
+async def _sqlite_problems(conn, statement: str, parameters) -> list[str]:
+    plan = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    problems = []
+    for row in plan:
+        detail = row[-1]
+        if "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+        elif scan := re.match(r"SCAN (\w+)", detail):
+            # 인덱스를 사용하더라도 SCAN이면 인덱스 전체를 읽습니다.
+            match = _PRIMARY_KEY_ORDER.search(statement)
+            if match is None or match.group(1) != scan.group(1):
+                problems.append(detail)
+    return problems
+
+
+async def _postgresql_problems(conn, statement: str, parameters) -> list[str]:
+    # 테이블이 작으면 인덱스가 있어도 순차 탐색을 고르므로, 사용할 수 있는 인덱스가 없을 때만 순차 탐색과 정렬이 남도록 합니다.
+    await conn.execute(text("SET LOCAL enable_seqscan = off"))
+    await conn.execute(text("SET LOCAL enable_sort = off"))
+    plan = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return [
+        row[0].strip()
+        for row in plan
+        if "Seq Scan" in row[0] or re.search(r"\bSort\b", row[0])
+    ]
+
+
+@pytest.mark.asyncio
+async def test_repository_queries_use_indexes(
+    test_client: AsyncClient, test_headers: dict
+):
+    statements: dict[str, tuple] = {}
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if re.match(r"\s*(SELECT|UPDATE|DELETE)\b", statement, re.IGNORECASE):
+            statements.setdefault(statement, parameters)
+
+    for engine in (database.engine, database.read_engine):
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        await _exercise(test_client, test_headers)
+    finally:
+        for engine in (database.engine, database.read_engine):
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+    assert statements
+    check = (
+        _postgresql_problems
+        if database.engine.dialect.name == "postgresql"
+        else _sqlite_problems
+    )
+    regressions = {}
+    async with database.engine.connect() as conn:
+        for statement, parameters in statements.items():
+            async with conn.begin():
+                problems = await check(conn, statement, parameters)
+                await conn.rollback()
+            if problems:
+                regressions[statement] = problems
+
+    assert not regressions, regressions
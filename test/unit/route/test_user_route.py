@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from fastapi import status
+
+from data.db.models import User
+from endpoint.user.password import password_hasher, pwd_context
+from endpoint.user.service import token_cache
+from endpoint.user.univcert import CircuitBreaker, univcert_client
+from test.utils.common import random_lower_string
+
+
+@pytest_asyncio.fixture
+async def login_form(db) -> dict:
+    username = random_lower_string(10)
+    password = random_lower_string(10)
+    async with db["session"]() as session:
+        session.add(
+            User(
+                username=username,
+                email=f"{username}@test.com",
+                password=pwd_context.hash(password),
+            )
+        )
+        await session.commit()
+
+    yield {"username": username, "password": password}
+
+
+@pytest.mark.asyncio
+async def test_get_user_me_caches_token(test_client: AsyncClient, test_headers: dict):
+    token = test_headers["Authorization"].removeprefix("Bearer ")
+
+    response = await test_client.get("/user/me", headers=test_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert token_cache.get(token) is not None
+
+    me = response.json()
+    response = await test_client.put(
+        f"/user/{me['username']}",
+        json={"username": me["username"], "email": me["email"]},
+        headers=test_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert token_cache.get(token) is None
+
+
+@pytest.mark.asyncio
+async def test_login(test_client: AsyncClient, login_form: dict):
+    response = await test_client.post("/user/login", data=login_form)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["username"] == login_form["username"]
+
+
+@pytest.mark.asyncio
+async def test_login_rejected_when_hasher_saturated(
+    test_client: AsyncClient, login_form: dict, monkeypatch
+):
+    monkeypatch.setattr(password_hasher, "workers", 0)
+    monkeypatch.setattr(password_hasher, "queue_size", 0)
+
+    response = await test_client.post("/user/login", data=login_form)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_univ_verify(test_client: AsyncClient, univcert_server: list):
+    response = await test_client.post(
+        "/user/univ_verify", json={"email": "verify@test.com"}
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert univcert_server[0]["email"] == "verify@test.com"
+
+
+@pytest.mark.asyncio
+async def test_univ_verify_failure(test_client: AsyncClient, univcert_server: list):
+    response = await test_client.post(
+        "/user/univ_verify", json={"email": "fail@test.com"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_univ_verify_coalesces_identical_calls(
+    test_client: AsyncClient, univcert_server: list
+):
+    responses = await asyncio.gather(
+        *[
+            test_client.post("/user/univ_verify", json={"email": "same@test.com"})
+            for _ in range(5)
+        ]
+    )
+
+    assert all(r.status_code == status.HTTP_204_NO_CONTENT for r in responses)
+    assert len(univcert_server) == 1
+
+
+@pytest.mark.asyncio
+async def test_univcert_trial_call_cancelled(
+    test_client: AsyncClient, univcert_server: list, monkeypatch
+):
+    """
+    차단 후 시험 호출이 취소되어도 HALF_OPEN에 머물지 않고, 다음 호출이 다시 시험합니다.
+    """
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    breaker.record_failure()
+    monkeypatch.setattr(univcert_client, "breaker", breaker)
+
+    trial = asyncio.create_task(univcert_client.post("clear/cancel@test.com", {}))
+    await asyncio.sleep(0.01)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert await univcert_client.post("clear/cancel@test.com", {}) == {"success": True}
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_delete_user_fixes_other_boards(
+    test_client: AsyncClient,
+    test_headers: dict,
+    login_form: dict,
+    univcert_server: list,
+):
+    """
+    탈퇴한 유저가 다른 유저의 불판에 남긴 장작과 댓글을 지우고, 불판의 장작 수, 댓글 수, 최상위 장작 기록을 고칩니다.
+    """
+    token = (await test_client.post("/user/login", data=login_form)).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    board = (
+        await test_client.post(
+            "/board/",
+            json={"name": "stay", "description": "stay"},
+            headers=test_headers,
+        )
+    ).json()
+    root = (
+        await test_client.post(
+            f"/article/{board['id']}",
+            json={"name": "root", "content": "root"},
+            headers=test_headers,
+        )
+    ).json()
+    await test_client.post(
+        f"/article/{board['id']}/{root['id']}",
+        json={"logic": "AGREE", "name": "theirs", "content": "theirs"},
+        headers=headers,
+    )
+    theirs = (await test_client.get(f"/article/{root['id']}/children")).json()[0]
+    await test_client.post(
+        f"/article/{board['id']}/{theirs['id']}",
+        json={"logic": "AGREE", "name": "reply", "content": "reply"},
+        headers=test_headers,
+    )
+    for article in (root, theirs):
+        await test_client.post(
+            f"/comment/{article['id']}", json={"content": "bye"}, headers=headers
+        )
+
+    other = (
+        await test_client.post(
+            "/board/",
+            json={"name": "rooted", "description": "rooted"},
+            headers=test_headers,
+        )
+    ).json()
+    await test_client.post(
+        f"/article/{other['id']}",
+        json={"name": "their root", "content": "their root"},
+        headers=headers,
+    )
+
+    response = await test_client.delete(
+        f"/user/{login_form['username']}", headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    board = (await test_client.get(f"/board/{board['id']}")).json()
+    assert (board["article_count"], board["comment_count"]) == (1, 0)
+    assert board["root_article_id"] == root["id"]
+    articles = (await test_client.get(f"/article/{root['id']}/subtree")).json()
+    assert [article["id"] for article in articles] == [root["id"]]
+
+    other = (await test_client.get(f"/board/{other['id']}")).json()
+    assert (other["article_count"], other["root_article_id"]) == (0, None)
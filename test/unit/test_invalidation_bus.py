@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from data.bus import InvalidationBus, UnixSocketTransport
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+def _bus(directory: str) -> InvalidationBus:
+    return InvalidationBus(
+        UnixSocketTransport(
+            directory, queue_size=64, send_timeout=1.0, peer_refresh_seconds=0.0
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_unix_transport_delivers_large_event(tmp_path):
+    """
+    데이터그램 하나에 담기지 않는 이벤트도 나누어 보내 키를 모두 전달합니다.
+    """
+    sender, receiver = _bus(str(tmp_path)), _bus(str(tmp_path))
+    received, resets = [], []
+    receiver.subscribe("article", received.extend, lambda: resets.append(True))
+    await sender.start()
+    await receiver.start()
+    try:
+        keys = [f"article:{i:08d}" for i in range(5000)]
+        sender.publish("article", keys)
+
+        await _wait_for(lambda: len(received) >= len(keys))
+        assert received == keys
+        assert resets == []
+        assert sender.published > 1
+        assert receiver.gaps == 0
+    finally:
+        await sender.close()
+        await receiver.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_transport_resets_on_undecodable_payload(tmp_path):
+    receiver = _bus(str(tmp_path))
+    resets = []
+    receiver.subscribe("article", lambda keys: None, lambda: resets.append(True))
+    await receiver.start()
+    try:
+        receiver.transport._sock.sendto(b"\xff not json", receiver.transport.path)
+
+        await _wait_for(lambda: resets)
+        assert receiver.invalid == 1
+    finally:
+        await receiver.close()
+
+
+@pytest.mark.asyncio
+async def test_unix_transport_keeps_sending_when_a_peer_fails(tmp_path, monkeypatch):
+    """
+    한 워커에 보내다 실패해도 나머지 워커에는 이벤트를 보냅니다.
+    """
+    sender, receiver = _bus(str(tmp_path)), _bus(str(tmp_path))
+    received = []
+    receiver.subscribe("article", received.extend)
+    await sender.start()
+    await receiver.start()
+    sock = sender.transport._sock
+    try:
+        broken = str(tmp_path / "broken.sock")
+        peers = sender.transport._list_peers
+        monkeypatch.setattr(sender.transport, "_list_peers", lambda: [broken, *peers()])
+        sendto = sock.sendto
+
+        class _Socket:
+            def sendto(self, payload, peer):
+                if peer == broken:
+                    raise OSError(90, "Message too long")
+                return sendto(payload, peer)
+
+            def __getattr__(self, name):
+                return getattr(sock, name)
+
+        sender.transport._sock = _Socket()
+        sender.publish("article", ["article:1"])
+
+        await _wait_for(lambda: received)
+        assert received == ["article:1"]
+        assert sender.transport.failures == 1
+    finally:
+        sender.transport._sock = sock
+        await sender.close()
+        await receiver.close()